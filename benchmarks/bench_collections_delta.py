@@ -0,0 +1,119 @@
+"""
+Compara la descarga completa de cobros contra la sincronización incremental (`updatedSince`)
+usando un stub local de la API de Indi.
+
+Uso:
+    python -m benchmarks.bench_collections_delta --sizes 100 1000 10000 --changed 0.01
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+from urllib.parse import urlparse, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+os.environ.setdefault("COLLECTIONS_API_URL", "http://127.0.0.1:0")
+os.environ.setdefault("COLLECTIONS_API_CODE", "bench")
+os.environ.setdefault("AUTH_API_URL", "http://127.0.0.1:0")
+os.environ.setdefault("AUTH_API_CODE", "bench")
+
+
+def build_collection(index: int, updated: bool = False) -> dict:
+    return {
+        "id": f"col-{index}",
+        "clientId": f"cli-{index}",
+        "clientPhoneNumber": f"+519{index:08d}",
+        "clientFullName": f"Cliente {index}",
+        "userId": "usr-1",
+        "userPhoneNumber": "+51999999999",
+        "userFullName": "Acreedor Bench",
+        "paymentStatus": "PAGADO" if updated else "PENDIENTE",
+        "description": f"Cobro de prueba {index}",
+        "currency": "Soles (S/)",
+        "amount": 100.0 + index,
+        "collectionDate": "2025-01-01",
+        "paymentDate": None,
+        "totalQuotas": 1,
+        "numberQuota": 1,
+        "frequencyPayment": "ÚNICO",
+        "active": True,
+    }
+
+
+class StubState:
+    size = 0
+    changed_ratio = 0.01
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        if "updatedSince" in query:
+            changed = max(1, int(StubState.size * StubState.changed_ratio))
+            items = [build_collection(i, updated=True) for i in range(changed)]
+            body = {"items": items, "cursor": time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime())}
+        else:
+            body = [build_collection(i) for i in range(StubState.size)]
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+def measure(call):
+    start = time.perf_counter()
+    result = call()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--changed", type=float, default=0.01, help="Fracción de cobros modificados entre sincronizaciones")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ["COLLECTIONS_API_URL"] = f"http://127.0.0.1:{server.server_port}"
+
+    from src.integrations.indi.provider import IndiProvider
+    from src.domain.services.collection_sync import CollectionSyncService
+
+    provider = IndiProvider()
+    StubState.changed_ratio = args.changed
+    print(f"{'items':>8} {'full KB':>10} {'full s':>8} {'delta KB':>10} {'delta s':>8} {'saved KB':>10} {'saved s':>8}")
+    for size in args.sizes:
+        StubState.size = size
+        response, full_time = measure(lambda: provider._request(
+            "GET", provider.COLLECTION_BY_USER_PHONE_PATH,
+            provider._build_collections_url(provider.COLLECTION_BY_USER_PHONE_PATH)))
+        full_bytes = len(response.content)
+        full, mapping_time = measure(lambda: provider._to_collection(response.json()))
+        full_time += mapping_time
+
+        cursor = provider.get_sync_timestamp()
+        response, delta_time = measure(lambda: provider._request(
+            "GET", provider.COLLECTION_BY_USER_PHONE_PATH,
+            provider._build_collections_url(provider.COLLECTION_BY_USER_PHONE_PATH, None, {"updatedSince": cursor})))
+        delta_bytes = len(response.content)
+        start = time.perf_counter()
+        changes, _ = provider._to_collection_changes(response, response.json(), cursor)
+        CollectionSyncService.merge_changes({c.id: c for c in full}, changes)
+        delta_time += time.perf_counter() - start
+
+        print(f"{size:>8} {full_bytes / 1024:>10.1f} {full_time:>8.3f} {delta_bytes / 1024:>10.1f} {delta_time:>8.3f}"
+              f" {(full_bytes - delta_bytes) / 1024:>10.1f} {full_time - delta_time:>8.3f}")
+
+    server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
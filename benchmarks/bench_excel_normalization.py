@@ -0,0 +1,135 @@
+"""
+Compara la normalización por celda (una función por valor, como el anterior `df["FECHA"].apply`) con la
+normalización por columnas de `normalize_block` sobre hojas sintéticas con fechas seriales y de texto,
+montos con símbolos de moneda y separadores de miles, y celdas vacías.
+
+Uso:
+    python -m benchmarks.bench_excel_normalization --rows 100000 --block-rows 1000 5000
+"""
+import re
+import sys
+import time
+import random
+import argparse
+import datetime
+
+import pandas as pd
+
+from src.utils.ocr.excel_normalization import (
+    AMOUNT_COLUMNS,
+    DATE_COLUMNS,
+    SERIAL_DATE_RANGE,
+    STRING_DATE_FORMATS,
+    canonical_header,
+    detect_columns,
+    normalize_block,
+)
+
+HEADER = ["Cliente", "Celular", "Fecha de venta", "Descripción", "Monto", "Adelanto", "Saldo pendiente"]
+EXCEL_EPOCH = datetime.datetime(1899, 12, 30)
+
+
+def build_rows(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    amounts = ("S/ {:,.2f}", "{:.2f}", "$ {:,.0f}", "{:,.2f}", "PEN {:.0f}")
+    dates = (
+        lambda day: 45000 + day,
+        lambda day: (EXCEL_EPOCH + datetime.timedelta(days=45000 + day)).strftime("%d/%m/%Y"),
+        lambda day: (EXCEL_EPOCH + datetime.timedelta(days=45000 + day)).strftime("%Y-%m-%d"),
+        lambda day: EXCEL_EPOCH + datetime.timedelta(days=45000 + day),
+    )
+    rows = []
+    for index in range(count):
+        total = rng.uniform(10, 5000)
+        paid = rng.choice((None, "", rng.uniform(0, total)))
+        rows.append([
+            f"Cliente {index}", f"9{index:08d}", rng.choice(dates)(rng.randint(0, 700)), f"Venta {index}",
+            rng.choice(amounts).format(total), None if paid in (None, "") else rng.choice(amounts).format(paid),
+            rng.choice((None, f"{total:.2f}".replace(".", ","))),
+        ])
+    return rows
+
+
+def cell_text(value):
+    if value is None or not str(value).strip():
+        return None
+    return str(value).strip()
+
+
+def cell_date(value):
+    """Por celda, con la aritmética de `pd.Timestamp` que usaba `excel_date_to_str`."""
+    text = cell_text(value)
+    if text is None:
+        return None
+    if isinstance(value, (int, float)) and SERIAL_DATE_RANGE[0] < value < SERIAL_DATE_RANGE[1]:
+        return (pd.Timestamp("1900-01-01") + pd.Timedelta(days=value - 2)).strftime("%Y-%m-%d")
+    for date_format in STRING_DATE_FORMATS:
+        try:
+            return datetime.datetime.strptime(text, date_format).strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+    return text
+
+
+def cell_amount(value):
+    text = cell_text(value)
+    if text is None:
+        return "0"
+    digits = re.sub(r"[^\d,.\-]", "", text).strip(".,")
+    if digits.rfind(",") > digits.rfind(".") and ("." in digits or len(digits) - digits.rfind(",") - 1 in (1, 2)):
+        digits = digits.replace(".", "").replace(",", ".")
+    else:
+        digits = digits.replace(",", "")
+        if digits.count(".") > 1:
+            digits = digits.replace(".", "")
+    try:
+        number = float(digits)
+    except ValueError:
+        return text
+    if re.fullmatch(r"\(.*\)", text):
+        number = -abs(number)
+    return str(int(number)) if number.is_integer() else str(number)
+
+
+def per_cell(rows):
+    """Como el flujo anterior: un DataFrame y `.apply` de una función por celda en cada columna."""
+    frame = pd.DataFrame(rows, columns=range(len(HEADER)), dtype=object)
+    detected = detect_columns(HEADER)
+    for index in frame.columns:
+        column = detected.get(index)
+        function = cell_date if column in DATE_COLUMNS else cell_amount if column in AMOUNT_COLUMNS else cell_text
+        frame[index] = frame[index].apply(function)
+    return frame.values.tolist()
+
+
+def per_column(rows, block_rows: int):
+    output = []
+    for start in range(0, len(rows), block_rows):
+        output.extend(normalize_block(HEADER, rows[start:start + block_rows]))
+    return output
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--block-rows", type=int, nargs="+", default=[1000, 5000])
+    args = parser.parse_args()
+
+    rows = build_rows(args.rows)
+    print(f"{args.rows} filas, cabecera normalizada: {canonical_header(HEADER)}")
+
+    start = time.perf_counter()
+    baseline = per_cell(rows)
+    print(f"{'per-cell':>18} {time.perf_counter() - start:>8.2f}s")
+
+    for block in args.block_rows:
+        start = time.perf_counter()
+        result = per_column(rows, block)
+        elapsed = time.perf_counter() - start
+        mismatches = sum(1 for expected, actual in zip(baseline, result) if expected != actual)
+        print(f"{'per-column/' + str(block):>18} {elapsed:>8.2f}s  filas distintas: {mismatches}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+"""
+Compara la memoria pico y el tiempo de convertir un Excel empresarial a partes CSV con el flujo anterior
+(`pd.read_excel` + `dropna`/`fillna`/`apply` + `to_csv`) y con la lectura por filas de `iter_excel_records`.
+
+Uso:
+    python -m benchmarks.bench_excel_reader --rows 1000 10000 50000
+"""
+import io
+import sys
+import time
+import argparse
+import tracemalloc
+
+import openpyxl
+import pandas as pd
+
+from src.utils.ocr.files_utils import iter_excel_records, write_csv_chunks
+
+
+def excel_date_to_str(excel_date):
+    """Conversión por celda del flujo anterior."""
+    if pd.isna(excel_date) or not isinstance(excel_date, (int, float)):
+        return None
+    return (pd.Timestamp("1900-01-01") + pd.Timedelta(days=excel_date - 2)).strftime("%Y-%m-%d")
+
+
+def build_workbook(rows: int) -> bytes:
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(["CLIENTE", "CELULAR", "FECHA", "DESCRIPCION", "TOTAL", "A CUENTA", "SALDO"])
+    for index in range(rows):
+        sheet.append([
+            f"Cliente {index}", f"9{index:08d}", 45000 + index % 365, f"Venta de mercadería {index}",
+            100 + index % 50, None if index % 3 else 20, 80 + index % 50,
+        ])
+    output = io.BytesIO()
+    workbook.save(output)
+    return output.getvalue()
+
+
+def dataframe_chunks(content: bytes, chunk_rows: int):
+    df = pd.read_excel(io.BytesIO(content))
+    df.dropna(how="all", inplace=True)
+    df.fillna({"TOTAL": 0, "SALDO": 0, "A CUENTA": 0}, inplace=True)
+    df["FECHA"] = df["FECHA"].apply(excel_date_to_str)
+    return [df.iloc[start:start + chunk_rows].to_csv(index=False, sep=";", na_rep="") for start in range(0, len(df), chunk_rows)]
+
+
+def streaming_chunks(content: bytes, chunk_rows: int):
+    return write_csv_chunks(iter_excel_records(content), chunk_rows)
+
+
+def measure(function, content: bytes, chunk_rows: int):
+    tracemalloc.start()
+    start = time.perf_counter()
+    chunks = function(content, chunk_rows)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, sum(len(chunk) for chunk in chunks)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--chunk-rows", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} {'xlsx KB':>8} {'method':>10} {'seconds':>8} {'peak MB':>8} {'csv KB':>8}")
+    for rows in args.rows:
+        content = build_workbook(rows)
+        for name, function in (("dataframe", dataframe_chunks), ("streaming", streaming_chunks)):
+            elapsed, peak, csv_size = measure(function, content, args.chunk_rows)
+            print(f"{rows:>8} {len(content) / 1024:>8.0f} {name:>10} {elapsed:>8.2f} {peak / 2**20:>8.1f} {csv_size / 1024:>8.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
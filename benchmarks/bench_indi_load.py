@@ -0,0 +1,100 @@
+"""
+Prueba de carga de `IndiProvider` contra el servidor falso de Indi: mide p50/p95/p99 por endpoint
+con latencia, errores y cola lenta inyectados.
+
+Uso:
+    python -m benchmarks.bench_indi_load --requests 500 --concurrency 16 --latency 0.05 --tail-ratio 0.02
+    python -m benchmarks.bench_indi_load --url http://127.0.0.1:8081 --requests 500   # servidor ya levantado
+    python -m benchmarks.bench_indi_load --hedge ...                                  # con lecturas duplicadas
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.fake_indi_server import FakeIndiServer, add_profile_arguments, profile_from_args
+
+os.environ.setdefault("COLLECTIONS_API_CODE", "bench")
+os.environ.setdefault("AUTH_API_CODE", "bench")
+
+
+def percentile(values, ratio: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(ratio * len(ordered)))]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", help="URL de un servidor falso ya levantado; si se omite se levanta uno en el proceso")
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--hedge", action="store_true", help="Activa INDI_HEDGED_READS_ENABLED")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    server = None
+    url = args.url
+    if not url:
+        server = FakeIndiServer(profile_from_args(args)).start()
+        url = server.url
+    os.environ["COLLECTIONS_API_URL"] = url
+    os.environ["AUTH_API_URL"] = url
+    os.environ["INDI_HEDGED_READS_ENABLED"] = "true" if args.hedge else "false"
+
+    from src.utils.metrics import metrics
+    from src.integrations.indi.provider import IndiProvider
+
+    provider = IndiProvider()
+    calls = {
+        "collections": provider.get_collection_by_user_id,
+        "clients": provider.get_clients_by_user_id,
+        "account": provider.find_account_by_user_id,
+    }
+    users = [f"+5199{i:07d}" for i in range(args.users)]
+    rng = random.Random(args.seed)
+    plan = [(rng.choice(list(calls)), rng.choice(users)) for _ in range(args.requests)]
+
+    def run(step):
+        name, user_phone = step
+        start = time.perf_counter()
+        try:
+            calls[name](user_phone)
+            error = None
+        except Exception as e:
+            error = type(e).__name__
+        return name, time.perf_counter() - start, error
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        results = list(executor.map(run, plan))
+    elapsed = time.perf_counter() - start
+
+    print(f"{args.requests} requests in {elapsed:.2f}s ({args.requests / elapsed:.1f} req/s), concurrency {args.concurrency}")
+    print(f"{'endpoint':>12} {'n':>6} {'errors':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for name in calls:
+        timings = [seconds for call, seconds, _ in results if call == name]
+        errors = sum(1 for call, _, error in results if call == name and error)
+        print(f"{name:>12} {len(timings):>6} {errors:>7} {percentile(timings, 0.5) * 1000:>8.1f}"
+              f" {percentile(timings, 0.95) * 1000:>8.1f} {percentile(timings, 0.99) * 1000:>8.1f}"
+              f" {max(timings, default=0) * 1000:>8.1f}")
+    error_types = {}
+    for _, _, error in results:
+        if error:
+            error_types[error] = error_types.get(error, 0) + 1
+    if error_types:
+        print(f"errors by type: {error_types}")
+    print(json.dumps(metrics.snapshot("indi.")["counters"], indent=2, sort_keys=True))
+    if server:
+        print(json.dumps(server.stats.snapshot(), indent=2, sort_keys=True))
+        server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+"""
+Compara el mapeo de listas de Indi: `response.json()` + construcción campo a campo con `.get`
+contra la validación en bloque con `TypeAdapter` y la decodificación por partes.
+
+Uso:
+    python -m benchmarks.bench_indi_mapping --items 10000 --repeat 5
+"""
+import sys
+import json
+import time
+import argparse
+import statistics
+
+from src.domain.models.client import Client
+from src.domain.models.collection import Collection
+from src.integrations.indi.schemas import COLLECTIONS_ADAPTER, CLIENTS_ADAPTER
+from src.utils.requests.json_stream import iter_json_array, iter_batches
+
+
+def build_collection(index: int) -> dict:
+    return {
+        "id": f"col-{index}",
+        "clientId": f"cli-{index}",
+        "clientPhoneNumber": f"+519{index:08d}",
+        "clientFullName": f"Cliente {index}",
+        "userId": "usr-1",
+        "userPhoneNumber": "+51999999999",
+        "userFullName": "Acreedor Bench",
+        "paymentStatus": "PENDIENTE",
+        "description": f"Cobro de prueba {index}",
+        "currency": "Soles (S/)",
+        "amount": 100.0 + index,
+        "collectionDate": "2025-01-01",
+        "paymentDate": None,
+        "totalQuotas": 1,
+        "numberQuota": 1,
+        "frequencyPayment": "ÚNICO",
+        "active": True,
+    }
+
+
+def build_client(index: int) -> dict:
+    return {
+        "id": f"cli-{index}",
+        "name": f"Cliente {index}",
+        "surname": "Bench",
+        "codePhone": "PE",
+        "prefixPhone": "+51",
+        "phoneNumber": f"9{index:08d}",
+        "email": None,
+        "userId": "usr-1",
+    }
+
+
+def legacy_collections(body: bytes):
+    return [Collection(
+        id=item.get("id"),
+        client_id=item.get("clientId"),
+        client_cellphone=item.get("clientPhoneNumber"),
+        client_full_name=item.get("clientFullName"),
+        acreetor_id=item.get("userId"),
+        acreetor_cellphone=item.get("userPhoneNumber"),
+        acreetor_full_name=item.get("userFullName"),
+        status=item.get("paymentStatus"),
+        description=item.get("description"),
+        currency=item.get("currency"),
+        collection_date=item.get("collectionDate"),
+        amount=item.get("amount"),
+        payment_date=item.get("paymentDate"),
+        frequency_payment=item.get("frequencyPayment"),
+        quota_number=item.get("numberQuota"),
+        total_quotas=item.get("totalQuotas"),
+        active=item.get("active")
+    ) for item in json.loads(body)]
+
+
+def legacy_clients(body: bytes):
+    return [Client(
+        id=(item.get("prefixPhone") or "") + (item.get("phoneNumber") or ""),
+        name=item.get("name"),
+        surname=item.get("surname"),
+        code_phone=item.get("codePhone"),
+        prefix_phone=item.get("prefixPhone"),
+        phone_number=item.get("phoneNumber"),
+        email=item.get("email") if item.get("email") is not None else None,
+        creditor_id=item.get("userId"),
+        raw_id=item.get("id")
+    ) for item in json.loads(body)]
+
+
+def streamed(adapter, body: bytes, chunk_size: int = 65536, batch_size: int = 500):
+    chunks = (body[i:i + chunk_size] for i in range(0, len(body), chunk_size))
+    items = []
+    for batch in iter_batches(iter_json_array(chunks), batch_size):
+        items.extend(adapter.validate_python(batch))
+    return items
+
+
+def measure(call, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    cases = [
+        ("collections", [build_collection(i) for i in range(args.items)], legacy_collections, COLLECTIONS_ADAPTER),
+        ("clients", [build_client(i) for i in range(args.items)], legacy_clients, CLIENTS_ADAPTER),
+    ]
+    print(f"{'endpoint':>12} {'KB':>8} {'legacy s':>9} {'adapter s':>10} {'stream s':>9} {'speedup':>8}")
+    for name, payload, legacy, adapter in cases:
+        body = json.dumps(payload).encode("utf-8")
+        expected = [item.model_dump() for item in legacy(body)]
+        assert [item.model_dump() for item in adapter.validate_json(body)] == expected
+        assert [item.model_dump() for item in streamed(adapter, body)] == expected
+
+        legacy_time = measure(lambda: legacy(body), args.repeat)
+        adapter_time = measure(lambda: adapter.validate_json(body), args.repeat)
+        stream_time = measure(lambda: streamed(adapter, body), args.repeat)
+        print(f"{name:>12} {len(body) / 1024:>8.1f} {legacy_time:>9.3f} {adapter_time:>10.3f}"
+              f" {stream_time:>9.3f} {legacy_time / adapter_time:>7.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,308 @@
+"""
+Servidor local que imita las rutas de la API de Indi usadas por `IndiProvider`, con datos sembrados
+y latencia, errores y cola lenta configurables, para medir latencias sin tocar el backend real.
+
+En el mismo proceso:
+    with FakeIndiServer(FakeIndiProfile(collections=1000, error_rate=0.01)) as server:
+        os.environ["COLLECTIONS_API_URL"] = server.url
+
+Como subproceso:
+    python -m benchmarks.fake_indi_server --port 8081 --collections 1000 --latency 0.05 --tail-ratio 0.02
+"""
+import sys
+import json
+import time
+import uuid
+import random
+import argparse
+import threading
+import zlib
+from urllib.parse import urlparse, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+COLLECTIONS_PATH = "/agent/collection-requests"
+COLLECTION_CREATE_PATH = "/agent/collection-requests/individual"
+CLIENTS_PATH = "/agent/clients"
+USER_PATH = "/agent/user/find-phone-number"
+
+
+class FakeIndiProfile:
+    """
+    Tamaño de los datos sembrados y comportamiento del servidor.
+
+    :param collections: Cobros por acreedor
+    :param clients: Clientes por acreedor
+    :param latency: Latencia base en segundos
+    :param jitter: Variación uniforme agregada a la latencia base
+    :param error_rate: Probabilidad de responder `error_status`
+    :param tail_ratio: Probabilidad de que un request caiga en la cola lenta
+    :param tail_latency: Escala de la cola lenta (Pareto), en segundos
+    :param unknown_ratio: Fracción de teléfonos que no existen en Indi
+    :param changed_ratio: Fracción de cobros devueltos en una consulta con `updatedSince`
+    """
+
+    def __init__(self, collections: int = 100, clients: int = 50, latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, error_status: int = 503, tail_ratio: float = 0.0, tail_latency: float = 1.0,
+                 tail_alpha: float = 2.0, max_latency: float = 30.0, unknown_ratio: float = 0.0,
+                 changed_ratio: float = 0.01, seed: int = 7):
+        self.collections = collections
+        self.clients = clients
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.tail_ratio = tail_ratio
+        self.tail_latency = tail_latency
+        self.tail_alpha = tail_alpha
+        self.max_latency = max_latency
+        self.unknown_ratio = unknown_ratio
+        self.changed_ratio = changed_ratio
+        self.seed = seed
+
+
+def _user_seed(profile: FakeIndiProfile, user_phone: str) -> int:
+    return profile.seed * 1_000_003 + zlib.crc32(user_phone.encode("utf-8"))
+
+
+def build_client(user_phone: str, index: int) -> dict:
+    return {
+        "id": f"cli-{user_phone}-{index}",
+        "name": f"Cliente {index}",
+        "surname": "Prueba",
+        "codePhone": "PE",
+        "prefixPhone": "+51",
+        "phoneNumber": f"9{index:08d}",
+        "email": None,
+        "userId": f"usr-{user_phone}",
+    }
+
+
+def build_collection(user_phone: str, index: int, status: str = "PENDIENTE") -> dict:
+    return {
+        "id": f"col-{user_phone}-{index}",
+        "clientId": f"cli-{user_phone}-{index}",
+        "clientPhoneNumber": f"+519{index:08d}",
+        "clientFullName": f"Cliente {index} Prueba",
+        "userId": f"usr-{user_phone}",
+        "userPhoneNumber": user_phone,
+        "userFullName": "Acreedor Prueba",
+        "paymentStatus": status,
+        "description": f"Cobro de prueba {index}",
+        "currency": "Soles (S/)",
+        "amount": 100.0 + index,
+        "collectionDate": "2025-01-01",
+        "paymentDate": None,
+        "totalQuotas": 1,
+        "numberQuota": 1,
+        "frequencyPayment": "ÚNICO",
+        "active": True,
+    }
+
+
+def build_account(user_phone: str) -> dict:
+    return {
+        "id": f"usr-{user_phone}",
+        "recordId": f"rec-{user_phone}",
+        "phoneNumber": user_phone,
+        "names": "Acreedor",
+        "surnames": "Prueba",
+        "email": "acreedor@example.com",
+        "isEnterprise": False,
+    }
+
+
+class FakeIndiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    profile = FakeIndiProfile()
+    stats = None
+
+    def log_message(self, *args):
+        pass
+
+    def _delay(self, rng: random.Random) -> float:
+        profile = self.profile
+        delay = profile.latency + rng.uniform(0, profile.jitter)
+        if rng.random() < profile.tail_ratio:
+            delay += profile.tail_latency * rng.paretovariate(profile.tail_alpha)
+        return min(delay, profile.max_latency)
+
+    def _send_json(self, status: int, body=None):
+        payload = b"" if body is None else json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        if payload:
+            self.wfile.write(payload)
+
+    def _handle(self, method: str):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        user_phone = self.headers.get("X-User-Phone", "")
+        length = int(self.headers.get("Content-Length") or 0)
+        body = (json.loads(self.rfile.read(length)) if length else None) or {}
+        rng = random.Random()
+        time.sleep(self._delay(rng))
+        self.stats.record(method, url.path)
+
+        if rng.random() < self.profile.error_rate:
+            self.stats.record(method, url.path, error=True)
+            return self._send_json(self.profile.error_status, {"message": "Injected error"})
+
+        seeded = random.Random(_user_seed(self.profile, user_phone))
+
+        if method == "GET" and url.path == COLLECTIONS_PATH:
+            if "updatedSince" in query:
+                changed = max(1, int(self.profile.collections * self.profile.changed_ratio))
+                items = [build_collection(user_phone, i, "PAGADO") for i in range(changed)]
+                return self._send_json(200, {"items": items, "cursor": time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime())})
+            return self._send_json(200, [build_collection(user_phone, i) for i in range(self.profile.collections)])
+        if method == "GET" and url.path == CLIENTS_PATH:
+            return self._send_json(200, [build_client(user_phone, i) for i in range(self.profile.clients)])
+        if method == "GET" and url.path == USER_PATH:
+            if seeded.random() < self.profile.unknown_ratio:
+                return self._send_json(204)
+            return self._send_json(200, build_account(user_phone))
+        if method == "POST" and url.path == CLIENTS_PATH:
+            return self._send_json(200, {"id": f"cli-{uuid.uuid4().hex[:12]}", **body})
+        if method == "POST" and url.path == COLLECTION_CREATE_PATH:
+            client = body.get("client", {})
+            return self._send_json(200, [{
+                "id": f"col-{uuid.uuid4().hex[:12]}",
+                "client": {
+                    "id": f"cli-{uuid.uuid4().hex[:12]}",
+                    "name": client.get("name"),
+                    "surname": client.get("surname"),
+                    "fullName": f"{client.get('name', '')} {client.get('surname', '')}".strip(),
+                    "prefixPhone": "+51",
+                    "phoneNumber": (client.get("clientPhoneNumber") or "").removeprefix("+51"),
+                },
+                "user": {"id": f"usr-{user_phone}", "fullName": "Acreedor Prueba", "phoneNumber": user_phone},
+                "paymentStatus": "PENDIENTE",
+                "description": body.get("description"),
+                "currency": body.get("currency"),
+                "amount": body.get("amount"),
+                "collectionDate": body.get("collectionDate"),
+                "frequencyPayment": body.get("frequencyPayment"),
+                "numberQuota": 1,
+                "totalQuotas": body.get("totalQuotas"),
+                "active": True,
+            }])
+        if method == "DELETE" and url.path.startswith(COLLECTIONS_PATH + "/"):
+            return self._send_json(200, {})
+        return self._send_json(404, {"message": f"Unknown route {method} {url.path}"})
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_DELETE(self):
+        self._handle("DELETE")
+
+
+class FakeIndiStats:
+    """Requests y errores inyectados por ruta."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = {}
+        self.errors = {}
+
+    def record(self, method: str, path: str, error: bool = False):
+        key = f"{method} {path}"
+        with self._lock:
+            target = self.errors if error else self.requests
+            target[key] = target.get(key, 0) + 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {"requests": dict(self.requests), "errors": dict(self.errors)}
+
+
+class _FakeIndiHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Los clientes cierran las respuestas descartadas (p. ej. lecturas duplicadas): no es un error del servidor.
+        if not isinstance(sys.exc_info()[1], (ConnectionResetError, BrokenPipeError)):
+            super().handle_error(request, client_address)
+
+
+class FakeIndiServer:
+    """Levanta `FakeIndiHandler` en un hilo del proceso actual."""
+
+    def __init__(self, profile: FakeIndiProfile = None, host: str = "127.0.0.1", port: int = 0):
+        handler = type("BoundFakeIndiHandler", (FakeIndiHandler,), {
+            "profile": profile or FakeIndiProfile(),
+            "stats": FakeIndiStats(),
+        })
+        self.httpd = _FakeIndiHTTPServer((host, port), handler)
+        self.stats = handler.stats
+        self.thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeIndiServer":
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def add_profile_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--collections", type=int, default=100)
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--tail-ratio", type=float, default=0.0)
+    parser.add_argument("--tail-latency", type=float, default=1.0)
+    parser.add_argument("--unknown-ratio", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=7)
+
+
+def profile_from_args(args) -> FakeIndiProfile:
+    return FakeIndiProfile(
+        collections=args.collections, clients=args.clients, latency=args.latency, jitter=args.jitter,
+        error_rate=args.error_rate, error_status=args.error_status, tail_ratio=args.tail_ratio,
+        tail_latency=args.tail_latency, unknown_ratio=args.unknown_ratio, seed=args.seed,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    server = FakeIndiServer(profile_from_args(args), args.host, args.port)
+    print(f"Fake Indi API listening on {server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print(json.dumps(server.stats.snapshot(), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
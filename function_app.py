@@ -2,9 +2,11 @@ import json
 import azure.functions as func
 
 from src.api.controllers.agent.query import post_agent_query
+from src.api.controllers.enterprise.jobs import get_enterprise_jobs
 from src.api.controllers.queue.queue_payment_sheet import queue_bp
 from src.api.controllers.memory.sync_clients import post_memory_sync_clients
 from src.api.controllers.memory.sync_collections import post_memory_sync_collections
+from src.api.controllers.memory.invalidate_account import post_memory_invalidate_account
 from src.utils.logger import get_function_logger
 
 logger = get_function_logger("function_app")
@@ -14,6 +16,8 @@ app = func.FunctionApp(http_auth_level=func.AuthLevel.FUNCTION)
 app.register_functions(post_agent_query)
 app.register_functions(post_memory_sync_collections)
 app.register_functions(post_memory_sync_clients)
+app.register_functions(post_memory_invalidate_account)
+app.register_functions(get_enterprise_jobs)
 app.register_functions(queue_bp)
 
 print("Registered all functions successfully.")
@@ -1,5 +1,7 @@
+import os
+import time
 import logging
-from functools import lru_cache
+import threading
 from langgraph.prebuilt import create_react_agent
 import traceback
 
@@ -47,9 +49,33 @@ class Agent:
             return None
 
 
-@lru_cache(maxsize=None)
+PROMPT_CACHE_TTL = int(os.getenv("PROMPT_CACHE_TTL", "300"))
+
+_prompt_cache = {}
+_prompt_cache_lock = threading.Lock()
+
+
 def cached_get_prompt(prompt_key, session_id='', invoke_id=''):
-    return get_prompt(prompt_key, session_id, invoke_id)
+    """
+    Cachea el prompt por su clave durante `PROMPT_CACHE_TTL` segundos, para que los cambios del prompt
+    se tomen sin reiniciar el proceso. Los IDs de sesión e invocación solo se usan para el log de la descarga.
+    """
+    cached = _prompt_cache.get(prompt_key)
+    if cached is None or time.monotonic() - cached[1] >= PROMPT_CACHE_TTL:
+        prompt = get_prompt(prompt_key, session_id, invoke_id)
+        cached = (prompt, time.monotonic())
+        with _prompt_cache_lock:
+            _prompt_cache[prompt_key] = cached
+    return cached[0]
+
+
+def get_prompt_key(type_agent, is_chit_chat=False):
+    """Retorna la clave del prompt que usará el agente según el tipo de usuario, o None si no invoca al modelo."""
+    if type_agent == "acreetor":
+        return "AZURE_INDEPENDENT_PROMPT_ID"
+    if type_agent == "enterprise":
+        return "AZURE_ENTERPRISE_PROMPT_ID" if is_chit_chat else None
+    return "AZURE_ANONYMOUS_PROMPT_ID"
 
 
 def build_agent(type_agent, user_id, shared_state, memory: RedisMemory, session_id='', invoke_id='', is_chit_chat=False):
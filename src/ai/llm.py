@@ -1,6 +1,37 @@
 import os
+import logging
+from functools import lru_cache
+
+import httpx
 from langchain_openai import AzureChatOpenAI
 
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=None)
+def get_http_client() -> httpx.Client:
+    """Cliente HTTP compartido para mantener vivas las conexiones al endpoint de Azure OpenAI."""
+    return httpx.Client(
+        limits=httpx.Limits(
+            max_connections=int(os.getenv("AZURE_OPENAI_MAX_CONNECTIONS", "20")),
+            max_keepalive_connections=int(os.getenv("AZURE_OPENAI_MAX_KEEPALIVE_CONNECTIONS", "10")),
+        ),
+        timeout=None,
+    )
+
+
+@lru_cache(maxsize=None)
+def get_http_async_client() -> httpx.AsyncClient:
+    """Versión asíncrona del cliente HTTP compartido."""
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=int(os.getenv("AZURE_OPENAI_MAX_CONNECTIONS", "20")),
+            max_keepalive_connections=int(os.getenv("AZURE_OPENAI_MAX_KEEPALIVE_CONNECTIONS", "10")),
+        ),
+        timeout=None,
+    )
+
+
 def get_model_for_image():
     return AzureChatOpenAI(
         azure_deployment=os.getenv("AZURE_OPENAI_DEPLOYMENT_IMAGE"),
@@ -12,6 +43,8 @@ def get_model_for_image():
         model=os.getenv("AZURE_OPENAI_MODEL_IMAGE"),
         azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT_IMAGE"),
         api_key=os.getenv("AZURE_OPENAI_API_KEY_IMAGE"),
+        http_client=get_http_client(),
+        http_async_client=get_http_async_client(),
     )
 
 
@@ -26,4 +59,20 @@ def get_model():
         model=os.getenv("AZURE_OPENAI_MODEL"),
         azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
         api_key=os.getenv("AZURE_OPENAI_API_KEY"),
+        http_client=get_http_client(),
+        http_async_client=get_http_async_client(),
     )
+
+
+def warm_up_model():
+    """
+    Abre (o reutiliza) la conexión TLS hacia el endpoint de Azure OpenAI en el pool compartido,
+    de modo que la primera llamada al modelo no pague el handshake.
+    """
+    endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
+    if not endpoint:
+        return
+    try:
+        get_http_client().head(endpoint, timeout=float(os.getenv("AZURE_OPENAI_WARM_UP_TIMEOUT", "2")))
+    except httpx.HTTPError as e:
+        logger.warning(f"No se pudo precalentar la conexión al modelo: {e}")
@@ -10,7 +10,7 @@ from src.domain.models.message import Message
 
 message_service = MessageService()
 
-def _build_shared_state(username: str, user_type: str, user_id: str) -> dict:
+def build_shared_state(username: str, user_type: str, user_id: str) -> dict:
     """Construye el estado compartido para la sesión del usuario."""
     return {
         "username": username,
@@ -50,19 +50,22 @@ async def _handle_content_filter_error(error_obj, shared_state, user_id, invoke_
         "tools": [],
     }
 
-async def invoke(payload: PayloadAgent):
+async def invoke(payload: PayloadAgent, prefetched=None):
     """
     Invoca el agente principal para procesar el mensaje del usuario y manejar la respuesta.
+    Si se recibe un contexto precalentado (`PrefetchedContext`) se reutilizan su memoria y su agente.
     """
     user_id = payload.user.user_id
     invoke_id = payload.invoke_id
     username = payload.user.name
     user_type = payload.user.get_type()
-    memory = get_memory(user_id)
+    if prefetched is not None and prefetched.user_id != user_id:
+        prefetched = None
+    memory = prefetched.memory if prefetched else get_memory(user_id)
     memory.add_user_message(payload.message)
     messages = memory.messages()
     messages_trimmed = trim_messages(messages)
-    shared_state = _build_shared_state(username, user_type, user_id)
+    shared_state = prefetched.shared_state if prefetched else build_shared_state(username, user_type, user_id)
     model_input_data = _build_model_input_data(messages_trimmed, username, user_type, user_id)
     is_chit_chat = payload.is_chit_chat
 
@@ -78,13 +81,16 @@ async def invoke(payload: PayloadAgent):
     logger.info(f"Session ID: {payload.user.current_session_id} - Invoke ID: {invoke_id} - Type user: {user_type}")
     #logger.info(f"Shared state: {shared_state}")
 
-    agent = build_agent(user_type, user_id, shared_state, memory, payload.user.current_session_id, invoke_id, is_chit_chat)
+    if prefetched and prefetched.agent is not None:
+        agent = prefetched.agent
+    else:
+        agent = build_agent(user_type, user_id, shared_state, memory, payload.user.current_session_id, invoke_id, is_chit_chat)
     config = {"configurable": {"thread_id": user_id}}
     output = ""
     if agent.executor:
         #logger.info(f"Session ID: {payload.user.current_session_id} - Invoke ID: {invoke_id} - Invoke agent")
         try:
-            result = agent.executor.invoke(
+            result = await agent.executor.ainvoke(
                 {
                     "messages": messages_trimmed,
                 },
@@ -1,5 +1,5 @@
 import json
-from typing import List, Dict
+from typing import List, Dict, Optional
 from pydantic import BaseModel, Field
 import redis
 import os
@@ -95,15 +95,16 @@ class RedisMemory:
     Supports connection via Redis URL.
     """
 
-    def __init__(self, user_id: str):
+    def __init__(self, user_id: str, stored_conversation: Optional[MemorySchema] = None):
         """
         Initialize Redis connection.
 
+        :param stored_conversation: Conversation already read from Redis, skips the initial load
         """
         self.user_id = user_id
         self.redis_client = redis.from_url(os.getenv("REDIS_INDIBOT"), decode_responses=True)
         self.redis_key = f"conversation:{self.user_id}"
-        self.stored_conversation = self.load_conversation()
+        self.stored_conversation = stored_conversation if stored_conversation is not None else self.load_conversation()
         self.session_buffer_time = int(os.getenv("SESSION_BUFFER_WAIT_TIME"))
 
     def load_conversation(self):
@@ -1,74 +1,140 @@
 import logging
+import functools
+from typing import Callable
 from src.domain.models.client import Client
 
 from src.ai.memory import RedisMemory
 from src.domain.models.collection_register import CollectionRegister
 from src.integrations.indi.provider import IndiProvider
+from src.integrations.indi.async_provider import AsyncIndiProvider
+from src.integrations.indi.resilience import CircuitOpenError
 from src.utils.date.date_utils import get_current_day
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def get_wrapper_register_client(user_id: any, memory: RedisMemory, session_id: str = "", invoke_id: str = ""):
-    def register_client(name: str, phone_number: str, surname: str = "", code_phone: str = "PE", prefix_phone: str = "+51", email: str = "") -> str:
-        client = Client(
-            id=f"{prefix_phone}{phone_number}",
-            name=name,
-            surname=surname,
-            code_phone=code_phone,
-            prefix_phone=prefix_phone,
-            phone_number=phone_number,
-            email=email,
-            creditor_id=user_id
-        )
+SERVICE_UNAVAILABLE_MESSAGE = "El servicio de Indi no esta disponible en este momento. Indica al usuario que lo intente nuevamente en unos minutos."
+
+class _IndiCall:
+    """
+    Lo que una tool le pide a Indi: `request` recibe el proveedor y hace la llamada (con `AsyncIndiProvider`
+    retorna una corrutina) y `on_result` actualiza la memoria y arma la respuesta. `action` describe la
+    operación en los mensajes de error.
+    """
+
+    def __init__(self, action: str, request: Callable, on_result: Callable):
+        self.action = action
+        self.request = request
+        self.on_result = on_result
+
+def _tool_error(action: str, error: Exception, session_id: str, invoke_id: str) -> str:
+    if isinstance(error, CircuitOpenError):
+        logger.warning(f"Session ID: {session_id} - Invoke ID: {invoke_id} - Indi no disponible al {action}: {error}")
+        return SERVICE_UNAVAILABLE_MESSAGE
+    logger.error(f"Session ID: {session_id} - Invoke ID: {invoke_id} - Error al {action}: {error}")
+    return f"Error al {action}"
+
+def _sync_tool(plan: Callable, session_id: str, invoke_id: str):
+    """Tool síncrona a partir de `plan`, que arma el `_IndiCall`: la llamada se hace con `IndiProvider`."""
+    @functools.wraps(plan)
+    def tool(*args, **kwargs) -> str:
+        call = plan(*args, **kwargs)
         try:
-            indi_provider = IndiProvider()
-            logger.info(f"Session ID: {session_id} - Invoke ID: {invoke_id} - Calling tool register_client with params: name={name}\
-                        , phone_number={phone_number}, surname={surname}, code_phone={code_phone}, prefix_phone={prefix_phone}, email={email}")
-            client = indi_provider.create_client(client)
+            return call.on_result(call.request(IndiProvider()))
+        except Exception as e:
+            return _tool_error(call.action, e, session_id, invoke_id)
+
+    return tool
+
+def _async_tool(plan: Callable, session_id: str, invoke_id: str):
+    """Versión asíncrona de `_sync_tool`: la llamada se espera con `AsyncIndiProvider` sin bloquear el event loop."""
+    @functools.wraps(plan)
+    async def tool(*args, **kwargs) -> str:
+        call = plan(*args, **kwargs)
+        try:
+            return call.on_result(await call.request(AsyncIndiProvider()))
+        except Exception as e:
+            return _tool_error(call.action, e, session_id, invoke_id)
+
+    return tool
+
+def _build_client(user_id, name, phone_number, surname, code_phone, prefix_phone, email) -> Client:
+    return Client(
+        id=f"{prefix_phone}{phone_number}",
+        name=name,
+        surname=surname,
+        code_phone=code_phone,
+        prefix_phone=prefix_phone,
+        phone_number=phone_number,
+        email=email,
+        creditor_id=user_id
+    )
+
+def _register_client_plan(user_id: any, memory: RedisMemory, session_id: str = "", invoke_id: str = ""):
+    def register_client(name: str, phone_number: str, surname: str = "", code_phone: str = "PE", prefix_phone: str = "+51", email: str = ""):
+        client = _build_client(user_id, name, phone_number, surname, code_phone, prefix_phone, email)
+        logger.info(f"Session ID: {session_id} - Invoke ID: {invoke_id} - Calling tool register_client with params: name={name}\
+                    , phone_number={phone_number}, surname={surname}, code_phone={code_phone}, prefix_phone={prefix_phone}, email={email}")
+
+        def on_result(client: Client) -> str:
             memory.add_client(client)
             memory.save()
             logger.info(f"Session ID: {session_id} - Invoke ID: {invoke_id} - Se registro un nuevo cliente, con numero de telefono: {client.prefix_phone}{client.phone_number}")
             return f"Se registro un nuevo cliente, con numero de telefono: {client.prefix_phone}{client.phone_number}"
-        except Exception as e:
-            logger.error(f"Session ID: {session_id} - Invoke ID: {invoke_id} - Error al registrar el cliente: {e}")
-            return f"Error al registrar el cliente"
+
+        return _IndiCall("registrar el cliente", lambda provider: provider.create_client(client), on_result)
 
     return register_client
 
-def get_wrapper_register_collection(user_id: str, memory: RedisMemory, session_id: str = "", invoke_id: str = ""):
+def get_wrapper_register_client(user_id: any, memory: RedisMemory, session_id: str = "", invoke_id: str = ""):
+    return _sync_tool(_register_client_plan(user_id, memory, session_id, invoke_id), session_id, invoke_id)
+
+def get_async_wrapper_register_client(user_id: any, memory: RedisMemory, session_id: str = "", invoke_id: str = ""):
+    return _async_tool(_register_client_plan(user_id, memory, session_id, invoke_id), session_id, invoke_id)
+
+def _build_collection_register(user_id, subject, amount, name, clientPhoneNumber, surname, code_phone, prefix_phone
+                               , date, frequency_payment, total_quotas, currency, is_indefinite) -> CollectionRegister:
+    return CollectionRegister(
+        name=name,
+        surname=surname,
+        code_phone=code_phone,
+        prefix_phone=prefix_phone,
+        clientPhoneNumber=clientPhoneNumber,
+        description=subject,
+        currency=currency,
+        amount=amount,
+        collection_date=date,
+        total_quotas=total_quotas,
+        frequency_payment=frequency_payment,
+        creditor_id=user_id,
+        is_indefinite=is_indefinite,
+    )
+
+def _register_collection_plan(user_id: str, memory: RedisMemory, session_id: str = "", invoke_id: str = ""):
     def register_collection(subject: str, amount: float, name: str, clientPhoneNumber: str, surname: str = '', code_phone: str ='PE', prefix_phone: str = "+51"
-                            , date = get_current_day(), frequency_payment = "ÚNICO", total_quotas = 1, currency = "Soles (S/)", is_indefinite = False) -> str:
-        collection_register = CollectionRegister(
-            name=name,
-            surname=surname,
-            code_phone=code_phone,
-            prefix_phone=prefix_phone,
-            clientPhoneNumber=clientPhoneNumber,
-            description=subject,
-            currency=currency,
-            amount=amount,
-            collection_date=date,
-            total_quotas=total_quotas,
-            frequency_payment=frequency_payment,
-            creditor_id=user_id,
-            is_indefinite=is_indefinite,
-        )
-        try:
-            provider = IndiProvider()
-            logging.info(f"Session ID: {session_id} - Invoke ID: {invoke_id} - Calling tool register_collection with params: {collection_register}")
-            clients, collections = provider.create_collection(collection_register)
+                            , date = get_current_day(), frequency_payment = "ÚNICO", total_quotas = 1, currency = "Soles (S/)", is_indefinite = False):
+        collection_register = _build_collection_register(user_id, subject, amount, name, clientPhoneNumber, surname, code_phone, prefix_phone
+                                                         , date, frequency_payment, total_quotas, currency, is_indefinite)
+        logging.info(f"Session ID: {session_id} - Invoke ID: {invoke_id} - Calling tool register_collection with params: {collection_register}")
+
+        def on_result(created) -> str:
+            clients, collections = created
             logging.info(f"Session ID: {session_id} - Invoke ID: {invoke_id} - Successful call tool register_collection: {collections}")
             [memory.add_client(client) for client in clients]
             [memory.add_collection(collection) for collection in collections]
             memory.save()
             return f"Se registró un nuevo cobro de tipo {frequency_payment} con {total_quotas} cuota(s)."
-        except Exception as e:
-            logger.error(f"Session ID: {session_id} - Invoke ID: {invoke_id} - Error al registrar el cobro: {e}")
-            return f"Error al registrar el cobro"
+
+        return _IndiCall("registrar el cobro", lambda provider: provider.create_collection(collection_register), on_result)
 
     return register_collection
 
+def get_wrapper_register_collection(user_id: str, memory: RedisMemory, session_id: str = "", invoke_id: str = ""):
+    return _sync_tool(_register_collection_plan(user_id, memory, session_id, invoke_id), session_id, invoke_id)
+
+def get_async_wrapper_register_collection(user_id: str, memory: RedisMemory, session_id: str = "", invoke_id: str = ""):
+    return _async_tool(_register_collection_plan(user_id, memory, session_id, invoke_id), session_id, invoke_id)
+
 def get_wrapper_to_register_transfer(shared_state, session_id: str = "", invoke_id: str = ""):
     def to_register_transfer(receiver_name: str, amount: float,  receiver_phone: str = None) -> str:
         """Tool para registrar una transferencia de dinero a un usuario de la plataforma de pagos de Indi
@@ -84,23 +150,25 @@ def get_wrapper_to_register_transfer(shared_state, session_id: str = "", invoke_
 
     return to_register_transfer
 
-def get_wrapper_delete_collection(user_id: any, memory: RedisMemory, session_id: str = "", invoke_id: str = ""):
-    def delete_collection(collection_id: str) -> str:
-        logger.info(f"Invocando delete_collection con collection_id: {collection_id} y user_id: {user_id}")
-        try:
-            indi_provider = IndiProvider()
-            logger.info(f"Session ID: {session_id} - Invoke ID: {invoke_id} - Calling tool delete_collection with params: collection_id:{collection_id}, user_id:{user_id}")
-            indi_provider.delete_collection(collection_id, user_id)
+def _delete_collection_plan(user_id: any, memory: RedisMemory, session_id: str = "", invoke_id: str = ""):
+    def delete_collection(collection_id: str):
+        logger.info(f"Session ID: {session_id} - Invoke ID: {invoke_id} - Calling tool delete_collection with params: collection_id:{collection_id}, user_id:{user_id}")
+
+        def on_result(_) -> str:
             memory.delete_collection(collection_id)
             memory.save()
-            
             return f"Se eliminó la colección con ID: {collection_id}"
-        except Exception as e:
-            logger.error(f"Session ID: {session_id} - Invoke ID: {invoke_id} - Error al eliminar la colección: {e}")
-            return f"Error al eliminar la colección"
+
+        return _IndiCall("eliminar la colección", lambda provider: provider.delete_collection(collection_id, user_id), on_result)
 
     return delete_collection
 
+def get_wrapper_delete_collection(user_id: any, memory: RedisMemory, session_id: str = "", invoke_id: str = ""):
+    return _sync_tool(_delete_collection_plan(user_id, memory, session_id, invoke_id), session_id, invoke_id)
+
+def get_async_wrapper_delete_collection(user_id: any, memory: RedisMemory, session_id: str = "", invoke_id: str = ""):
+    return _async_tool(_delete_collection_plan(user_id, memory, session_id, invoke_id), session_id, invoke_id)
+
 def get_wrapper_verify_client_by_phone_number(user_id: any, memory: RedisMemory, session_id: str = "", invoke_id: str = ""):
     def verify_client_by_phone_number(phone_number: str) -> str:
         try:
@@ -1,5 +1,5 @@
 from src.ai.tools.creditor_schemas import RegisterClientSchema, RegisterCollectionSchema, RegisterTransferSchema, DeleteCollectionSchema, ValidatePhoneNumberSchema, VerifyClientByNameSchema, VerifyClientByPhoneNumberSchema
-from src.ai.tools.creditor_tools import get_wrapper_get_all_clients, get_wrapper_get_all_collections, get_wrapper_phone_validation, get_wrapper_register_client, get_wrapper_register_collection, get_wrapper_to_register_transfer, get_wrapper_delete_collection, get_wrapper_verify_client_by_name, get_wrapper_verify_client_by_phone_number
+from src.ai.tools.creditor_tools import get_async_wrapper_delete_collection, get_async_wrapper_register_client, get_async_wrapper_register_collection, get_wrapper_get_all_clients, get_wrapper_get_all_collections, get_wrapper_phone_validation, get_wrapper_register_client, get_wrapper_register_collection, get_wrapper_to_register_transfer, get_wrapper_delete_collection, get_wrapper_verify_client_by_name, get_wrapper_verify_client_by_phone_number
 from src.ai.memory import RedisMemory
 from langchain.tools import StructuredTool
 
@@ -15,6 +15,7 @@ def get_tools_acreetor(user_id, shared_state, memory: RedisMemory, session_id=''
             - Solo se puede invocar este tool si se realizo una invocacion de `verify_client_by_phone_number` anteriormente.
             """,
             func=get_wrapper_register_client(user_id, memory, session_id=session_id, invoke_id=invoke_id), 
+            coroutine=get_async_wrapper_register_client(user_id, memory, session_id=session_id, invoke_id=invoke_id),
             args_schema=RegisterClientSchema
         ),
         StructuredTool(
@@ -23,6 +24,7 @@ def get_tools_acreetor(user_id, shared_state, memory: RedisMemory, session_id=''
             Tool para registrar un nuevo cobro, registra automaticamente al cliente, en caso este no exista.
             """,
             func=get_wrapper_register_collection(user_id, memory, session_id=session_id, invoke_id=invoke_id), 
+            coroutine=get_async_wrapper_register_collection(user_id, memory, session_id=session_id, invoke_id=invoke_id),
             args_schema=RegisterCollectionSchema
         ),
         StructuredTool(
@@ -39,6 +41,7 @@ def get_tools_acreetor(user_id, shared_state, memory: RedisMemory, session_id=''
             Tool para eliminar un cobro.
             """,
             func=get_wrapper_delete_collection(user_id, memory, session_id=session_id, invoke_id=invoke_id), 
+            coroutine=get_async_wrapper_delete_collection(user_id, memory, session_id=session_id, invoke_id=invoke_id),
             args_schema=DeleteCollectionSchema
         ),
         StructuredTool(
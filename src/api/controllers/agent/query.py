@@ -53,8 +53,9 @@ async def agent_query(req: func.HttpRequest) -> func.HttpResponse:
 
     elif is_enterprise and message["status"] == "complete" and is_enterprise_file:
         logging.info("Message is an enterprise file with complete status")
-        conversation_service = ConversationService()
-        conversation_service.get_or_create_conversation(user)
+        if message.get("prefetched") is None:
+            conversation_service = ConversationService()
+            await conversation_service.aget_or_create_conversation(user)
         raw_message = message["message"]
         response = raw_message.message
         logging.info("Finish request")
@@ -64,9 +65,11 @@ async def agent_query(req: func.HttpRequest) -> func.HttpResponse:
         )
 
     elif message["status"] == "complete":
-        conversation_service = ConversationService()
-        conversation_service.get_or_create_conversation(user)
-        response = await message_processor.process_message(message["message"], user, is_enterprise)
+        prefetched = message.get("prefetched")
+        if prefetched is None:
+            conversation_service = ConversationService()
+            await conversation_service.aget_or_create_conversation(user)
+        response = await message_processor.process_message(message["message"], user, is_enterprise, prefetched)
         logging.info("Finish request")
         return func.HttpResponse(
             json.dumps(
@@ -0,0 +1,55 @@
+import json
+import logging
+
+import azure.functions as func
+
+from src.domain.services.enterprise_jobs import EnterpriseJobService
+
+logging.basicConfig(level=logging.INFO)
+get_enterprise_jobs = func.Blueprint()
+
+
+@get_enterprise_jobs.route(route="enterprise/jobs/{job_id}", methods=["GET"], auth_level="function")
+def enterprise_job_status(req: func.HttpRequest) -> func.HttpResponse:
+    job_id = req.route_params.get("job_id")
+    logging.info(f"Querying enterprise job status: {job_id}")
+    try:
+        status = EnterpriseJobService().get_status(job_id)
+        if status is None:
+            return func.HttpResponse(
+                json.dumps({"error": f"No existe el trabajo {job_id} o ya expiró."}),
+                mimetype="application/json",
+                status_code=404
+            )
+
+        return func.HttpResponse(
+            json.dumps({"status": "OK", "result": status}),
+            mimetype="application/json",
+        )
+
+    except Exception as e:
+        logging.error(f"Unexpected error querying job status: {e}", exc_info=True)
+        return func.HttpResponse(
+            json.dumps({"error": str(e)}),
+            mimetype="application/json",
+            status_code=500
+        )
+
+
+@get_enterprise_jobs.route(route="enterprise/users/{user_id}/jobs", methods=["GET"], auth_level="function")
+def enterprise_user_jobs(req: func.HttpRequest) -> func.HttpResponse:
+    user_id = req.route_params.get("user_id")
+    logging.info(f"Listing enterprise jobs for user: {user_id}")
+    try:
+        return func.HttpResponse(
+            json.dumps({"status": "OK", "result": EnterpriseJobService().list_user_jobs(user_id)}),
+            mimetype="application/json",
+        )
+
+    except Exception as e:
+        logging.error(f"Unexpected error listing user jobs: {e}", exc_info=True)
+        return func.HttpResponse(
+            json.dumps({"error": str(e)}),
+            mimetype="application/json",
+            status_code=500
+        )
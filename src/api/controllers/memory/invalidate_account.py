@@ -0,0 +1,49 @@
+import json
+import logging
+
+import azure.functions as func
+
+from src.domain.services.users import UserService
+
+logging.basicConfig(level=logging.INFO)
+post_memory_invalidate_account = func.Blueprint()
+
+
+@post_memory_invalidate_account.route(route="memory/accounts/invalidate", methods=["POST"], auth_level="function")
+def memory_invalidate_account(req: func.HttpRequest) -> func.HttpResponse:
+    logging.info("Starting account cache invalidation")
+    try:
+        data = req.get_json()
+        logging.info(f"Payload request: {data}")
+
+        phone_numbers = data.get("phoneNumbers") if isinstance(data, dict) else None
+        if not isinstance(phone_numbers, list) or not phone_numbers:
+            return func.HttpResponse(
+                json.dumps({"error": "El payload debe incluir una lista `phoneNumbers`."}),
+                mimetype="application/json",
+                status_code=400
+            )
+
+        user_service = UserService()
+        for phone_number in phone_numbers:
+            user_service.invalidate_account(phone_number)
+
+        return func.HttpResponse(
+            json.dumps({"status": "OK", "result": phone_numbers}),
+            mimetype="application/json",
+        )
+
+    except ValueError:
+        logging.error("Invalid JSON payload")
+        return func.HttpResponse(
+            json.dumps({"error": "JSON inválido."}),
+            mimetype="application/json",
+            status_code=400
+        )
+    except Exception as e:
+        logging.error(f"Unexpected error during invalidation: {e}", exc_info=True)
+        return func.HttpResponse(
+            json.dumps({"error": str(e)}),
+            mimetype="application/json",
+            status_code=500
+        )
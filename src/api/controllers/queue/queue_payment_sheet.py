@@ -1,46 +1,203 @@
 import os
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
 import azure.functions as func
 
 from src.utils.logger import get_function_logger
-from src.domain.services.service_bus import send_message_to_queue
+from src.utils.metrics import metrics
+from src.domain.services.service_bus import send_message_to_queue, send_messages_to_queue
+from src.domain.services.enterprise_jobs import FAILED_STATE, EnterpriseJobService
+from src.domain.services.claim_check import check_out
 from src.utils.ocr.files_utils import execute_ai_processing_task
 
 logger = get_function_logger("function_app")
 
 queue_bp = func.Blueprint()
 
+AI_WORKER_BATCH_ENABLED = os.getenv("AI_WORKER_BATCH_ENABLED", "false").lower() == "true"
+AI_WORKER_MAX_ATTEMPTS = int(os.getenv("AI_WORKER_MAX_ATTEMPTS", "3"))
+
+_ai_executor = ThreadPoolExecutor(max_workers=int(os.getenv("AI_WORKER_CONCURRENCY", "4")))
 
-@queue_bp.service_bus_queue_trigger(
-    arg_name="msg",
-    queue_name=os.getenv("AZURE_SERVICE_BUS_MA_FIRST_STEP_QUEUE"),
-    connection="AZURE_SERVICE_BUS_MA_CONNECTION_STRING",
-)
-def service_bus_trigger_ai_worker(msg: func.ServiceBusMessage):
+
+def _process_task(message: dict) -> Tuple[Optional[str], Optional[dict]]:
     """
-    Función principal que se activa con un mensaje de la cola de Service Bus.
+    Ejecuta la tarea de IA de un mensaje de la cola. Retorna el `job_id` y el resultado a publicar en la
+    cola final, o `None` como resultado si faltan otras partes del archivo o si una entrega anterior ya
+    lo publicó.
+    Las partes ya procesadas de un job se toman de Redis sin volver a llamar a la IA.
     """
-    logger.info(
-        f"Worker recibió un nuevo mensaje de la cola '{os.getenv('AZURE_SERVICE_BUS_MA_FIRST_STEP_QUEUE')}'."
-    )
+    ai_task_payload = check_out(message)
+    if "job_id" not in ai_task_payload:
+        return None, execute_ai_processing_task(ai_task_payload)
 
+    job_id, chunk_index = ai_task_payload["job_id"], ai_task_payload["chunk_index"]
+    jobs = EnterpriseJobService()
+    final_json_result = jobs.get_chunk_result(job_id, chunk_index)
+    if final_json_result is not None:
+        metrics.increment("worker.ai.deduplicated")
+        logger.info(f"Parte {chunk_index} del job {job_id} ya estaba procesada; se reutiliza sin llamar a la IA.")
+    else:
+        jobs.update_status(job_id, "processing")
+        start_time = time.perf_counter()
+        try:
+            final_json_result = execute_ai_processing_task(ai_task_payload)
+        except Exception as e:
+            jobs.update_status(job_id, stage="ai", seconds=time.perf_counter() - start_time, error=f"Parte {chunk_index}: {e}")
+            raise
+        jobs.update_status(job_id, stage="ai", seconds=time.perf_counter() - start_time)
+        logger.debug(f"Resultado de la parte {chunk_index} del job {job_id}: {final_json_result}")
+
+    final_json_result = jobs.save_chunk_result(job_id, chunk_index, ai_task_payload["chunk_count"], final_json_result)
+    if final_json_result is None:
+        logger.info(f"Parte {chunk_index} del job {job_id} procesada; faltan partes o el resultado ya se publicó.")
+    return job_id, final_json_result
+
+
+def _claim_results(processed: List[Tuple[Optional[str], Optional[dict]]]) -> Tuple[List[dict], Dict[str, str]]:
+    """
+    Resultados a publicar en la cola final: uno por job (un lote puede traer dos copias de la misma parte) y
+    solo de los jobs cuya marca de publicación se pudo tomar. Retorna los resultados y el dueño de la marca
+    de cada job tomado, para marcarlos como publicados o liberar la marca si el envío falla.
+    """
+    jobs = EnterpriseJobService()
+    results, claimed = [], {}
+    for job_id, result in processed:
+        if result is None:
+            continue
+        if job_id is None:
+            results.append(result)
+        elif job_id not in claimed:
+            owner = jobs.acquire_publish_lease(job_id)
+            if owner:
+                results.append(result)
+                claimed[job_id] = owner
+    return results, claimed
+
+
+def _publish(results: List[dict], claimed: Dict[str, str]):
+    """
+    Envía los resultados a la cola final y marca sus jobs como publicados. Si el envío falla se liberan las
+    marcas antes de propagar el error, así la reentrega del mensaje vuelve a publicar. Un lote enviado en
+    parte puede entonces publicarse dos veces; es preferible a no publicarlo.
+    """
+    jobs = EnterpriseJobService()
+    final_queue = os.getenv("AZURE_SERVICE_BUS_MA_FINAL_STEP_QUEUE")
+    publish_start = time.perf_counter()
     try:
-        message_body = msg.get_body().decode("utf-8")
-        ai_task_payload = json.loads(message_body)
+        if len(results) == 1:
+            send_message_to_queue(results[0], final_queue)
+        else:
+            send_messages_to_queue(results, final_queue)
+    except Exception:
+        for job_id, owner in claimed.items():
+            jobs.release_publish_lease(job_id, owner)
+        raise
+    for job_id in claimed:
+        jobs.mark_published(job_id, time.perf_counter() - publish_start)
 
-        print("#########################################################################################################################################################")
-        final_json_result = execute_ai_processing_task(ai_task_payload)
 
-        print(final_json_result)
+if not AI_WORKER_BATCH_ENABLED:
 
-        send_message_to_queue(
-            final_json_result, os.getenv("AZURE_SERVICE_BUS_MA_FINAL_STEP_QUEUE")
+    @queue_bp.service_bus_queue_trigger(
+        arg_name="msg",
+        queue_name=os.getenv("AZURE_SERVICE_BUS_MA_FIRST_STEP_QUEUE"),
+        connection="AZURE_SERVICE_BUS_MA_CONNECTION_STRING",
+    )
+    def service_bus_trigger_ai_worker(msg: func.ServiceBusMessage):
+        """
+        Función principal que se activa con un mensaje de la cola de Service Bus.
+        """
+        logger.info(
+            f"Worker recibió un nuevo mensaje de la cola '{os.getenv('AZURE_SERVICE_BUS_MA_FIRST_STEP_QUEUE')}'."
         )
 
+        try:
+            message_body = msg.get_body().decode("utf-8")
+            results, claimed = _claim_results([_process_task(json.loads(message_body))])
+            if not results:
+                return
+
+            _publish(results, claimed)
+
+            logger.info(
+                f"Tarea completada. Resultado enviado a la cola '{os.getenv('AZURE_SERVICE_BUS_MA_FINAL_STEP_QUEUE')}'."
+            )
+
+        except Exception as e:
+            logger.error(f"El worker falló al procesar el mensaje: {e}")
+            raise
+
+else:
+
+    @queue_bp.service_bus_queue_trigger(
+        arg_name="msgs",
+        queue_name=os.getenv("AZURE_SERVICE_BUS_MA_FIRST_STEP_QUEUE"),
+        connection="AZURE_SERVICE_BUS_MA_CONNECTION_STRING",
+        cardinality=func.Cardinality.MANY,
+    )
+    def service_bus_trigger_ai_batch_worker(msgs: List[func.ServiceBusMessage]):
+        """
+        Variante por lotes (`AI_WORKER_BATCH_ENABLED`): recibe hasta `maxMessageBatchSize` mensajes y ejecuta
+        sus tareas de IA en paralelo, con a lo sumo `AI_WORKER_CONCURRENCY` llamadas a la vez por instancia.
+
+        El lote se completa en bloque, así que cada mensaje se resuelve por separado: los resultados se
+        publican juntos en la cola final y los mensajes fallidos se vuelven a encolar con su intento
+        incrementado. Tras `AI_WORKER_MAX_ATTEMPTS` intentos el mensaje se envía a
+        `AZURE_SERVICE_BUS_MA_FIRST_STEP_FAILED_QUEUE` si está configurada, o se registra como error.
+        """
+        start_time = time.perf_counter()
+        first_step_queue = os.getenv("AZURE_SERVICE_BUS_MA_FIRST_STEP_QUEUE")
+        logger.info(f"Worker recibió un lote de {len(msgs)} mensajes de la cola '{first_step_queue}'.")
+
+        messages = []
+        for msg in msgs:
+            try:
+                messages.append(json.loads(msg.get_body().decode("utf-8")))
+            except ValueError as e:
+                metrics.increment("worker.ai.invalid")
+                logger.error(f"Mensaje {msg.message_id} descartado, no es un JSON válido: {e}")
+
+        futures = [_ai_executor.submit(_process_task, message) for message in messages]
+        processed, retries, exhausted = [], [], []
+        for message, future in zip(messages, futures):
+            try:
+                processed.append(future.result())
+                metrics.increment("worker.ai.succeeded")
+            except Exception as e:
+                attempt = message.get("attempt", 1)
+                logger.error(f"La tarea falló en el intento {attempt}/{AI_WORKER_MAX_ATTEMPTS}: {e}")
+                metrics.increment("worker.ai.failed")
+                if attempt < AI_WORKER_MAX_ATTEMPTS:
+                    retries.append({**message, "attempt": attempt + 1})
+                else:
+                    exhausted.append(message)
+
+        # La marca de publicación se toma recién aquí, con todas las tareas del lote terminadas.
+        results, claimed = _claim_results(processed)
+        if results:
+            _publish(results, claimed)
+        if retries:
+            metrics.increment("worker.ai.retried", len(retries))
+            send_messages_to_queue(retries, first_step_queue)
+        if exhausted:
+            metrics.increment("worker.ai.exhausted", len(exhausted))
+            jobs = EnterpriseJobService()
+            for message in exhausted:
+                if message.get("job_id"):
+                    jobs.update_status(message["job_id"], FAILED_STATE, error=f"Intentos agotados ({AI_WORKER_MAX_ATTEMPTS})")
+            failed_queue = os.getenv("AZURE_SERVICE_BUS_MA_FIRST_STEP_FAILED_QUEUE")
+            if failed_queue:
+                send_messages_to_queue(exhausted, failed_queue)
+            else:
+                references = [message.get("job_id") or message.get("claim_check") for message in exhausted]
+                logger.error(f"{len(exhausted)} tareas agotaron sus intentos y se descartan: {references}")
+
+        metrics.observe("worker.ai.batch_seconds", time.perf_counter() - start_time)
         logger.info(
-            f"Tarea completada. Resultado enviado a la cola '{os.getenv('AZURE_SERVICE_BUS_MA_FINAL_STEP_QUEUE')}'."
+            f"Lote procesado: {len(results)} resultados publicados, {len(retries)} reencolados, "
+            f"{len(exhausted)} agotados en {time.perf_counter() - start_time:.2f} segundos."
         )
-
-    except Exception as e:
-        logger.error(f"El worker falló al procesar el mensaje: {e}")
-        raise
@@ -1,4 +1,5 @@
 import uuid
+import asyncio
 import logging
 import requests
 from enum import Enum
@@ -8,6 +9,7 @@ from src.domain.models.user import User, UserType
 from typing import Dict, Any, Optional, Tuple, List
 from src.domain.services.messages import MessageService
 from src.domain.services.aggregator import AggregatorService
+from src.domain.services.prefetch import PrefetchService
 from src.utils.ocr.ocr import (
     process_image_ocr,
     process_enterprise_file_ocr,
@@ -142,11 +144,16 @@ class JelouChannel(Channel):
                 return None
 
             message_type = MessageType(data.get("data", {}).get("type", MessageType.TEXT.value))
-            incoming_message, message_mediaUrl = self._message_parser_dispatcher(message_type, data, user)
+            if message_type in (MessageType.IMAGE, MessageType.FILE):
+                # El OCR es bloqueante: se ejecuta fuera del event loop para no frenar a otras conversaciones.
+                incoming_message, message_mediaUrl = await asyncio.to_thread(self._message_parser_dispatcher, message_type, data, user)
+            else:
+                incoming_message, message_mediaUrl = self._message_parser_dispatcher(message_type, data, user)
             image = {}
 
             aggregator = AggregatorService()
             await aggregator.buffer_message(sender, incoming_message, message_type.value, message_mediaUrl)
+            prefetch_task = PrefetchService().start(user, is_enterprise)
             aggregated_message = await aggregator.aggregate_if_ready(sender)
             status = aggregated_message["status"]
             logging.info(f"Session ID: {user.current_session_id} - Status message: {status}")
@@ -157,6 +164,7 @@ class JelouChannel(Channel):
                 aggregated_message["message"] = Message(sender=sender, message=final_message, source=message_type.value, provider=self.provider
                 , image=image, force_anonymous=force_anonymous, mediaUrl=message_mediaUrl
                 , caption=data.get("data", {}).get("caption", None), listed_messages=aggregated_message["listed_messages"])
+                aggregated_message["prefetched"] = await PrefetchService.collect(prefetch_task)
 
             elif status == "interal_failure":
                 message_service = MessageService()
@@ -0,0 +1,24 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+from src.domain.models.client import Client
+from src.domain.models.collection import Collection
+
+
+class BulkItemResult(BaseModel):
+    index: int
+    creditor_id: str
+    success: bool
+    clients: List[Client] = Field(default_factory=list)
+    collections: List[Collection] = Field(default_factory=list)
+    error: Optional[str] = None
+
+    def to_dict(self):
+        return {
+            "index": self.index,
+            "creditor_id": self.creditor_id,
+            "success": self.success,
+            "clients": [client.id for client in self.clients],
+            "collections": [collection.id for collection in self.collections],
+            "error": self.error,
+        }
@@ -0,0 +1,65 @@
+import os
+import json
+import hashlib
+import tempfile
+
+from src.utils.logger import get_function_logger
+from src.utils.metrics import metrics
+
+logger = get_function_logger("function_app")
+
+CLAIM_CHECK_KEY = "claim_check"
+
+
+def get_payload_storage():
+    """
+    Almacenamiento de los payloads grandes según `CLAIM_CHECK_BACKEND`: `azure` (contenedor
+    `CLAIM_CHECK_CONTAINER`) o `local` (carpeta `CLAIM_CHECK_LOCAL_DIR`, para pruebas).
+    """
+    if os.getenv("CLAIM_CHECK_BACKEND", "azure").lower() == "local":
+        from src.utils.storage.storage_local import StorageLocal
+        return StorageLocal(os.getenv("CLAIM_CHECK_LOCAL_DIR", os.path.join(tempfile.gettempdir(), "claim_check")))
+
+    from src.utils.storage.storage_azure import StorageAzure
+    return StorageAzure(os.getenv("CLAIM_CHECK_CONTAINER", "service-bus-payloads"))
+
+
+def check_in(payload: dict, storage=None) -> dict:
+    """
+    Si el payload serializado supera `CLAIM_CHECK_THRESHOLD_BYTES`, lo guarda en el almacenamiento con su
+    SHA-256 como nombre y retorna solo la referencia `{"claim_check": {"blob", "sha256", "size"}}`, con el
+    `job_id` del payload si lo tiene. Los payloads pequeños se retornan tal cual.
+    """
+    body = json.dumps(payload).encode("utf-8")
+    if len(body) <= int(os.getenv("CLAIM_CHECK_THRESHOLD_BYTES", "196608")):
+        return payload
+
+    digest = hashlib.sha256(body).hexdigest()
+    blob_name = f"{digest}.json"
+    (storage or get_payload_storage()).upload(blob_name, body, type="json")
+    metrics.increment("service_bus.claim_check.stored")
+    metrics.increment("service_bus.claim_check.bytes", len(body))
+    logger.info(f"Payload de {len(body)} bytes guardado como '{blob_name}'; se encola solo la referencia.")
+    reference = {CLAIM_CHECK_KEY: {"blob": blob_name, "sha256": digest, "size": len(body)}}
+    if "job_id" in payload:
+        reference["job_id"] = payload["job_id"]
+    return reference
+
+
+def check_out(message: dict, storage=None) -> dict:
+    """
+    Retorna el payload del mensaje: si trae una referencia `claim_check` lo descarga y verifica su hash;
+    si no, el mensaje ya es el payload.
+
+    Raises:
+        ValueError: Si el contenido descargado no coincide con el hash de la referencia.
+    """
+    reference = message.get(CLAIM_CHECK_KEY)
+    if reference is None:
+        return message
+
+    body = (storage or get_payload_storage()).download(reference["blob"])
+    if hashlib.sha256(body).hexdigest() != reference["sha256"]:
+        raise ValueError(f"El payload '{reference['blob']}' no coincide con su hash.")
+    metrics.increment("service_bus.claim_check.fetched")
+    return json.loads(body)
@@ -0,0 +1,118 @@
+import os
+import json
+import time
+import logging
+from typing import Dict, List, Optional
+
+import redis
+
+from src.utils.metrics import metrics
+from src.domain.models.collection import Collection
+from src.integrations.indi.provider import IndiProvider
+from src.integrations.indi.async_provider import AsyncIndiProvider
+
+logger = logging.getLogger(__name__)
+
+
+class CollectionSyncService:
+    """
+    Sincroniza los cobros de un acreedor contra Indi de forma incremental.
+
+    Mantiene en Redis una copia de los cobros junto con el cursor de la última sincronización
+    (`collections_snapshot:{user_phone}`). Con cursor solo se piden los cambios desde esa marca y se
+    combinan sobre la copia; sin cursor, o si la consulta incremental falla, se hace la descarga completa.
+    Si Indi responde a la consulta incremental con una lista simple, se toma como descarga completa.
+    Desactivado por defecto (`COLLECTIONS_DELTA_SYNC_ENABLED`) hasta validar el contrato de `updatedSince`.
+    """
+
+    def __init__(self, indi_provider: Optional[IndiProvider] = None, async_indi_provider: Optional[AsyncIndiProvider] = None):
+        self.redis_client = redis.from_url(os.getenv("REDIS_INDIBOT"), decode_responses=True)
+        self.indi_provider = indi_provider or IndiProvider()
+        self.async_indi_provider = async_indi_provider or AsyncIndiProvider()
+        self.redis_prefix = "collections_snapshot"
+        self.snapshot_time = int(os.getenv("COLLECTIONS_SNAPSHOT_TTL", "604800"))
+        self.enabled = os.getenv("COLLECTIONS_DELTA_SYNC_ENABLED", "false").lower() == "true"
+
+    def _load_snapshot(self, user_phone: str) -> Optional[dict]:
+        raw = self.redis_client.get(f"{self.redis_prefix}:{user_phone}")
+        if not raw:
+            return None
+        try:
+            snapshot = json.loads(raw)
+        except json.JSONDecodeError:
+            return None
+        return snapshot if snapshot.get("cursor") else None
+
+    def _save_snapshot(self, user_phone: str, collections: Dict[str, Collection], cursor: str):
+        snapshot = {
+            "cursor": cursor,
+            "collections": [collection.model_dump() for collection in collections.values()],
+        }
+        self.redis_client.set(f"{self.redis_prefix}:{user_phone}", json.dumps(snapshot), ex=self.snapshot_time)
+
+    @staticmethod
+    def merge_changes(collections: Dict[str, Collection], changes: List[Collection]) -> Dict[str, Collection]:
+        """Aplica los cambios sobre los cobros: los inactivos se eliminan y el resto se inserta o reemplaza."""
+        for collection in changes:
+            if collection.active is False:
+                collections.pop(collection.id, None)
+            else:
+                collections[collection.id] = collection
+        return collections
+
+    def _apply_delta(self, user_phone: str, snapshot: dict, changes: List[Collection], cursor: str) -> List[Collection]:
+        collections = {item["id"]: Collection(**item) for item in snapshot.get("collections", [])}
+        collections = self.merge_changes(collections, changes)
+        self._save_snapshot(user_phone, collections, cursor)
+        metrics.increment("collections_sync.delta")
+        metrics.increment("collections_sync.delta_items", len(changes))
+        logger.info(f"Delta sync for {user_phone}: {len(changes)} changes, {len(collections)} collections")
+        return list(collections.values())
+
+    def _apply_full(self, user_phone: str, collections_list: List[Collection], cursor: str) -> List[Collection]:
+        """Reemplaza la copia con la descarga completa; los inactivos se descartan igual que en `merge_changes`."""
+        collections = self.merge_changes({}, collections_list)
+        if self.enabled:
+            self._save_snapshot(user_phone, collections, cursor)
+        metrics.increment("collections_sync.full")
+        return list(collections.values())
+
+    def sync(self, user_phone: str) -> List[Collection]:
+        """Retorna los cobros vigentes del acreedor usando la sincronización incremental cuando es posible."""
+        start_time = time.perf_counter()
+        snapshot = self._load_snapshot(user_phone) if self.enabled else None
+        try:
+            if snapshot:
+                try:
+                    changes, cursor, is_full = self.indi_provider.get_collection_changes_by_user_id(user_phone, snapshot["cursor"])
+                    if is_full:
+                        return self._apply_full(user_phone, changes, cursor)
+                    return self._apply_delta(user_phone, snapshot, changes, cursor)
+                except Exception as e:
+                    metrics.increment("collections_sync.delta_errors")
+                    logger.warning(f"Delta sync failed for {user_phone}, falling back to full resync: {e}")
+
+            cursor = self.indi_provider.get_sync_timestamp()
+            return self._apply_full(user_phone, self.indi_provider.get_collection_by_user_id(user_phone), cursor)
+        finally:
+            metrics.observe("collections_sync.seconds", time.perf_counter() - start_time)
+
+    async def async_sync(self, user_phone: str) -> List[Collection]:
+        """Versión asíncrona de `sync` sobre `AsyncIndiProvider`."""
+        start_time = time.perf_counter()
+        snapshot = self._load_snapshot(user_phone) if self.enabled else None
+        try:
+            if snapshot:
+                try:
+                    changes, cursor, is_full = await self.async_indi_provider.get_collection_changes_by_user_id(user_phone, snapshot["cursor"])
+                    if is_full:
+                        return self._apply_full(user_phone, changes, cursor)
+                    return self._apply_delta(user_phone, snapshot, changes, cursor)
+                except Exception as e:
+                    metrics.increment("collections_sync.delta_errors")
+                    logger.warning(f"Delta sync failed for {user_phone}, falling back to full resync: {e}")
+
+            cursor = self.async_indi_provider.get_sync_timestamp()
+            return self._apply_full(user_phone, await self.async_indi_provider.get_collection_by_user_id(user_phone), cursor)
+        finally:
+            metrics.observe("collections_sync.seconds", time.perf_counter() - start_time)
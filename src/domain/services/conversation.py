@@ -1,38 +1,146 @@
 import os
+import json
+import time
+import asyncio
+import logging
 import redis
+from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from src.utils.metrics import metrics
 from src.domain.models.user import User
 from src.integrations.indi.provider import IndiProvider
+from src.integrations.indi.async_provider import AsyncIndiProvider
+from src.domain.services.collection_sync import CollectionSyncService
 from src.domain.models.conversation import Conversation
 
+logger = logging.getLogger(__name__)
+
+SECTIONS = ("clients", "collections")
+
+_bootstrap_executor = ThreadPoolExecutor(max_workers=int(os.getenv("CONVERSATION_BOOTSTRAP_WORKERS", "8")))
+
 
 class ConversationService:
     def __init__(self):
         self.redis_client = redis.from_url(os.getenv("REDIS_INDIBOT"), decode_responses=True)
         self.indi_provider = IndiProvider()
+        self.async_indi_provider = AsyncIndiProvider()
+        self.collection_sync_service = CollectionSyncService(self.indi_provider, self.async_indi_provider)
         self.redis_prefix = "conversation"
+        self.partial_prefix = "conversation_partial"
         self.session_buffer_time = int(os.getenv("SESSION_BUFFER_WAIT_TIME"))
+        self.partial_retry_time = int(os.getenv("CONVERSATION_PARTIAL_RETRY_TIME", "60"))
 
-    def get_or_create_conversation(self, user: User) -> Conversation:
-        conversation = self.redis_client.get(f"{self.redis_prefix}:{user.user_id}")
-        if conversation:
-            return Conversation.model_validate_json(conversation)
-        
-        if(user.is_indi_user):
-            clients_list = self.indi_provider.get_clients_by_user_id(user.user_id)
-            collections_list = self.indi_provider.get_collection_by_user_id(user.user_id)
-            clients_dict = {client.id: client for client in clients_list}
-            collections_dict = {collection.id: collection for collection in collections_list}
-            conversation = Conversation(
-                messages=[],
-                clients=clients_dict,
-                collections=collections_dict,
-            )
+    def _load(self, user: User):
+        pipe = self.redis_client.pipeline()
+        pipe.get(f"{self.redis_prefix}:{user.user_id}")
+        pipe.get(f"{self.partial_prefix}:{user.user_id}")
+        return pipe.execute()
+
+    def _fetch_sections(self, user: User, sections) -> Dict[str, object]:
+        """Consulta en paralelo las secciones pedidas; cada resultado es la lista o la excepción obtenida."""
+        fetchers = {
+            "clients": self.indi_provider.get_clients_by_user_id,
+            "collections": self.collection_sync_service.sync,
+        }
+        futures = {section: _bootstrap_executor.submit(fetchers[section], user.user_id) for section in sections}
+        results = {}
+        for section, future in futures.items():
+            try:
+                results[section] = future.result()
+            except Exception as e:
+                results[section] = e
+        return results
+
+    async def _afetch_sections(self, user: User, sections) -> Dict[str, object]:
+        fetchers = {
+            "clients": self.async_indi_provider.get_clients_by_user_id,
+            "collections": self.collection_sync_service.async_sync,
+        }
+        results = await asyncio.gather(*(fetchers[section](user.user_id) for section in sections), return_exceptions=True)
+        return dict(zip(sections, results))
+
+    def _failed_sections(self, user: User, results: Dict[str, object]) -> List[str]:
+        failed_sections = []
+        for section, result in results.items():
+            if isinstance(result, BaseException):
+                failed_sections.append(section)
+                metrics.increment(f"conversation.bootstrap.{section}.errors")
+                logger.error(f"Session ID: {user.current_session_id} - Error loading {section} from Indi: {result}")
+        return failed_sections
+
+    def _merge_sections(self, conversation: Conversation, results: Dict[str, object]) -> Conversation:
+        if isinstance(results.get("clients"), list):
+            conversation.clients = {client.id: client for client in results["clients"]}
+        if isinstance(results.get("collections"), list):
+            conversation.collections = {collection.id: collection for collection in results["collections"]}
+        return conversation
+
+    def _save_bootstrap(self, user: User, conversation: Conversation, failed_sections: List[str], keep_ttl: bool = False):
+        """
+        Guarda la conversación y, si alguna sección falló, una marca con las secciones pendientes
+        para reintentarlas en un próximo request en lugar de esperar a que expire la sesión.
+        """
+        pipe = self.redis_client.pipeline()
+        key = f"{self.redis_prefix}:{user.user_id}"
+        if keep_ttl:
+            pipe.set(key, conversation.model_dump_json(), keepttl=True)
         else:
-            conversation = Conversation(
-                messages=[],
-                clients={},
-                collections={},
-            )
-        
-        self.redis_client.set(f"{self.redis_prefix}:{user.user_id}", conversation.model_dump_json(), ex=self.session_buffer_time)
+            pipe.set(key, conversation.model_dump_json(), ex=self.session_buffer_time)
+        partial_key = f"{self.partial_prefix}:{user.user_id}"
+        if failed_sections:
+            marker = {"sections": failed_sections, "retry_at": time.time() + self.partial_retry_time}
+            pipe.set(partial_key, json.dumps(marker), ex=self.session_buffer_time)
+        else:
+            pipe.delete(partial_key)
+        pipe.execute()
         return conversation
+
+    def _pending_sections(self, partial: Optional[str]) -> List[str]:
+        if not partial:
+            return []
+        marker = json.loads(partial)
+        if marker.get("retry_at", 0) > time.time():
+            return []
+        return [section for section in marker.get("sections", []) if section in SECTIONS]
+
+    def get_or_create_conversation(self, user: User) -> Conversation:
+        conversation, partial = self._load(user)
+        if conversation:
+            conversation = Conversation.model_validate_json(conversation)
+            pending_sections = self._pending_sections(partial)
+            if pending_sections:
+                results = self._fetch_sections(user, pending_sections)
+                self._save_bootstrap(user, self._merge_sections(conversation, results), self._failed_sections(user, results), keep_ttl=True)
+            return conversation
+
+        conversation = Conversation(messages=[], clients={}, collections={})
+        if not user.is_indi_user:
+            return self._save_bootstrap(user, conversation, [])
+
+        results = self._fetch_sections(user, SECTIONS)
+        failed_sections = self._failed_sections(user, results)
+        if len(failed_sections) == len(SECTIONS):
+            raise results["clients"]
+        return self._save_bootstrap(user, self._merge_sections(conversation, results), failed_sections)
+
+    async def aget_or_create_conversation(self, user: User) -> Conversation:
+        """Igual que `get_or_create_conversation`, pero consulta Indi con `AsyncIndiProvider` sin bloquear el event loop."""
+        conversation, partial = self._load(user)
+        if conversation:
+            conversation = Conversation.model_validate_json(conversation)
+            pending_sections = self._pending_sections(partial)
+            if pending_sections:
+                results = await self._afetch_sections(user, pending_sections)
+                self._save_bootstrap(user, self._merge_sections(conversation, results), self._failed_sections(user, results), keep_ttl=True)
+            return conversation
+
+        conversation = Conversation(messages=[], clients={}, collections={})
+        if not user.is_indi_user:
+            return self._save_bootstrap(user, conversation, [])
+
+        results = await self._afetch_sections(user, SECTIONS)
+        failed_sections = self._failed_sections(user, results)
+        if len(failed_sections) == len(SECTIONS):
+            raise results["clients"]
+        return self._save_bootstrap(user, self._merge_sections(conversation, results), failed_sections)
@@ -0,0 +1,249 @@
+import os
+import json
+import time
+import uuid
+import logging
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Union
+
+import redis
+import xxhash
+from redis.exceptions import RedisError, WatchError
+
+logger = logging.getLogger(__name__)
+
+JOB_STATES = ("queued", "processing", "structuring", "published")
+FAILED_STATE = "failed"
+
+
+def build_job_id(user_id: str, prompt: str, parts: Iterable[Union[str, bytes]]) -> str:
+    """
+    Id determinista del trabajo: hash del usuario, el prompt (que identifica su versión) y los datos, en
+    texto o en bytes (por ejemplo, el archivo original). Una reentrega o una nueva subida del mismo archivo
+    obtiene el mismo id.
+    """
+    digest = xxhash.xxh3_128()
+    for value in (user_id, prompt, *parts):
+        digest.update(value if isinstance(value, bytes) else value.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class EnterpriseJobService:
+    """
+    Une los resultados de un archivo empresarial procesado por partes. Cada parte guarda su JSON en
+    `enterprise_job:{job_id}:chunks`; la que completa el conjunto arma el resultado final y lo deja en
+    `enterprise_job:{job_id}:result`, para responder sin la IA a una subida repetida. La publicación se
+    protege con una marca con vencimiento (`acquire_publish_lease`), así una entrega duplicada del mensaje
+    no publica dos veces.
+
+    El avance del trabajo se registra en `enterprise_job:{job_id}:status` (estado, partes y segundos por
+    etapa) y los últimos trabajos de cada usuario en `enterprise_job:user:{user_id}`. Estos registros son
+    informativos: un error de Redis al escribirlos se registra y no interrumpe el procesamiento.
+    """
+
+    def __init__(self):
+        self.redis_client = redis.from_url(os.getenv("REDIS_INDIBOT"), decode_responses=True)
+        self.redis_prefix = "enterprise_job"
+        self.job_ttl = int(os.getenv("ENTERPRISE_JOB_TTL", "86400"))
+        self.stale_seconds = int(os.getenv("ENTERPRISE_JOB_STALE_SECONDS", "900"))
+        self.publish_lease = int(os.getenv("ENTERPRISE_JOB_PUBLISH_LEASE", "30"))
+        self.user_jobs_limit = int(os.getenv("ENTERPRISE_JOB_USER_HISTORY", "20"))
+
+    @staticmethod
+    def merge_results(results: List[dict]) -> dict:
+        """Concatena las listas `acreetors` de las partes, en orden, bajo el `user_id` de la primera."""
+        merged = {"user_id": results[0].get("user_id"), "acreetors": []}
+        for result in results:
+            merged["acreetors"].extend(result.get("acreetors", []))
+        return merged
+
+    def get_chunk_result(self, job_id: str, chunk_index: int) -> Optional[dict]:
+        """Resultado ya guardado de una parte, si una entrega anterior del mensaje llegó a procesarla."""
+        stored = self.redis_client.hget(f"{self.redis_prefix}:{job_id}:chunks", str(chunk_index))
+        return json.loads(stored) if stored else None
+
+    def get_job_result(self, job_id: str) -> Optional[dict]:
+        """Resultado final de un trabajo ya completado."""
+        stored = self.redis_client.get(f"{self.redis_prefix}:{job_id}:result")
+        return json.loads(stored) if stored else None
+
+    def acquire_publish_lease(self, job_id: str) -> Optional[str]:
+        """
+        Toma el permiso para publicar el resultado del job: una marca con dueño y hora que vence a los
+        `ENTERPRISE_JOB_PUBLISH_LEASE` segundos. Retorna el dueño, o `None` si el resultado ya se publicó o
+        si otra ejecución lo está publicando; solo al vencer su marca (porque cayó antes de `mark_published`)
+        una reentrega puede volver a publicarlo. El plazo debe ser menor que el bloqueo de los mensajes de
+        la cola, así la reentrega del mensaje de un publicador caído encuentra la marca vencida.
+        """
+        if self.redis_client.exists(f"{self.redis_prefix}:{job_id}:published"):
+            logger.info(f"Job {job_id}: el resultado ya fue publicado")
+            return None
+        owner = uuid.uuid4().hex
+        lease = json.dumps({"owner": owner, "acquired_at": time.time()})
+        if not self.redis_client.set(f"{self.redis_prefix}:{job_id}:lease", lease, nx=True, ex=self.publish_lease):
+            held = self.redis_client.get(f"{self.redis_prefix}:{job_id}:lease")
+            logger.info(f"Job {job_id}: otra ejecución está publicando el resultado ({held})")
+            return None
+        return owner
+
+    def release_publish_lease(self, job_id: str, owner: str):
+        """
+        Libera la marca de publicación si sigue siendo de `owner`, por ejemplo cuando el envío a la cola
+        final falló: así la reentrega inmediata del mensaje puede publicar sin esperar a que venza.
+        """
+        lease_key = f"{self.redis_prefix}:{job_id}:lease"
+        with self.redis_client.pipeline() as pipe:
+            try:
+                pipe.watch(lease_key)
+                held = pipe.get(lease_key)
+                if held is None or json.loads(held).get("owner") != owner:
+                    return
+                pipe.multi()
+                pipe.delete(lease_key)
+                pipe.execute()
+            except WatchError:
+                logger.info(f"Job {job_id}: la marca de publicación cambió de dueño, no se libera")
+
+    def mark_published(self, job_id: str, publish_seconds: float = 0.0):
+        """Marca el resultado del job como publicado; las reentregas posteriores ya no lo vuelven a publicar."""
+        self.redis_client.set(f"{self.redis_prefix}:{job_id}:published", "1", ex=self.job_ttl)
+        self.update_status(job_id, JOB_STATES[-1], "publish", publish_seconds)
+
+    def save_chunk_result(self, job_id: str, chunk_index: int, chunk_count: int, result: dict) -> Optional[dict]:
+        """
+        Guarda el resultado de una parte. Retorna el resultado unido cuando ya están todas las partes y aún
+        no se publicó, o `None` si faltan partes o si ya se publicó. Antes de publicarlo hay que tomar
+        `acquire_publish_lease`: una reentrega o un mensaje duplicado también recibe el resultado unido.
+        """
+        chunks_key = f"{self.redis_prefix}:{job_id}:chunks"
+        pipe = self.redis_client.pipeline()
+        pipe.hset(chunks_key, str(chunk_index), json.dumps(result))
+        pipe.expire(chunks_key, self.job_ttl)
+        pipe.hlen(chunks_key)
+        pipe.exists(f"{self.redis_prefix}:{job_id}:published")
+        _, _, received, published = pipe.execute()
+        logger.info(f"Job {job_id}: parte {chunk_index + 1}/{chunk_count} guardada ({received} recibidas)")
+        if received < chunk_count:
+            return None
+        if published:
+            logger.info(f"Job {job_id}: el resultado ya fue unido y publicado por otra ejecución")
+            return None
+
+        start_time = time.perf_counter()
+        chunks: Dict[str, str] = self.redis_client.hgetall(chunks_key)
+        results = [json.loads(chunks[str(index)]) for index in range(chunk_count)]
+        merged = self.merge_results(results)
+        self.redis_client.set(f"{self.redis_prefix}:{job_id}:result", json.dumps(merged), ex=self.job_ttl)
+        self.update_status(job_id, "structuring", "merge", time.perf_counter() - start_time)
+        logger.info(f"Job {job_id}: {chunk_count} partes unidas con {len(merged['acreetors'])} acreedores")
+        return merged
+
+    def start_job(self, job_id: str, user_id: str, chunk_count: int, source: str, upload_seconds: float):
+        """
+        Crea (o reinicia) el registro del trabajo antes de encolarlo, con el tiempo de descarga y preparación
+        de la subida. El llamador no debe reiniciar un trabajo en curso (ver `is_in_progress`).
+        """
+        now = time.time()
+        status_key = f"{self.redis_prefix}:{job_id}:status"
+        user_key = f"{self.redis_prefix}:user:{user_id}"
+        try:
+            pipe = self.redis_client.pipeline()
+            pipe.delete(status_key)
+            pipe.hset(status_key, mapping={
+                "user_id": user_id,
+                "source": source,
+                "state": JOB_STATES[0],
+                "chunk_count": chunk_count,
+                "created_at": now,
+                "updated_at": now,
+                "stage:upload": round(upload_seconds, 3),
+            })
+            pipe.expire(status_key, self.job_ttl)
+            pipe.lrem(user_key, 0, job_id)
+            pipe.lpush(user_key, job_id)
+            pipe.ltrim(user_key, 0, self.user_jobs_limit - 1)
+            pipe.expire(user_key, self.job_ttl)
+            pipe.execute()
+        except RedisError as e:
+            logger.warning(f"Job {job_id}: no se pudo registrar el estado inicial: {e}")
+
+    def update_status(self, job_id: str, state: Optional[str] = None, stage: Optional[str] = None, seconds: float = 0.0, error: Optional[str] = None):
+        """
+        Actualiza el registro del trabajo. Los estados solo avanzan en el orden de `JOB_STATES` (una
+        reentrega no devuelve a `processing` un trabajo ya publicado) y `failed` no reemplaza a `published`.
+        Los segundos de una etapa se acumulan, así `stage:ai` suma las llamadas de todas las partes; al pasar a
+        `processing` se guarda en `stage:queue_wait` el tiempo que el trabajo esperó en la cola.
+        """
+        status_key = f"{self.redis_prefix}:{job_id}:status"
+        try:
+            current, created_at = self.redis_client.hmget(status_key, "state", "created_at")
+            if current is None:
+                return
+            now = time.time()
+            fields = {"updated_at": now}
+            if state is not None and self._can_move(current, state):
+                fields["state"] = state
+            if error is not None and current != JOB_STATES[-1]:
+                fields["error"] = error[:500]
+            pipe = self.redis_client.pipeline()
+            pipe.hset(status_key, mapping=fields)
+            if current == JOB_STATES[0] and fields.get("state") == "processing":
+                pipe.hset(status_key, "stage:queue_wait", round(now - float(created_at), 3))
+            if stage is not None:
+                pipe.hincrbyfloat(status_key, f"stage:{stage}", round(seconds, 3))
+            pipe.execute()
+        except RedisError as e:
+            logger.warning(f"Job {job_id}: no se pudo actualizar el estado: {e}")
+
+    @staticmethod
+    def _can_move(current: str, state: str) -> bool:
+        if state == FAILED_STATE:
+            return current != JOB_STATES[-1]
+        if current == FAILED_STATE:
+            return False
+        return JOB_STATES.index(state) >= JOB_STATES.index(current)
+
+    def get_status(self, job_id: str) -> Optional[dict]:
+        """
+        Estado del trabajo con las partes procesadas, los segundos por etapa y `stale` si un trabajo sin
+        terminar no se actualiza hace más de `ENTERPRISE_JOB_STALE_SECONDS`.
+        """
+        pipe = self.redis_client.pipeline()
+        pipe.hgetall(f"{self.redis_prefix}:{job_id}:status")
+        pipe.hlen(f"{self.redis_prefix}:{job_id}:chunks")
+        record, chunks_done = pipe.execute()
+        if not record:
+            return None
+
+        now = time.time()
+        created_at, updated_at = float(record["created_at"]), float(record["updated_at"])
+        finished = record["state"] in (JOB_STATES[-1], FAILED_STATE)
+        return {
+            "job_id": job_id,
+            "user_id": record.get("user_id"),
+            "source": record.get("source"),
+            "state": record["state"],
+            "chunks": {"done": chunks_done, "total": int(record["chunk_count"])},
+            "stages": {
+                field.split(":", 1)[1]: float(value)
+                for field, value in record.items()
+                if field.startswith("stage:")
+            },
+            "created_at": datetime.fromtimestamp(created_at, timezone.utc).isoformat(),
+            "updated_at": datetime.fromtimestamp(updated_at, timezone.utc).isoformat(),
+            "elapsed_seconds": round((updated_at if finished else now) - created_at, 3),
+            "stale": not finished and now - updated_at > self.stale_seconds,
+            "error": record.get("error"),
+        }
+
+    def is_in_progress(self, job_id: str) -> bool:
+        """Si el job ya está encolado o procesándose y no está detenido (`stale`)."""
+        status = self.get_status(job_id)
+        return status is not None and status["state"] in JOB_STATES[:-1] and not status["stale"]
+
+    def list_user_jobs(self, user_id: str) -> List[dict]:
+        """Estados de los últimos trabajos del usuario, del más reciente al más antiguo."""
+        job_ids = self.redis_client.lrange(f"{self.redis_prefix}:user:{user_id}", 0, -1)
+        statuses = [self.get_status(job_id) for job_id in job_ids]
+        return [status for status in statuses if status is not None]
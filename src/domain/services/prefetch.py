@@ -0,0 +1,107 @@
+import asyncio
+import logging
+import os
+import time
+import uuid
+from typing import Dict, Optional, Tuple
+
+from src.ai.builder import build_agent, get_prompt_key, Agent
+from src.ai.llm import warm_up_model
+from src.ai.main import build_shared_state
+from src.ai.memory import MemorySchema, RedisMemory
+from src.domain.models.user import User
+from src.domain.services.conversation import ConversationService
+
+logger = logging.getLogger(__name__)
+
+# Precalentamiento en curso por usuario: (inicio, tarea). Los mensajes del mismo buffer comparten la tarea.
+_warm_ups: Dict[str, Tuple[float, asyncio.Task]] = {}
+
+
+class PrefetchedContext:
+    """
+    Recursos preparados mientras el agregador espera el fin del buffer de mensajes.
+    """
+
+    def __init__(self, user_id: str, invoke_id: str, memory: RedisMemory, shared_state: dict, agent: Optional[Agent]):
+        self.user_id = user_id
+        self.invoke_id = invoke_id
+        self.memory = memory
+        self.shared_state = shared_state
+        self.agent = agent
+
+
+class PrefetchService:
+    """
+    Adelanta durante la espera de `aggregate_if_ready` el trabajo que el request haría después
+    de despertar: carga de conversación y memoria, resolución del prompt, construcción del agente
+    y apertura de la conexión con el modelo.
+    """
+
+    def __init__(self):
+        self.enabled = os.getenv("AGENT_PREFETCH_ENABLED", "true").lower() == "true"
+        self.window = int(os.getenv("MESSAGE_BUFFER_WAIT_TIME"))
+
+    def start(self, user: User, is_chit_chat: bool) -> Optional[asyncio.Task]:
+        """
+        Lanza el precalentamiento en segundo plano, uno por usuario y ventana del buffer: si ya hay uno en
+        curso para el usuario se retorna esa misma tarea. `is_chit_chat` debe ser el mismo con el que luego se
+        procesa el mensaje. Retorna None si está deshabilitado.
+        """
+        if not self.enabled:
+            return None
+        now = time.monotonic()
+        loop = asyncio.get_running_loop()
+        for user_id, (started_at, task) in list(_warm_ups.items()):
+            if now - started_at >= self.window or task.get_loop() is not loop:
+                _warm_ups.pop(user_id, None)
+
+        current = _warm_ups.get(user.user_id)
+        if current is not None:
+            return current[1]
+        task = asyncio.create_task(asyncio.to_thread(self.warm_up, user, is_chit_chat))
+        # Si el mensaje queda en espera nadie consume la tarea: se recupera la excepción para no ensuciar el log.
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        _warm_ups[user.user_id] = (now, task)
+        return task
+
+    def warm_up(self, user: User, is_chit_chat: bool) -> PrefetchedContext:
+        user_type = user.get_type()
+        invoke_id = str(uuid.uuid4())
+        session_id = user.current_session_id
+        logger.info(f"Session ID: {session_id} - Invoke ID: {invoke_id} - Prefetch started")
+
+        conversation = ConversationService().get_or_create_conversation(user)
+        memory = RedisMemory(
+            user_id=user.user_id,
+            stored_conversation=MemorySchema.model_validate(conversation.model_dump()),
+        )
+
+        if get_prompt_key(user_type, is_chit_chat) is not None:
+            warm_up_model()
+
+        shared_state = build_shared_state(user.name, user_type, user.user_id)
+        agent = build_agent(user_type, user.user_id, shared_state, memory, session_id, invoke_id, is_chit_chat)
+        logger.info(f"Session ID: {session_id} - Invoke ID: {invoke_id} - Prefetch completed")
+        return PrefetchedContext(user.user_id, invoke_id, memory, shared_state, agent)
+
+    @staticmethod
+    async def collect(task: Optional[asyncio.Task]) -> Optional[PrefetchedContext]:
+        """
+        Espera el precalentamiento; ante cualquier error retorna None para seguir por el flujo normal. La memoria
+        se vuelve a leer al terminar la espera del buffer: durante ella un turno anterior pudo haberla guardado,
+        y la copia leída al inicio la pisaría al guardar este turno. El agente conserva la misma instancia.
+        """
+        if task is None:
+            return None
+        # El mensaje que cierra el buffer consume la tarea: el siguiente buffer arranca uno nuevo.
+        for user_id, (_, current) in list(_warm_ups.items()):
+            if current is task:
+                _warm_ups.pop(user_id, None)
+        try:
+            context = await task
+            context.memory.stored_conversation = context.memory.load_conversation()
+            return context
+        except Exception as e:
+            logger.warning(f"Prefetch failed, falling back to regular flow: {e}")
+            return None
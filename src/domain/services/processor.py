@@ -14,14 +14,15 @@ class ProcessorService:
         self.message_service = MessageService()
 
     def process_message(
-        self, message: Message, user: User, is_chit_chat: bool = False
+        self, message: Message, user: User, is_chit_chat: bool = False, prefetched=None
     ) -> dict:
         """
         Procesa un mensaje recibido y ejecuta el flujo correspondiente según el tipo de mensaje y usuario.
         Separa la lógica de OCR y delega la invocación al agente principal.
+        Si existe un contexto precalentado durante la espera del buffer, se reutiliza su invoke_id.
         """
 
-        invoke_id = uuid.uuid4()
+        invoke_id = prefetched.invoke_id if prefetched else uuid.uuid4()
         payload = PayloadAgent(
             invoke_id=invoke_id,
             user=user,
@@ -32,5 +33,5 @@ class ProcessorService:
         logger.info(
             f"Session ID: {user.current_session_id} - Invoke ID: {invoke_id} - Process Message: {message.message}"
         )
-        response = invoke(payload)
+        response = invoke(payload, prefetched=prefetched)
         return response
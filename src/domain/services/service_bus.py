@@ -1,20 +1,23 @@
 import os
 import json
-from azure.servicebus import ServiceBusClient, ServiceBusMessage
+import threading
+from typing import Dict, List, Optional
+
+from azure.servicebus import ServiceBusClient, ServiceBusMessage, ServiceBusSender
+from azure.servicebus.exceptions import MessageSizeExceededError, ServiceBusError
 
 from src.utils.logger import get_function_logger
+from src.utils.metrics import metrics
 
 logger = get_function_logger("function_app")
 
+_client: Optional[ServiceBusClient] = None
+_senders: Dict[str, ServiceBusSender] = {}
+_sender_locks: Dict[str, threading.Lock] = {}
+_lock = threading.Lock()
 
-def send_message_to_queue(json_data: dict, queue_name: str):
-    """
-    Envía un mensaje JSON a una cola específica de Azure Service Bus.
 
-    Args:
-        json_data: El diccionario a enviar.
-        queue_name: El nombre de la cola de destino.
-    """
+def _validate_settings(queue_name: str) -> str:
     connection_string = os.getenv("AZURE_SERVICE_BUS_MA_CONNECTION_STRING")
     if not connection_string:
         logger.error("AZURE_SERVICE_BUS_MA_CONNECTION_STRING no está configurado.")
@@ -23,14 +26,111 @@ def send_message_to_queue(json_data: dict, queue_name: str):
     if not queue_name:
         logger.error("queue_name no está configurado.")
         raise ValueError("El nombre de la cola del Service Bus no está configurado.")
+    return connection_string
+
+
+def _get_sender(queue_name: str) -> ServiceBusSender:
+    """
+    Sender compartido por el proceso para la cola. El cliente y el sender se crean en el primer envío y
+    mantienen abierta la conexión AMQP para los siguientes.
+    """
+    global _client
+    with _lock:
+        if queue_name not in _senders:
+            if _client is None:
+                _client = ServiceBusClient.from_connection_string(_validate_settings(queue_name))
+            _senders[queue_name] = _client.get_queue_sender(queue_name=queue_name)
+            _sender_locks.setdefault(queue_name, threading.Lock())
+            metrics.increment("service_bus.sender.connects")
+        return _senders[queue_name]
+
+
+def _reset_sender(queue_name: str):
+    """Descarta el sender de la cola tras un error de conexión; el siguiente envío abre uno nuevo."""
+    with _lock:
+        sender = _senders.pop(queue_name, None)
+    if sender is not None:
+        try:
+            sender.close()
+        except Exception as e:
+            logger.warning(f"Error al cerrar el sender de la cola '{queue_name}': {e}")
+    metrics.increment("service_bus.sender.resets")
+
+
+def _to_message(json_data: dict) -> ServiceBusMessage:
+    return ServiceBusMessage(json.dumps(json_data).encode("utf-8"))
+
 
-    try:
-        with ServiceBusClient.from_connection_string(connection_string) as client:
-            sender = client.get_queue_sender(queue_name=queue_name)
-            message_body = json.dumps(json_data).encode("utf-8")
-            message = ServiceBusMessage(message_body)
-            sender.send_messages(message)
+def send_message_to_queue(json_data: dict, queue_name: str):
+    """
+    Envía un mensaje JSON a una cola específica de Azure Service Bus.
+    Reutiliza el sender de la cola y, si la conexión falló, reintenta una vez con uno nuevo.
+
+    Args:
+        json_data: El diccionario a enviar.
+        queue_name: El nombre de la cola de destino.
+    """
+    _validate_settings(queue_name)
+    message = _to_message(json_data)
+
+    for attempt in range(2):
+        sender = _get_sender(queue_name)
+        try:
+            with _sender_locks[queue_name]:
+                sender.send_messages(message)
             logger.info(f"Mensaje enviado exitosamente a la cola '{queue_name}'.")
-    except Exception as e:
-        logger.error(f"Error al enviar mensaje a la cola '{queue_name}': {e}")
-        raise
+            return
+        except MessageSizeExceededError:
+            logger.error(f"El mensaje supera el tamaño máximo de la cola '{queue_name}'.")
+            raise
+        except ServiceBusError as e:
+            _reset_sender(queue_name)
+            if attempt:
+                logger.error(f"Error al enviar mensaje a la cola '{queue_name}': {e}")
+                raise
+            logger.warning(f"Reconectando con la cola '{queue_name}' tras un error: {e}")
+
+
+def send_messages_to_queue(json_items: List[dict], queue_name: str):
+    """
+    Envía varios mensajes JSON a la cola agrupándolos en `ServiceBusMessageBatch`: cada lote viaja en un
+    solo envío y se abre uno nuevo cuando el actual se llena. Ante un error de conexión se reintenta una vez
+    desde el primer mensaje aún no enviado.
+
+    Args:
+        json_items: Los diccionarios a enviar, en orden.
+        queue_name: El nombre de la cola de destino.
+    """
+    _validate_settings(queue_name)
+    messages = [_to_message(json_data) for json_data in json_items]
+    sent = 0
+
+    for attempt in range(2):
+        sender = _get_sender(queue_name)
+        try:
+            with _sender_locks[queue_name]:
+                while sent < len(messages):
+                    batch = sender.create_message_batch()
+                    batch_size = 0
+                    for message in messages[sent:]:
+                        try:
+                            batch.add_message(message)
+                        except MessageSizeExceededError:
+                            if not batch_size:
+                                raise
+                            break
+                        batch_size += 1
+                    sender.send_messages(batch)
+                    sent += batch_size
+                    metrics.increment("service_bus.batches")
+            logger.info(f"{len(messages)} mensajes enviados exitosamente a la cola '{queue_name}'.")
+            return
+        except MessageSizeExceededError:
+            logger.error(f"Un mensaje supera el tamaño máximo de la cola '{queue_name}'.")
+            raise
+        except ServiceBusError as e:
+            _reset_sender(queue_name)
+            if attempt:
+                logger.error(f"Error al enviar mensajes a la cola '{queue_name}' ({sent}/{len(messages)} enviados): {e}")
+                raise
+            logger.warning(f"Reconectando con la cola '{queue_name}' tras un error: {e}")
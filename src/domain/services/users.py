@@ -3,12 +3,19 @@ import json
 import uuid
 import redis
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Union
 
+from src.utils.metrics import metrics
 from src.domain.models.user import User, UserType
+from src.domain.models.acreetor import Acreetor
+from src.domain.models.enterprise import Enterprise
 from src.integrations.indi.provider import IndiProvider
 
 logger = logging.getLogger(__name__)
 
+_refresh_executor = ThreadPoolExecutor(max_workers=int(os.getenv("ACCOUNT_REFRESH_WORKERS", "2")))
+
 
 class UserService:
     def __init__(self):
@@ -17,21 +24,94 @@ class UserService:
         )
         self.indi_provider = IndiProvider()
         self.redis_prefix = "user"
+        self.account_prefix = "account"
         self.session_buffer_time = int(os.getenv("SESSION_BUFFER_WAIT_TIME"))
+        self.account_cache_time = int(os.getenv("ACCOUNT_CACHE_TTL", "86400"))
+        self.account_negative_cache_time = int(os.getenv("ACCOUNT_NEGATIVE_CACHE_TTL", "300"))
+        self.account_refresh_ahead_time = int(os.getenv("ACCOUNT_REFRESH_AHEAD_TIME", "120"))
+
+    def _load_account(self, user_id: str) -> Optional[Union[Acreetor, Enterprise]]:
+        """
+        Retorna la cuenta desde la caché `account:{user_id}`; ante un miss consulta Indi y cachea el resultado,
+        incluyendo los números que no tienen cuenta (caché negativa con TTL más corto).
+        """
+        cached = self.redis_client.get(f"{self.account_prefix}:{user_id}")
+        if cached:
+            metrics.increment("account_cache.hits")
+            entry = json.loads(cached)
+            if not entry.get("found"):
+                return None
+            model = Enterprise if entry.get("is_enterprise") else Acreetor
+            return model(**entry["account"])
+
+        metrics.increment("account_cache.misses")
+        return self.refresh_account(user_id)
+
+    def refresh_account(self, user_id: str) -> Optional[Union[Acreetor, Enterprise]]:
+        """
+        Consulta la cuenta en Indi y actualiza la caché. Solo un "no encontrado" confirmado se cachea como
+        negativo; si Indi no responde o falla, el error se propaga y la caché queda como estaba.
+        """
+        account = self.indi_provider.find_account_by_user_id(user_id)
+        if account:
+            entry = {"found": True, "is_enterprise": account.is_enterprise, "account": account.model_dump()}
+            expiration = self.account_cache_time
+        else:
+            entry = {"found": False}
+            expiration = self.account_negative_cache_time
+        self.redis_client.set(f"{self.account_prefix}:{user_id}", json.dumps(entry), ex=expiration)
+        return account
+
+    def _refresh_ahead(self, user_id: str, session_ttl: int):
+        """
+        Si la sesión está por expirar, recarga la cuenta en segundo plano para que el próximo
+        `get_or_create_user` la encuentre fresca en la caché. Un lock evita recargas duplicadas.
+        """
+        if session_ttl < 0 or session_ttl > self.account_refresh_ahead_time:
+            return
+        lock_key = f"{self.account_prefix}_refresh:{user_id}"
+        if self.redis_client.set(lock_key, "1", nx=True, ex=self.account_refresh_ahead_time):
+            metrics.increment("account_cache.refresh_ahead")
+            _refresh_executor.submit(self._refresh_in_background, user_id)
+
+    def _refresh_in_background(self, user_id: str):
+        try:
+            self.refresh_account(user_id)
+        except Exception as e:
+            metrics.increment("account_cache.refresh_errors")
+            logger.error(f"Error refreshing account for {user_id}, keeping the cached one: {e}")
+
+    def invalidate_account(self, user_id: str):
+        """
+        Borra la cuenta cacheada y la sesión del número, por ejemplo cuando el número se registra en Indi,
+        para que el próximo mensaje vuelva a resolver el tipo de usuario.
+        """
+        logging.info(f"Invalidating account cache for: {user_id}")
+        self.redis_client.delete(f"{self.account_prefix}:{user_id}", f"{self.redis_prefix}:{user_id}")
 
     def get_or_create_user(self, user_id: str, force_anonymous: bool) -> User:
-        user = self.redis_client.get(f"{self.redis_prefix}:{user_id}")
+        pipe = self.redis_client.pipeline()
+        pipe.get(f"{self.redis_prefix}:{user_id}")
+        pipe.ttl(f"{self.redis_prefix}:{user_id}")
+        user, session_ttl = pipe.execute()
         if user:
             logging.info(
                 f"Retrieved user from redis: {json.loads(user).get('user_id','')}"
             )
+            if not force_anonymous:
+                self._refresh_ahead(user_id, session_ttl)
             return User.model_validate_json(user)
 
-        account = (
-            None
-            if force_anonymous
-            else self.indi_provider.get_account_by_user_id(user_id)
-        )
+        account = None
+        lookup_failed = False
+        if not force_anonymous:
+            try:
+                account = self._load_account(user_id)
+            except Exception as e:
+                # Sin Indi se atiende como anónimo solo este mensaje: la sesión no se guarda y el siguiente reintenta.
+                metrics.increment("account_cache.lookup_errors")
+                logger.error(f"Error fetching account for {user_id}, session not cached: {e}")
+                lookup_failed = True
         is_enterprise = account.is_enterprise if account else False
         if is_enterprise:
             type_user = UserType.ENTERPRISE
@@ -47,6 +127,8 @@ class UserService:
             type_user=type_user,
             current_session_id=str(uuid.uuid4()),
         )
+        if lookup_failed:
+            return user
         logging.info(f"Setting user in redis: {user_id}")
         self.redis_client.set(
             f"{self.redis_prefix}:{user_id}",
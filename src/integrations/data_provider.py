@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Union
+from typing import List, Tuple, Union
 
 from src.domain.models.client import Client
 from src.domain.models.acreetor import Acreetor
@@ -32,7 +32,7 @@ class DataProvider(ABC):
         pass
 
     @abstractmethod
-    def create_collection(self, collection_register: CollectionRegister) -> List[Collection]:
+    def create_collection(self, collection_register: CollectionRegister) -> Tuple[List[Client], List[Collection]]:
         """Create a client in Indi API"""
         pass
 
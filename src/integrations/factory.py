@@ -1,5 +1,6 @@
 from src.integrations.data_provider import DataProvider
 from src.integrations.indi.provider import IndiProvider
+from src.integrations.indi.async_provider import AsyncIndiProvider
 
 
 class DataProviderFactory:
@@ -13,5 +14,7 @@ class DataProviderFactory:
         """
         if provider_type == "indi":
             return IndiProvider()
+        if provider_type == "indi_async":
+            return AsyncIndiProvider()
         
         raise ValueError(f"Unknown provider type: {provider_type}")
@@ -0,0 +1,248 @@
+import os
+import time
+import random
+import asyncio
+import importlib.util
+from functools import partial
+from typing import Callable, List, Optional, Tuple, Union
+
+import httpx
+from pydantic import TypeAdapter
+
+from src.utils.logger import logger
+from src.utils.metrics import metrics
+from src.domain.models.client import Client
+from src.domain.models.acreetor import Acreetor
+from src.domain.models.enterprise import Enterprise
+from src.domain.models.collection import Collection
+from src.domain.models.bulk_result import BulkItemResult
+from src.domain.models.collection_register import CollectionRegister
+from src.ai.memory import RedisMemory
+from src.integrations.indi.provider import IndiProvider
+from src.integrations.indi.resilience import (
+    CircuitOpenError, arun_hedged, get_circuit_breaker, get_latency_tracker, is_hedging_enabled,
+)
+from src.integrations.indi.schemas import COLLECTIONS_ADAPTER, CLIENTS_ADAPTER
+
+RETRY_STATUSES = (429, 502, 503, 504)
+
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_indi_async_client() -> httpx.AsyncClient:
+    """
+    Retorna el `httpx.AsyncClient` compartido para la API de Indi dentro del event loop actual.
+    Usa HTTP/2 cuando el paquete `h2` está instalado.
+    """
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client = httpx.AsyncClient(
+            http2=importlib.util.find_spec("h2") is not None,
+            limits=httpx.Limits(
+                max_connections=int(os.getenv("INDI_HTTP_POOL_SIZE", "20")),
+                max_keepalive_connections=int(os.getenv("INDI_HTTP_MAX_KEEPALIVE", "10")),
+            ),
+        )
+        _client_loop = loop
+    return _client
+
+
+class AsyncIndiProvider(IndiProvider):
+    """
+    Variante asíncrona de `IndiProvider`: mismos endpoints, payloads y mapeos,
+    pero las llamadas HTTP se hacen sobre un `httpx.AsyncClient` compartido y no bloquean el event loop.
+    Los métodos que solo leen de la memoria de Redis se heredan sin cambios.
+    """
+
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
+        super().__init__()
+        self.client = client
+        self.max_retries = int(os.getenv("INDI_HTTP_MAX_RETRIES", "2"))
+        self.backoff_factor = float(os.getenv("INDI_HTTP_BACKOFF_FACTOR", "0.3"))
+        self.backoff_jitter = float(os.getenv("INDI_HTTP_BACKOFF_JITTER", "0.3"))
+
+    async def _arequest(self, method: str, path: str, api_url: str, hedge: bool = False, **kwargs) -> httpx.Response:
+        """
+        Ejecuta el request aplicando el timeout y el circuit breaker del endpoint, con reintentos con backoff
+        solo para GET. Con `hedge=True` la lectura se duplica pasado el p95 del endpoint, igual que en `IndiProvider`.
+        """
+        breaker = get_circuit_breaker(path)
+        breaker.before_call()
+        start_time = time.perf_counter()
+        try:
+            if hedge and method == "GET" and is_hedging_enabled():
+                response = await arun_hedged(path, partial(self._asend, method, path, api_url, **kwargs),
+                                             get_latency_tracker(path).p95())
+            else:
+                response = await self._asend(method, path, api_url, **kwargs)
+        except BaseException:
+            # Cualquier error, incluida la cancelación de una prueba half-open, cuenta como fallo.
+            breaker.record_failure()
+            raise
+        finally:
+            metrics.observe(f"indi.http.{path}.seconds", time.perf_counter() - start_time)
+        breaker.record_status(response.status_code)
+        get_latency_tracker(path).add(time.perf_counter() - start_time)
+        return response
+
+    async def _asend(self, method: str, path: str, api_url: str, **kwargs) -> httpx.Response:
+        client = self.client or get_indi_async_client()
+        timeout = httpx.Timeout(self.READ_TIMEOUTS.get(path, 10), connect=self.CONNECT_TIMEOUT)
+        attempts = self.max_retries + 1 if method == "GET" else 1
+        for attempt in range(attempts):
+            is_last = attempt == attempts - 1
+            try:
+                response = await client.request(method, api_url, timeout=timeout, **kwargs)
+            except httpx.TransportError:
+                metrics.increment(f"indi.http.{path}.errors")
+                if is_last:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUSES or is_last:
+                    metrics.increment(f"indi.http.{path}.requests")
+                    return response
+            metrics.increment(f"indi.http.{path}.retries")
+            await asyncio.sleep(self.backoff_factor * (2 ** attempt) + random.uniform(0, self.backoff_jitter))
+
+    def _read_content(self, response: httpx.Response, adapter: TypeAdapter, error_msg: str) -> list:
+        """Valida en bloque el cuerpo ya descargado por `httpx` con el `TypeAdapter` del modelo."""
+        if response.status_code not in (200, 204):
+            self._handle_response(response, error_msg)
+        content = response.content.strip()
+        if response.status_code == 204 or not content or content == b"null":
+            return []
+        return adapter.validate_json(content)
+
+    async def get_collection_by_user_id(self, user_phone: str) -> List[Collection]:
+        """Fetch collections by user phone from the external API."""
+        api_url = self._build_collections_url(self.COLLECTION_BY_USER_PHONE_PATH)
+        logger.info("Fetching collections by user from Indi API (async): %s", api_url)
+        response = await self._arequest("GET", self.COLLECTION_BY_USER_PHONE_PATH, api_url, hedge=True,
+                                        headers=self._build_headers({"X-User-Phone": user_phone}))
+        return self._read_content(response, COLLECTIONS_ADAPTER, "Error fetching collections from Indi API")
+
+    async def get_collection_changes_by_user_id(self, user_phone: str, since: str) -> Tuple[List[Collection], str, bool]:
+        """
+        Fetch only the collections changed since `since`. Returns the changes, the cursor for the next call
+        and whether the server answered with a full snapshot instead.
+        """
+        requested_at = self.get_sync_timestamp()
+        api_url = self._build_collections_url(self.COLLECTION_BY_USER_PHONE_PATH, None, {self.SYNC_SINCE_PARAM: since})
+        logger.info("Fetching collection changes by user from Indi API (async): %s", api_url)
+        response = await self._arequest("GET", self.COLLECTION_BY_USER_PHONE_PATH, api_url,
+                                        headers=self._build_headers({"X-User-Phone": user_phone}))
+        data = self._handle_response(response, "Error fetching collection changes from Indi API")
+        return self._to_collection_changes(response, data, requested_at)
+
+    async def get_clients_by_user_id(self, user_phone: str) -> List[Client]:
+        """Fetch clients by user phone from the external API."""
+        api_url = self._build_collections_url(self.CLIENT_LIST_BY_USER_PATH)
+        logger.info("Fetching clients by user from Indi API (async): %s", api_url)
+        response = await self._arequest("GET", self.CLIENT_LIST_BY_USER_PATH, api_url, hedge=True,
+                                        headers=self._build_headers({"X-User-Phone": user_phone}))
+        return self._read_content(response, CLIENTS_ADAPTER, "Error fetching clients from Indi API")
+
+    async def find_account_by_user_id(self, user_phone: str) -> Optional[Union[Acreetor, Enterprise]]:
+        """
+        Like `get_account_by_user_id`, but transport errors are raised instead of being reported as "not found".
+        Only a 404 or an empty answer means "not found"; any other error status is raised.
+
+        Raises:
+            httpx.HTTPError: If the request to the Indi API fails or answers with an error status.
+            CircuitOpenError: If the circuit breaker for the endpoint is open.
+        """
+        api_url = self._build_account_url(user_phone)
+        logger.info(f"Fetching creditor/enterprise from Indi API (async): {api_url}")
+        response = await self._arequest("GET", self.USER_BY_PHONE_PATH, api_url,
+                                        headers=self._build_headers({"X-User-Phone": user_phone}))
+        if response.status_code == 404:
+            logger.info(f"[find_account_by_user_id] User not found for phone: {user_phone}")
+            return None
+        response.raise_for_status()
+
+        try:
+            data = self._handle_response(response, "Error fetching creditor from Indi API")
+            if data is None:
+                logger.info(f"[get_account_by_user_id] User not found for phone: {user_phone}")
+                return None
+        except ValueError as e:
+            logger.info(f"[get_account_by_user_id] User not found in Indi API: {str(e)}")
+            return None
+
+        return self._to_account(data)
+
+    async def get_account_by_user_id(self, user_phone: str) -> Optional[Union[Acreetor, Enterprise]]:
+        """Fetch creditor or enterprise by phone number from the external API, or None if it is not found or Indi fails."""
+        try:
+            return await self.find_account_by_user_id(user_phone)
+        except (httpx.HTTPError, CircuitOpenError) as e:
+            logger.error(f"API request failed: {str(e)}")
+            return None
+
+    async def create_client(self, client: Client) -> Client:
+        """Create a client in Indi API."""
+        data_client = self._build_client_payload(client)
+        api_url = self._build_collections_url(self.CLIENT_CREATE_PATH)
+        logger.info("Creating client from Indi API (async): %s, with name: %s", api_url, data_client.get("name"))
+        response = await self._arequest("POST", self.CLIENT_CREATE_PATH, api_url, json=data_client,
+                                        headers=self._build_headers({"X-User-Phone": client.creditor_id}))
+        result = self._handle_response(response, "Error creating debtor in Indi API")
+        client.raw_id = result.get("id")
+        logger.info(f"Created debtor in Indi: {result}")
+        return client
+
+    async def create_collection(self, collection_register: CollectionRegister) -> Tuple[List[Client], List[Collection]]:
+        """Create a collection in Indi API. Returns the clients and collections it created."""
+        data_collection = self._build_collection_payload(collection_register)
+        api_url = self._build_collections_url(self.COLLECTION_CREATE_PATH)
+        logger.info("Creating collection from Indi API (async): %s, with description: %s", api_url,
+                    data_collection.get("description"))
+        response = await self._arequest("POST", self.COLLECTION_CREATE_PATH, api_url, json=data_collection,
+                                        headers=self._build_headers({"X-User-Phone": collection_register.creditor_id}))
+        result = self._handle_response(response, "Error creating collection in Indi API") or []
+        return self._to_created_collections(result, collection_register)
+
+    async def _arun_bulk(self, items: list, create: Callable, memory: Optional[RedisMemory] = None) -> List[BulkItemResult]:
+        """Igual que `IndiProvider._run_bulk`, acotando la concurrencia con un semáforo."""
+        semaphore = asyncio.Semaphore(self.BULK_MAX_WORKERS)
+
+        async def run(index: int):
+            creditor_id = items[index].creditor_id
+            async with semaphore:
+                try:
+                    return self._to_bulk_result(index, creditor_id, await create(items[index]))
+                except Exception as e:
+                    logger.error(f"Bulk item {index} failed for creditor {creditor_id}: {e}")
+                    return self._to_bulk_result(index, creditor_id, error=e)
+
+        results: List[Optional[BulkItemResult]] = [None] * len(items)
+        for creditor_id, indexes in self._group_by_creditor(items).items():
+            for start in range(0, len(indexes), self.BULK_BATCH_SIZE):
+                for result in await asyncio.gather(*(run(index) for index in indexes[start:start + self.BULK_BATCH_SIZE])):
+                    results[result.index] = result
+            self._save_bulk_results(creditor_id, [results[index] for index in indexes], memory)
+        metrics.increment("indi.bulk.items", len(items))
+        metrics.increment("indi.bulk.errors", sum(1 for result in results if not result.success))
+        return results
+
+    async def create_clients_bulk(self, clients: List[Client], memory: Optional[RedisMemory] = None) -> List[BulkItemResult]:
+        """Create many clients in Indi API with bounded concurrency."""
+        logger.info(f"Creating {len(clients)} clients in bulk (async)")
+        return await self._arun_bulk(clients, self.create_client, memory)
+
+    async def create_collections_bulk(self, collection_registers: List[CollectionRegister],
+                                      memory: Optional[RedisMemory] = None) -> List[BulkItemResult]:
+        """Create many collections in Indi API, grouped by creditor and with bounded concurrency."""
+        logger.info(f"Creating {len(collection_registers)} collections in bulk (async)")
+        return await self._arun_bulk(collection_registers, self.create_collection, memory)
+
+    async def delete_collection(self, collection_id: str, user_id: str) -> str:
+        """Delete a collection in Indi API."""
+        api_url = self._build_collections_url(self.COLLECTION_DELETE_PATH, {"id": collection_id})
+        logger.info("Deleting collection from Indi API (async): %s", api_url)
+        response = await self._arequest("DELETE", self.COLLECTION_DELETE_PATH, api_url,
+                                        headers=self._build_headers({"X-User-Phone": user_id}))
+        self._handle_response(response, "Error deleting collection in Indi API")
+        return "Collection deleted successfully"
@@ -1,6 +1,13 @@
+import os
+import time
+import logging
 import requests
-from pydantic import ValidationError
-from typing import List, Optional, Dict, Any, Union
+from functools import partial
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+from pydantic import TypeAdapter, ValidationError
+from typing import Callable, List, Optional, Dict, Any, Tuple, Union
 
 
 from src.utils.logger import logger
@@ -10,10 +17,18 @@ from src.domain.models.acreetor import Acreetor
 from src.config.auth_config import AuthEnvConfig
 from src.domain.models.enterprise import Enterprise
 from src.domain.models.collection import Collection
+from src.domain.models.bulk_result import BulkItemResult
 from src.integrations.data_provider import DataProvider
 from src.config.collection_config import CollectionEnvConfig
 from src.domain.models.collection_register import CollectionRegister
 from src.utils.requests.formater import build_dynamic_url
+from src.utils.requests.json_stream import iter_json_array, iter_batches
+from src.utils.metrics import metrics
+from src.integrations.indi.session import get_indi_session, get_connection_metrics
+from src.integrations.indi.resilience import (
+    CircuitOpenError, get_circuit_breaker, get_latency_tracker, is_hedging_enabled, run_hedged,
+)
+from src.integrations.indi.schemas import COLLECTIONS_ADAPTER, CLIENTS_ADAPTER
 
 
 class IndiProvider(DataProvider):
@@ -23,6 +38,61 @@ class IndiProvider(DataProvider):
     CLIENT_LIST_BY_USER_PATH = "agent/clients"
     CLIENT_CREATE_PATH = "agent/clients"
     USER_BY_PHONE_PATH = "agent/user/find-phone-number"
+    SYNC_SINCE_PARAM = "updatedSince"
+    SYNC_CURSOR_HEADER = "X-Sync-Cursor"
+
+    CONNECT_TIMEOUT = float(os.getenv("INDI_HTTP_CONNECT_TIMEOUT", "3.05"))
+    READ_TIMEOUTS = {
+        COLLECTION_BY_USER_PHONE_PATH: float(os.getenv("INDI_HTTP_TIMEOUT_COLLECTIONS", "15")),
+        COLLECTION_CREATE_PATH: float(os.getenv("INDI_HTTP_TIMEOUT_COLLECTION_CREATE", "20")),
+        COLLECTION_DELETE_PATH: float(os.getenv("INDI_HTTP_TIMEOUT_COLLECTION_DELETE", "10")),
+        CLIENT_LIST_BY_USER_PATH: float(os.getenv("INDI_HTTP_TIMEOUT_CLIENTS", "15")),
+        USER_BY_PHONE_PATH: float(os.getenv("INDI_HTTP_TIMEOUT_USER", "10")),
+    }
+    STREAM_THRESHOLD_BYTES = int(os.getenv("INDI_STREAM_THRESHOLD_BYTES", str(1024 * 1024)))
+    STREAM_CHUNK_SIZE = int(os.getenv("INDI_STREAM_CHUNK_SIZE", "65536"))
+    STREAM_BATCH_SIZE = int(os.getenv("INDI_STREAM_BATCH_SIZE", "500"))
+    BULK_MAX_WORKERS = int(os.getenv("INDI_BULK_MAX_WORKERS", "4"))
+    BULK_BATCH_SIZE = int(os.getenv("INDI_BULK_BATCH_SIZE", "20"))
+
+    def __init__(self, session: Optional[requests.Session] = None):
+        self.session = session or get_indi_session()
+
+    def _request(self, method: str, path: str, api_url: str, hedge: bool = False, **kwargs) -> requests.Response:
+        """
+        Ejecuta el request sobre la sesión compartida aplicando el timeout y el circuit breaker del endpoint.
+        Con `hedge=True` (solo lecturas idempotentes) y `INDI_HEDGED_READS_ENABLED`, si el request tarda más
+        que el p95 del endpoint se lanza una segunda copia y se usa la que responda primero.
+
+        Raises:
+            CircuitOpenError: Si el circuito del endpoint está abierto.
+        """
+        breaker = get_circuit_breaker(path)
+        breaker.before_call()
+        timeout = (self.CONNECT_TIMEOUT, self.READ_TIMEOUTS.get(path, 10))
+        send = partial(self.session.request, method, api_url, timeout=timeout, **kwargs)
+        start_time = time.perf_counter()
+        try:
+            if hedge and method == "GET" and is_hedging_enabled():
+                response = run_hedged(path, send, get_latency_tracker(path).p95())
+            else:
+                response = send()
+        except requests.RequestException:
+            metrics.increment(f"indi.http.{path}.errors")
+            breaker.record_failure()
+            raise
+        except BaseException:
+            # Cualquier otro error también registra el fallo; si no, una prueba half-open dejaría el circuito bloqueado.
+            breaker.record_failure()
+            raise
+        finally:
+            metrics.observe(f"indi.http.{path}.seconds", time.perf_counter() - start_time)
+        breaker.record_status(response.status_code)
+        get_latency_tracker(path).add(time.perf_counter() - start_time)
+        metrics.increment(f"indi.http.{path}.requests")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Indi HTTP connection metrics: %s", get_connection_metrics())
+        return response
 
     def _build_headers(self, data_headers: Optional[Dict[str, str]] = None) -> Dict[str, str]:
         headers = {"Content-Type": "application/json"}
@@ -40,126 +110,42 @@ class IndiProvider(DataProvider):
         return response.json()
 
     def _to_collection(self, data) -> List[Collection]:
-        collections = []
-        for item in data:
-            collections.append(Collection(
-                id=item.get("id"),
-                client_id=item.get("clientId"),
-                client_cellphone=item.get("clientPhoneNumber"),
-                client_full_name=item.get("clientFullName"),
-                acreetor_id=item.get("userId"),
-                acreetor_cellphone=item.get("userPhoneNumber"),
-                acreetor_full_name=item.get("userFullName"),
-                status=item.get("paymentStatus"),
-                description=item.get("description"),
-                currency=item.get("currency"),
-                collection_date=item.get("collectionDate"),
-                amount=item.get("amount"),
-                payment_date=item.get("paymentDate"),
-                frequency_payment=item.get("frequencyPayment"),
-                quota_number=item.get("numberQuota"),
-                total_quotas=item.get("totalQuotas"),
-                active=item.get("active")
-            ))
-        return collections
+        return COLLECTIONS_ADAPTER.validate_python(data)
 
-    def get_collection_by_user_id(self, user_phone: str) -> List[Collection]:
-        """Fetch collections by user phone from the external API."""
-        api_url = build_dynamic_url(
-            CollectionEnvConfig.COLLECTIONS_API_URL,
-            self.COLLECTION_BY_USER_PHONE_PATH,
-            None,
-            {"code": CollectionEnvConfig.COLLECTIONS_API_CODE}
-        )
-        logger.info("Fetching collections by user from Indi API: %s", api_url)
-        logger.debug("Data fetch user phone: %s", user_phone)
-        response = requests.get(api_url, headers=self._build_headers({"X-User-Phone": user_phone}))
-        data = self._handle_response(response, "Error fetching collections from Indi API") or []
-
-        collections = self._to_collection(data)
-        return collections
+    def _to_clients(self, data) -> List[Client]:
+        return CLIENTS_ADAPTER.validate_python(data)
 
-    def get_clients_by_user_id(self, user_phone: str) -> List[Client]:
-        """Fetch clients by user phone from the external API."""
-        api_url = build_dynamic_url(
-            CollectionEnvConfig.COLLECTIONS_API_URL,
-            self.CLIENT_LIST_BY_USER_PATH,
-            None,
-            {"code": CollectionEnvConfig.COLLECTIONS_API_CODE}
-        )
-        logger.info("Fetching clients by user from Indi API: %s", api_url)
-        logger.debug("Data fetch user phone: %s", user_phone)
-        response = requests.get(api_url, headers=self._build_headers({"X-User-Phone": user_phone}))
-        data = self._handle_response(response, "Error fetching clients from Indi API") or []
-
-        clients = []
-        for item in data:
-            clients.append(Client(
-                id=(item.get("prefixPhone") or "") + (item.get("phoneNumber") or ""),
-                name=item.get("name"),
-                surname=item.get("surname"),
-                code_phone=item.get("codePhone"),
-                prefix_phone=item.get("prefixPhone"),
-                phone_number=item.get("phoneNumber"),
-                email=item.get("email") if item.get("email") is not None else None,
-                creditor_id=item.get("userId"),
-                raw_id=item.get("id")
-            ))
-        return clients
-
-    def get_account_by_user_id(self, user_phone: str) -> Optional[Union[Acreetor, Enterprise]]:
+    def _read_list(self, response: requests.Response, adapter: TypeAdapter, error_msg: str) -> list:
         """
-        Fetch creditor or enterprise by phone number from the external API.
-
-        Args:
-            user_phone (str): The phone number of the user to query (e.g., '+51987654321').
-
-        Returns:
-            Optional[Union[Acreetor, Enterprise]]: The creditor or enterprise object, or None if not found.
-
-        Raises:
-            ValueError: If the user_phone is invalid or empty.
+        Valida una respuesta de lista en bloque con el `TypeAdapter` del modelo. Los cuerpos pequeños se validan
+        directo desde los bytes; los grandes o sin `Content-Length` se decodifican por partes para no cargar
+        el JSON completo en memoria. Requiere que el request se haya hecho con `stream=True`; la respuesta
+        se cierra al terminar, también si la validación falla.
         """
-        if not user_phone or not isinstance(user_phone, str):
-            logger.error("Invalid or empty user_phone provided")
-            raise ValueError("user_phone must be a non-empty string")
-
-        try:
-            api_url = build_dynamic_url(
-                AuthEnvConfig.AUTH_API_URL,
-                self.USER_BY_PHONE_PATH,
-                None,
-                {"code": AuthEnvConfig.AUTH_API_CODE}
-            )
-        except Exception as e:
-            logger.error(f"Failed to build API URL: {str(e)}")
-            raise ValueError(f"Failed to build API URL: {str(e)}")
-
-        logger.info(f"Fetching creditor/enterprise from Indi API: {api_url}")
-        logger.debug(f"Querying user phone: {user_phone}")
-
-        try:
-            response = requests.get(
-                api_url,
-                headers=self._build_headers({"X-User-Phone": user_phone}),
-                timeout=10
-            )
-        except requests.RequestException as e:
-            logger.error(f"API request failed: {str(e)}")
-            return None
-
-        try:
-            data = self._handle_response(response, "Error fetching creditor from Indi API")
-            if data is None:
-                logger.info(f"[get_account_by_user_id] User not found for phone: {user_phone}")
-                return None
-        except ValueError as e:
-            logger.info(f"[get_account_by_user_id] User not found in Indi API: {str(e)}")
-            return None
-
+        with response:
+            if response.status_code not in (200, 204):
+                self._handle_response(response, error_msg)
+            if response.status_code == 204:
+                return []
+
+            content_length = int(response.headers.get("Content-Length") or 0)
+            if 0 < content_length <= self.STREAM_THRESHOLD_BYTES:
+                content = response.content.strip()
+                if not content or content == b"null":
+                    return []
+                return adapter.validate_json(content)
+
+            items = []
+            chunks = response.iter_content(chunk_size=self.STREAM_CHUNK_SIZE)
+            for batch in iter_batches(iter_json_array(chunks), self.STREAM_BATCH_SIZE):
+                items.extend(adapter.validate_python(batch))
+            metrics.increment("indi.http.streamed_responses")
+            return items
+
+    def _to_account(self, data: Dict[str, Any]) -> Optional[Union[Acreetor, Enterprise]]:
         try:
             is_enterprise = data.get("isEnterprise", False)
-            
+
             required_fields = ["id", "phoneNumber"]
             missing_fields = [field for field in required_fields if field not in data or data[field] is None]
             if missing_fields:
@@ -183,9 +169,51 @@ class IndiProvider(DataProvider):
         except (KeyError, ValidationError) as e:
             logger.error(f"Failed to process API response data: {str(e)}")
             return None
-        
-    def create_client(self, client: Client) -> Client:
-        """Create a client in Indi API."""
+
+    def _build_collections_url(self, path: str, path_vars: Optional[Dict[str, str]] = None,
+                               query_params: Optional[Dict[str, str]] = None) -> str:
+        return build_dynamic_url(
+            CollectionEnvConfig.COLLECTIONS_API_URL,
+            path,
+            path_vars,
+            {"code": CollectionEnvConfig.COLLECTIONS_API_CODE, **(query_params or {})}
+        )
+
+    def _to_collection_changes(self, response, data, requested_at: str) -> Tuple[List[Collection], str, bool]:
+        """
+        The delta endpoint answers with `{"items": [...], "cursor": "..."}`. A plain list means the server
+        ignored `updatedSince` and sent every collection, so it is flagged as a full snapshot.
+        Without a cursor from the server, the request timestamp is used for the next call.
+        Returns the items, the cursor and whether the items are a full snapshot.
+        """
+        if isinstance(data, dict):
+            items = data.get("items") or []
+            cursor = data.get("cursor")
+            is_full = False
+        else:
+            items = data or []
+            cursor = None
+            is_full = True
+        cursor = cursor or response.headers.get(self.SYNC_CURSOR_HEADER) or requested_at
+        return self._to_collection(items), cursor, is_full
+
+    def _build_account_url(self, user_phone: str) -> str:
+        if not user_phone or not isinstance(user_phone, str):
+            logger.error("Invalid or empty user_phone provided")
+            raise ValueError("user_phone must be a non-empty string")
+
+        try:
+            return build_dynamic_url(
+                AuthEnvConfig.AUTH_API_URL,
+                self.USER_BY_PHONE_PATH,
+                None,
+                {"code": AuthEnvConfig.AUTH_API_CODE}
+            )
+        except Exception as e:
+            logger.error(f"Failed to build API URL: {str(e)}")
+            raise ValueError(f"Failed to build API URL: {str(e)}")
+
+    def _build_client_payload(self, client: Client) -> Dict[str, Any]:
         data_client = {
             "name": client.name,
             "codePhone": client.code_phone,
@@ -195,32 +223,15 @@ class IndiProvider(DataProvider):
         }
         if client.surname:
             data_client["surname"] = client.surname
+        return data_client
 
-        api_url = build_dynamic_url(
-            CollectionEnvConfig.COLLECTIONS_API_URL,
-            self.CLIENT_CREATE_PATH,
-            None,
-            {"code": CollectionEnvConfig.COLLECTIONS_API_CODE}
-        )
-
-        logger.info("Creating client from Indi API: %s, with name: %s", api_url, data_client.get("name"))
-        logger.debug("Data to create: %s", data_client)
-
-        response = requests.post(api_url, json=data_client,
-                                 headers=self._build_headers({"X-User-Phone": client.creditor_id}))
-        result = self._handle_response(response, "Error creating debtor in Indi API")
-        client.raw_id = result.get("id")
-        logger.info(f"Created debtor in Indi: {result}")
-        return client
-
-    def create_collection(self, collection_register: CollectionRegister) -> List[Collection]:
-        """Create a collection in Indi API."""
+    def _build_collection_payload(self, collection_register: CollectionRegister) -> Dict[str, Any]:
         if collection_register.is_indefinite:
             collection_register.total_quotas = -1
         if not collection_register.clientPhoneNumber.startswith('+51'):
             collection_register.clientPhoneNumber = '+51' + collection_register.clientPhoneNumber
-            
-        data_collection = {
+
+        return {
             "client": {
                 "name": collection_register.name,
                 "surname": collection_register.surname,
@@ -236,20 +247,7 @@ class IndiProvider(DataProvider):
             "frequencyPayment": collection_register.frequency_payment
         }
 
-        api_url = build_dynamic_url(
-            CollectionEnvConfig.COLLECTIONS_API_URL,
-            self.COLLECTION_CREATE_PATH,
-            None,
-            {"code": CollectionEnvConfig.COLLECTIONS_API_CODE}
-        )
-
-        logger.info("Creating collection from Indi API: %s, with description: %s", api_url,
-                    data_collection.get("description"))
-        logger.debug("Data to create: %s", data_collection)
-
-        response = requests.post(api_url, json=data_collection,
-                                 headers=self._build_headers({"X-User-Phone": collection_register.creditor_id}))
-        result = self._handle_response(response, "Error creating collection in Indi API") or []
+    def _to_created_collections(self, result, collection_register: CollectionRegister) -> Tuple[List[Client], List[Collection]]:
         collections = []
         clients = []
         for item in result:
@@ -284,19 +282,218 @@ class IndiProvider(DataProvider):
                 email=client.get("email",''),
                 creditor_id=collection_register.creditor_id,
             ))
+        return clients, collections
+
+    def get_collection_by_user_id(self, user_phone: str) -> List[Collection]:
+        """Fetch collections by user phone from the external API."""
+        api_url = self._build_collections_url(self.COLLECTION_BY_USER_PHONE_PATH)
+        logger.info("Fetching collections by user from Indi API: %s", api_url)
+        logger.debug("Data fetch user phone: %s", user_phone)
+        response = self._request("GET", self.COLLECTION_BY_USER_PHONE_PATH, api_url, hedge=True, stream=True,
+                                 headers=self._build_headers({"X-User-Phone": user_phone}))
+        return self._read_list(response, COLLECTIONS_ADAPTER, "Error fetching collections from Indi API")
+
+    def get_collection_changes_by_user_id(self, user_phone: str, since: str) -> Tuple[List[Collection], str, bool]:
+        """
+        Fetch only the collections changed since `since` (cursor or ISO timestamp).
+        Deleted collections come back with `active=False`. Returns the changes, the cursor for the next call
+        and whether the server answered with a full snapshot instead (see `_to_collection_changes`).
+        """
+        requested_at = self.get_sync_timestamp()
+        api_url = self._build_collections_url(self.COLLECTION_BY_USER_PHONE_PATH, None, {self.SYNC_SINCE_PARAM: since})
+        logger.info("Fetching collection changes by user from Indi API: %s", api_url)
+        response = self._request("GET", self.COLLECTION_BY_USER_PHONE_PATH, api_url,
+                                 headers=self._build_headers({"X-User-Phone": user_phone}))
+        data = self._handle_response(response, "Error fetching collection changes from Indi API")
+        return self._to_collection_changes(response, data, requested_at)
+
+    @staticmethod
+    def get_sync_timestamp() -> str:
+        # The cursor is moved back a few seconds to absorb clock skew; re-applying a change is harmless.
+        skew = timedelta(seconds=int(os.getenv("COLLECTIONS_SYNC_SKEW_SECONDS", "5")))
+        return (datetime.now(timezone.utc) - skew).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+    def get_clients_by_user_id(self, user_phone: str) -> List[Client]:
+        """Fetch clients by user phone from the external API."""
+        api_url = self._build_collections_url(self.CLIENT_LIST_BY_USER_PATH)
+        logger.info("Fetching clients by user from Indi API: %s", api_url)
+        logger.debug("Data fetch user phone: %s", user_phone)
+        response = self._request("GET", self.CLIENT_LIST_BY_USER_PATH, api_url, hedge=True, stream=True,
+                                 headers=self._build_headers({"X-User-Phone": user_phone}))
+        return self._read_list(response, CLIENTS_ADAPTER, "Error fetching clients from Indi API")
+
+    def find_account_by_user_id(self, user_phone: str) -> Optional[Union[Acreetor, Enterprise]]:
+        """
+        Like `get_account_by_user_id`, but transport errors are raised instead of being reported as "not found",
+        so callers can tell an unknown number apart from an unavailable backend.
+
+        Only a 404 or an empty answer means "not found"; any other error status is raised.
+
+        Raises:
+            ValueError: If the user_phone is invalid or empty.
+            requests.RequestException: If the request to the Indi API fails or answers with an error status.
+            CircuitOpenError: If the circuit breaker for the endpoint is open.
+        """
+        api_url = self._build_account_url(user_phone)
+
+        logger.info(f"Fetching creditor/enterprise from Indi API: {api_url}")
+        logger.debug(f"Querying user phone: {user_phone}")
+
+        response = self._request(
+            "GET",
+            self.USER_BY_PHONE_PATH,
+            api_url,
+            headers=self._build_headers({"X-User-Phone": user_phone}),
+        )
+        if response.status_code == 404:
+            logger.info(f"[find_account_by_user_id] User not found for phone: {user_phone}")
+            return None
+        response.raise_for_status()
+
+        try:
+            data = self._handle_response(response, "Error fetching creditor from Indi API")
+            if data is None:
+                logger.info(f"[get_account_by_user_id] User not found for phone: {user_phone}")
+                return None
+        except ValueError as e:
+            logger.info(f"[get_account_by_user_id] User not found in Indi API: {str(e)}")
+            return None
+
+        return self._to_account(data)
+
+    def get_account_by_user_id(self, user_phone: str) -> Optional[Union[Acreetor, Enterprise]]:
+        """
+        Fetch creditor or enterprise by phone number from the external API.
+
+        Args:
+            user_phone (str): The phone number of the user to query (e.g., '+51987654321').
+
+        Returns:
+            Optional[Union[Acreetor, Enterprise]]: The creditor or enterprise object, or None if not found.
+
+        Raises:
+            ValueError: If the user_phone is invalid or empty.
+        """
+        try:
+            return self.find_account_by_user_id(user_phone)
+        except (requests.RequestException, CircuitOpenError) as e:
+            logger.error(f"API request failed: {str(e)}")
+            return None
+
+    def create_client(self, client: Client) -> Client:
+        """Create a client in Indi API."""
+        data_client = self._build_client_payload(client)
+        api_url = self._build_collections_url(self.CLIENT_CREATE_PATH)
+
+        logger.info("Creating client from Indi API: %s, with name: %s", api_url, data_client.get("name"))
+        logger.debug("Data to create: %s", data_client)
+
+        response = self._request("POST", self.CLIENT_CREATE_PATH, api_url, json=data_client,
+                                 headers=self._build_headers({"X-User-Phone": client.creditor_id}))
+        result = self._handle_response(response, "Error creating debtor in Indi API")
+        client.raw_id = result.get("id")
+        logger.info(f"Created debtor in Indi: {result}")
+        return client
+
+    def create_collection(self, collection_register: CollectionRegister) -> Tuple[List[Client], List[Collection]]:
+        """Create a collection in Indi API. Returns the clients and collections it created."""
+        data_collection = self._build_collection_payload(collection_register)
+        api_url = self._build_collections_url(self.COLLECTION_CREATE_PATH)
+
+        logger.info("Creating collection from Indi API: %s, with description: %s", api_url,
+                    data_collection.get("description"))
+        logger.debug("Data to create: %s", data_collection)
+
+        response = self._request("POST", self.COLLECTION_CREATE_PATH, api_url, json=data_collection,
+                                 headers=self._build_headers({"X-User-Phone": collection_register.creditor_id}))
+        result = self._handle_response(response, "Error creating collection in Indi API") or []
+        clients, collections = self._to_created_collections(result, collection_register)
         logger.debug(f"Created collections in Indi: {result}")
         return clients, collections
 
+    @staticmethod
+    def _group_by_creditor(items: list) -> Dict[str, List[int]]:
+        groups = defaultdict(list)
+        for index, item in enumerate(items):
+            groups[item.creditor_id].append(index)
+        return groups
+
+    @staticmethod
+    def _to_bulk_result(index: int, creditor_id: str, created=None, error: Optional[Exception] = None) -> BulkItemResult:
+        if error is not None:
+            return BulkItemResult(index=index, creditor_id=creditor_id, success=False, error=str(error))
+        if isinstance(created, Client):
+            return BulkItemResult(index=index, creditor_id=creditor_id, success=True, clients=[created])
+        clients, collections = created
+        return BulkItemResult(index=index, creditor_id=creditor_id, success=True, clients=clients, collections=collections)
+
+    @staticmethod
+    def _save_bulk_results(creditor_id: str, results: List[BulkItemResult], memory: Optional[RedisMemory] = None):
+        """
+        Agrega a la memoria del acreedor todo lo creado en el lote y la guarda una sola vez.
+        Solo se actualiza una conversación que ya existe: crear la clave con solo lo nuevo evitaría que la
+        conversación cargue luego los datos completos del acreedor desde Indi.
+        """
+        created = [result for result in results if result.success]
+        if not created:
+            return
+        if memory is None or memory.user_id != creditor_id:
+            memory = RedisMemory(user_id=creditor_id)
+            if not memory.redis_client.exists(memory.redis_key):
+                logger.info(f"No conversation loaded for creditor {creditor_id}; bulk results not cached")
+                return
+        for result in created:
+            for client in result.clients:
+                memory.add_client(client)
+            for collection in result.collections:
+                memory.add_collection(collection)
+        memory.save()
+
+    def _run_bulk(self, items: list, create: Callable, memory: Optional[RedisMemory] = None) -> List[BulkItemResult]:
+        """
+        Crea los elementos agrupados por acreedor, en lotes de `BULK_BATCH_SIZE` con a lo sumo
+        `BULK_MAX_WORKERS` requests en paralelo. Un fallo no detiene el resto: cada elemento tiene su resultado.
+        """
+        results: List[Optional[BulkItemResult]] = [None] * len(items)
+        with ThreadPoolExecutor(max_workers=self.BULK_MAX_WORKERS) as executor:
+            for creditor_id, indexes in self._group_by_creditor(items).items():
+                for start in range(0, len(indexes), self.BULK_BATCH_SIZE):
+                    futures = {executor.submit(create, items[index]): index for index in indexes[start:start + self.BULK_BATCH_SIZE]}
+                    for future in as_completed(futures):
+                        index = futures[future]
+                        try:
+                            results[index] = self._to_bulk_result(index, creditor_id, future.result())
+                        except Exception as e:
+                            logger.error(f"Bulk item {index} failed for creditor {creditor_id}: {e}")
+                            results[index] = self._to_bulk_result(index, creditor_id, error=e)
+                self._save_bulk_results(creditor_id, [results[index] for index in indexes], memory)
+        metrics.increment("indi.bulk.items", len(items))
+        metrics.increment("indi.bulk.errors", sum(1 for result in results if not result.success))
+        return results
+
+    def create_clients_bulk(self, clients: List[Client], memory: Optional[RedisMemory] = None) -> List[BulkItemResult]:
+        """
+        Create many clients in Indi API with bounded concurrency.
+        Returns one result per input client, in the same order, and saves each creditor's memory once.
+        """
+        logger.info(f"Creating {len(clients)} clients in bulk")
+        return self._run_bulk(clients, self.create_client, memory)
+
+    def create_collections_bulk(self, collection_registers: List[CollectionRegister],
+                                memory: Optional[RedisMemory] = None) -> List[BulkItemResult]:
+        """
+        Create many collections in Indi API, grouped by creditor and with bounded concurrency.
+        Returns one result per input register, in the same order, and saves each creditor's memory once.
+        """
+        logger.info(f"Creating {len(collection_registers)} collections in bulk")
+        return self._run_bulk(collection_registers, self.create_collection, memory)
+
     def delete_collection(self, collection_id: str, user_id: str) -> str:
         """Delete a collection in Indi API."""
-        api_url = build_dynamic_url(
-            CollectionEnvConfig.COLLECTIONS_API_URL,
-            self.COLLECTION_DELETE_PATH,
-            {"id": collection_id},
-            {"code": CollectionEnvConfig.COLLECTIONS_API_CODE}
-        )
+        api_url = self._build_collections_url(self.COLLECTION_DELETE_PATH, {"id": collection_id})
         logger.info("Deleting collection from Indi API: %s", api_url)
-        response = requests.delete(api_url, headers=self._build_headers({"X-User-Phone": user_id}))
+        response = self._request("DELETE", self.COLLECTION_DELETE_PATH, api_url,
+                                 headers=self._build_headers({"X-User-Phone": user_id}))
         self._handle_response(response, "Error deleting collection in Indi API")
         return "Collection deleted successfully"
     
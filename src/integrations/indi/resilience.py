@@ -0,0 +1,192 @@
+import os
+import time
+import asyncio
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, FIRST_COMPLETED, wait
+from typing import Awaitable, Callable, Dict, Optional
+
+from src.utils.logger import logger
+from src.utils.metrics import metrics
+
+FAILURE_STATUSES = (429, 500, 502, 503, 504)
+
+_hedge_executor = ThreadPoolExecutor(max_workers=int(os.getenv("INDI_HEDGE_WORKERS", "8")))
+
+
+class CircuitOpenError(Exception):
+    """El circuito del endpoint está abierto: se responde de inmediato sin llamar a Indi."""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"Circuit open for {name}, retry in {retry_after:.1f}s")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker por endpoint. Tras `failure_threshold` fallos consecutivos se abre durante
+    `recovery_time` segundos y rechaza las llamadas con `CircuitOpenError`. Luego deja pasar una
+    sola llamada de prueba (half-open): si responde bien se cierra, si falla vuelve a abrirse. Si la prueba
+    no registra resultado en `recovery_time` segundos (por ejemplo, porque se canceló) se deja pasar otra.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int, recovery_time: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_time = recovery_time
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probe_started_at = 0.0
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+            now = time.monotonic()
+            elapsed = now - (self.opened_at if self.state == self.OPEN else self.probe_started_at)
+            if elapsed >= self.recovery_time:
+                self.state = self.HALF_OPEN
+                self.probe_started_at = now
+                return
+        metrics.increment(f"indi.circuit.{self.name}.rejected")
+        raise CircuitOpenError(self.name, max(self.recovery_time - elapsed, 0.0))
+
+    def record_success(self):
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info(f"Circuit for {self.name} closed")
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.warning(f"Circuit for {self.name} opened after {self.failures} failures")
+                    metrics.increment(f"indi.circuit.{self.name}.opened")
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+    def record_status(self, status_code: int):
+        if status_code in FAILURE_STATUSES:
+            self.record_failure()
+        else:
+            self.record_success()
+
+
+class LatencyTracker:
+    """Ventana de latencias recientes de un endpoint para estimar su p95."""
+
+    def __init__(self, window: int, min_samples: int, default_delay: float):
+        self.samples = deque(maxlen=window)
+        self.min_samples = min_samples
+        self.default_delay = default_delay
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float):
+        with self._lock:
+            self.samples.append(seconds)
+
+    def p95(self) -> float:
+        with self._lock:
+            if len(self.samples) < self.min_samples:
+                return self.default_delay
+            ordered = sorted(self.samples)
+        return ordered[int(0.95 * (len(ordered) - 1))]
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_trackers: Dict[str, LatencyTracker] = {}
+_registry_lock = threading.Lock()
+
+
+def get_circuit_breaker(name: str) -> CircuitBreaker:
+    with _registry_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(
+                name,
+                failure_threshold=int(os.getenv("INDI_CIRCUIT_FAILURE_THRESHOLD", "5")),
+                recovery_time=float(os.getenv("INDI_CIRCUIT_RECOVERY_TIME", "30")),
+            )
+        return _breakers[name]
+
+
+def get_latency_tracker(name: str) -> LatencyTracker:
+    with _registry_lock:
+        if name not in _trackers:
+            _trackers[name] = LatencyTracker(
+                window=int(os.getenv("INDI_HEDGE_WINDOW", "200")),
+                min_samples=int(os.getenv("INDI_HEDGE_MIN_SAMPLES", "20")),
+                default_delay=float(os.getenv("INDI_HEDGE_DEFAULT_DELAY", "1.5")),
+            )
+        return _trackers[name]
+
+
+def is_hedging_enabled() -> bool:
+    return os.getenv("INDI_HEDGED_READS_ENABLED", "false").lower() == "true"
+
+
+def _close_response(future):
+    if not future.cancelled() and future.exception() is None and hasattr(future.result(), "close"):
+        future.result().close()
+
+
+def run_hedged(name: str, call: Callable, delay: float):
+    """
+    Ejecuta `call` y, si no respondió en `delay` segundos, lanza una segunda copia y retorna la primera
+    respuesta exitosa. Solo debe usarse con lecturas idempotentes. La respuesta descartada se cierra.
+    """
+    first = _hedge_executor.submit(call)
+    try:
+        return first.result(timeout=delay)
+    except FuturesTimeoutError:
+        pass
+
+    metrics.increment(f"indi.http.{name}.hedged")
+    pending = {first, _hedge_executor.submit(call)}
+    error = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                for other in pending:
+                    other.add_done_callback(_close_response)
+                if future is not first:
+                    metrics.increment(f"indi.http.{name}.hedge_wins")
+                return future.result()
+            error = future.exception()
+    raise error
+
+
+async def arun_hedged(name: str, call: Callable[[], Awaitable], delay: float):
+    """Versión asíncrona de `run_hedged`: la copia perdedora se cancela."""
+    first = asyncio.ensure_future(call())
+    done, _ = await asyncio.wait({first}, timeout=delay)
+    if done:
+        return first.result()
+
+    metrics.increment(f"indi.http.{name}.hedged")
+    second = asyncio.ensure_future(call())
+    pending = {first, second}
+    error: Optional[BaseException] = None
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if task is second:
+                        metrics.increment(f"indi.http.{name}.hedge_wins")
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,48 @@
+from typing import List, Optional
+
+from pydantic import Field, TypeAdapter, model_validator
+
+from src.domain.models.client import Client
+from src.domain.models.collection import Collection
+
+
+class IndiCollection(Collection):
+    """`Collection` con los nombres de campo de la API de Indi, para validar las respuestas sin mapear a mano."""
+
+    client_id: str = Field(validation_alias="clientId")
+    client_cellphone: str = Field(validation_alias="clientPhoneNumber")
+    client_full_name: str = Field(validation_alias="clientFullName")
+    acreetor_id: str = Field(validation_alias="userId")
+    acreetor_full_name: str = Field(validation_alias="userFullName")
+    acreetor_cellphone: str = Field(validation_alias="userPhoneNumber")
+    status: str = Field(validation_alias="paymentStatus")
+    collection_date: str = Field(validation_alias="collectionDate")
+    payment_date: Optional[str] = Field(None, validation_alias="paymentDate")
+    total_quotas: Optional[int] = Field(None, validation_alias="totalQuotas")
+    quota_number: Optional[int] = Field(None, validation_alias="numberQuota")
+    frequency_payment: str = Field(validation_alias="frequencyPayment")
+    active: Optional[bool] = None
+
+
+class IndiClient(Client):
+    """`Client` con los nombres de campo de la API de Indi. El `id` de Indi se guarda en `raw_id`."""
+
+    # El `id` interno no viene en la respuesta: se arma con el teléfono completo del cliente.
+    id: str = Field("", validation_alias="clientKey")
+    surname: Optional[str] = None
+    code_phone: str = Field("PE", validation_alias="codePhone")
+    prefix_phone: str = Field(validation_alias="prefixPhone")
+    phone_number: str = Field(validation_alias="phoneNumber")
+    email: Optional[str] = None
+    creditor_id: str = Field("", validation_alias="userId")
+    raw_id: Optional[str] = Field(None, validation_alias="id")
+
+    @model_validator(mode="after")
+    def _set_id(self):
+        if not self.id:
+            self.id = self.prefix_phone + self.phone_number
+        return self
+
+
+COLLECTIONS_ADAPTER = TypeAdapter(List[IndiCollection])
+CLIENTS_ADAPTER = TypeAdapter(List[IndiClient])
@@ -0,0 +1,66 @@
+import os
+import threading
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from src.utils.metrics import metrics
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def _build_retry() -> Retry:
+    """Reintentos acotados con backoff y jitter, solo para métodos idempotentes."""
+    return Retry(
+        total=int(os.getenv("INDI_HTTP_MAX_RETRIES", "2")),
+        backoff_factor=float(os.getenv("INDI_HTTP_BACKOFF_FACTOR", "0.3")),
+        backoff_jitter=float(os.getenv("INDI_HTTP_BACKOFF_JITTER", "0.3")),
+        status_forcelist=(429, 502, 503, 504),
+        allowed_methods=frozenset({"GET"}),
+        raise_on_status=False,
+    )
+
+
+def get_indi_session() -> requests.Session:
+    """
+    Retorna la sesión HTTP compartida del proceso para la API de Indi.
+    Mantiene un pool de conexiones keep-alive reutilizado por todas las instancias de `IndiProvider`.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                pool_size = int(os.getenv("INDI_HTTP_POOL_SIZE", "20"))
+                adapter = HTTPAdapter(
+                    pool_connections=int(os.getenv("INDI_HTTP_POOL_CONNECTIONS", "4")),
+                    pool_maxsize=pool_size,
+                    max_retries=_build_retry(),
+                )
+                session = requests.Session()
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+
+def get_connection_metrics() -> dict:
+    """
+    Métricas de reutilización de conexiones: requests enviados frente a conexiones abiertas por host.
+    """
+    if _session is None:
+        return {}
+    hosts = {}
+    pools = _session.get_adapter("https://").poolmanager.pools
+    for key in list(pools.keys()):
+        pool = pools.get(key)
+        if pool is None:
+            continue
+        hosts[f"{pool.scheme}://{pool.host}:{pool.port}"] = {
+            "requests": pool.num_requests,
+            "connections": pool.num_connections,
+            "reuse_ratio": 1 - (pool.num_connections / pool.num_requests) if pool.num_requests else 0.0,
+        }
+    return {"hosts": hosts, **metrics.snapshot("indi.http")}
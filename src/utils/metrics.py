@@ -0,0 +1,38 @@
+import threading
+from typing import Dict
+
+
+class MetricsRegistry:
+    """
+    Registro en memoria de contadores y tiempos del proceso.
+    Es seguro entre hilos y se consulta con `snapshot` para volcarlo al log.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = {}
+        self._timings: Dict[str, Dict[str, float]] = {}
+
+    def increment(self, name: str, value: float = 1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def observe(self, name: str, value: float):
+        with self._lock:
+            timing = self._timings.setdefault(name, {"count": 0, "sum": 0.0, "max": 0.0})
+            timing["count"] += 1
+            timing["sum"] += value
+            timing["max"] = max(timing["max"], value)
+
+    def snapshot(self, prefix: str = "") -> dict:
+        with self._lock:
+            counters = {k: v for k, v in self._counters.items() if k.startswith(prefix)}
+            timings = {
+                k: {**v, "avg": v["sum"] / v["count"] if v["count"] else 0.0}
+                for k, v in self._timings.items()
+                if k.startswith(prefix)
+            }
+        return {"counters": counters, "timings": timings}
+
+
+metrics = MetricsRegistry()
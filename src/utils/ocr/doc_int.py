@@ -1,5 +1,9 @@
 import os
+import time
+import threading
+from typing import Optional, Union
 from azure.core.credentials import AzureKeyCredential
+from azure.core.polling.base_polling import LROBasePolling
 from azure.ai.documentintelligence.models import AnalyzeDocumentRequest, AnalyzeResult
 from azure.ai.documentintelligence import DocumentIntelligenceClient
 
@@ -10,50 +14,84 @@ logger = get_function_logger("function_app")
 endpoint = os.getenv("AZURE_DOCUMENT_INTELLIGENCE_ENDPOINT")
 key = os.getenv("AZURE_DOCUMENT_INTELLIGENCE_KEY")
 
+POLLING_INTERVAL = float(os.getenv("DOC_INT_POLLING_INTERVAL", "1"))
+DEADLINE = float(os.getenv("DOC_INT_DEADLINE", "60"))
 
-def analyze_invoice(
-    url_source: dict, session_id: str = "", invoke_id: str = ""
-) -> dict:
-    """
-    Analiza una factura usando Azure Document Intelligence y extrae su contenido.
-    """
-    try:
-        document_intelligence_client = DocumentIntelligenceClient(
-            endpoint=endpoint, credential=AzureKeyCredential(key)
-        )
+_client: Optional[DocumentIntelligenceClient] = None
+_client_lock = threading.Lock()
 
-        poller = document_intelligence_client.begin_analyze_document(
-            "prebuilt-invoice", AnalyzeDocumentRequest(url_source=url_source)
-        )
-        result = poller.result()
-        invoice_summary = result.get("content", "")
 
-        logger.info(
-            f"Session ID: {session_id} - Invoke ID: {invoke_id} - Salida de Document Intelligence: {invoice_summary}"
-        )
+def get_document_intelligence_client() -> DocumentIntelligenceClient:
+    """Cliente de Document Intelligence compartido por el proceso; reutiliza sus conexiones."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = DocumentIntelligenceClient(endpoint=endpoint, credential=AzureKeyCredential(key))
+    return _client
 
-        return {"success": True, "ocr_context": invoice_summary}
 
-    except Exception as e:
-        logger.error(f"Error procesando la imagen para OCR enterprise: {e}")
-        return {
-            "success": False,
-            "ocr_context": "Error al procesar la imagen, por favor intente de nuevo.",
-        }
+def _build_analyze_request(source: Union[bytes, str]) -> AnalyzeDocumentRequest:
+    """Con bytes ya descargados se envía el contenido; con una URL Azure descarga el archivo."""
+    if isinstance(source, (bytes, bytearray)):
+        return AnalyzeDocumentRequest(bytes_source=bytes(source))
+    return AnalyzeDocumentRequest(url_source=source)
 
 
-def analyze_receipt(
-    url_source: dict, session_id: str = "", invoke_id: str = ""
-) -> AnalyzeResult:
-    document_intelligence_client = DocumentIntelligenceClient(
-        endpoint=endpoint, credential=AzureKeyCredential(key)
+class _DeadlinePolling(LROBasePolling):
+    """Consulta el estado del análisis hasta `deadline` (reloj `time.monotonic`); luego deja de consultar."""
+
+    def __init__(self, deadline: float, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._deadline = deadline
+
+    def _delay(self) -> None:
+        if time.monotonic() + self._extract_delay() > self._deadline:
+            raise TimeoutError(f"Document Intelligence no respondió en {DEADLINE} segundos")
+        super()._delay()
+
+
+def _analyze(model_id: str, source: Union[bytes, str]) -> AnalyzeResult:
+    """
+    Ejecuta el análisis consultando el estado cada `DOC_INT_POLLING_INTERVAL` segundos. Al vencer
+    `DOC_INT_DEADLINE` el hilo del poller deja de consultar, así un análisis abandonado no sigue
+    haciendo requests en segundo plano. El cliente es síncrono; desde código asíncrono se llama con
+    `asyncio.to_thread`, como el parseo de mensajes del canal.
+
+    Raises:
+        TimeoutError: Si el análisis no termina antes de `DOC_INT_DEADLINE` segundos.
+    """
+    polling = _DeadlinePolling(
+        time.monotonic() + DEADLINE, POLLING_INTERVAL, path_format_arguments={"endpoint": endpoint}
+    )
+    poller = get_document_intelligence_client().begin_analyze_document(
+        model_id, _build_analyze_request(source), polling=polling
     )
+    result = poller.result(timeout=DEADLINE)
+    if not poller.done():
+        raise TimeoutError(f"Document Intelligence no respondió en {DEADLINE} segundos")
+    return result
+
+
+def _summarize_invoice(result: AnalyzeResult, session_id: str = "", invoke_id: str = "") -> dict:
+    invoice_summary = result.get("content", "")
 
-    poller = document_intelligence_client.begin_analyze_document(
-        "prebuilt-receipt", AnalyzeDocumentRequest(url_source=url_source)
+    logger.info(
+        f"Session ID: {session_id} - Invoke ID: {invoke_id} - Salida de Document Intelligence: {invoice_summary}"
     )
-    receipts = poller.result()
 
+    return {"success": True, "ocr_context": invoice_summary}
+
+
+def _invoice_error(e: Exception) -> dict:
+    logger.error(f"Error procesando la imagen para OCR enterprise: {e}")
+    return {
+        "success": False,
+        "ocr_context": "Error al procesar la imagen, por favor intente de nuevo.",
+    }
+
+
+def _summarize_receipt(receipts: AnalyzeResult, session_id: str = "", invoke_id: str = "") -> dict:
     output_lines = []
 
     for receipt in receipts.documents:
@@ -79,3 +117,22 @@ def analyze_receipt(
     )
 
     return final_result
+
+
+def analyze_invoice(
+    source: Union[bytes, str], session_id: str = "", invoke_id: str = ""
+) -> dict:
+    """
+    Analiza una factura usando Azure Document Intelligence y extrae su contenido.
+    `source` son los bytes del archivo o su URL.
+    """
+    try:
+        return _summarize_invoice(_analyze("prebuilt-invoice", source), session_id, invoke_id)
+    except Exception as e:
+        return _invoice_error(e)
+
+
+def analyze_receipt(
+    source: Union[bytes, str], session_id: str = "", invoke_id: str = ""
+) -> dict:
+    return _summarize_receipt(_analyze("prebuilt-receipt", source), session_id, invoke_id)
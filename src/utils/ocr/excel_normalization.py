@@ -0,0 +1,176 @@
+import os
+import re
+import math
+import functools
+import unicodedata
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+DATE_COLUMNS = ("FECHA",)
+AMOUNT_COLUMNS = ("TOTAL", "SALDO", "A CUENTA")
+
+HEADER_SYNONYMS = {
+    "FECHA": ("fec", "fecha de venta", "fecha venta", "fecha de emision", "fecha emision", "fecha de compra", "date"),
+    "TOTAL": ("monto", "monto total", "importe", "importe total", "total venta"),
+    "SALDO": ("saldo pendiente", "deuda", "pendiente", "por cobrar", "restante"),
+    "A CUENTA": ("acuenta", "adelanto", "abono", "abonado", "pagado", "monto pagado", "pago a cuenta"),
+    "CLIENTE": ("clientes", "nombre", "nombres", "nombre del cliente", "nombre cliente", "razon social", "deudor"),
+    "CELULAR": ("cel", "telefono", "numero de celular", "nro celular", "movil", "whatsapp"),
+    "DESCRIPCION": ("concepto", "detalle", "producto", "glosa"),
+}
+
+STRING_DATE_FORMATS = ("%d/%m/%y", "%d/%m/%Y", "%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%d-%m-%Y", "%d.%m.%Y", "%Y/%m/%d")
+EXCEL_EPOCH_SECONDS = -2209161600  # 1899-12-30, día 0 de las fechas seriales de Excel
+SERIAL_DATE_RANGE = (20000, 80000)  # 1954-10-03 a 2119-01-11; fuera de este rango un número no se lee como fecha
+NUMBER_PATTERN = r"-?(\d+\.?\d*|\.\d+)"
+
+
+def _normalize_header(name: str) -> str:
+    text = unicodedata.normalize("NFKD", str(name)).encode("ascii", "ignore").decode("ascii")
+    text = re.sub(r"[^a-z0-9]+", " ", text.lower())
+    return text.strip()
+
+
+_CANONICAL_INDEX = {_normalize_header(column): column for column in HEADER_SYNONYMS}
+_SYNONYM_INDEX = {
+    _normalize_header(synonym): column
+    for column, synonyms in HEADER_SYNONYMS.items()
+    for synonym in synonyms
+}
+
+
+def detect_columns(header: List[str], exact: bool = False) -> Dict[int, str]:
+    """
+    Reconoce las columnas conocidas (sin distinguir mayúsculas, tildes ni signos). Primero por su nombre
+    canónico y después, para los nombres aún libres, por sus sinónimos; así una columna "Total" gana sobre
+    un sinónimo como "Monto". Con `exact=True` solo se reconocen los nombres canónicos.
+    Retorna índice -> nombre canónico; si dos columnas coinciden con el mismo nombre se usa la primera.
+    """
+    detected: Dict[int, str] = {}
+    names = [_normalize_header(name) for name in header]
+    for index_map in (_CANONICAL_INDEX,) if exact else (_CANONICAL_INDEX, _SYNONYM_INDEX):
+        for index, name in enumerate(names):
+            column = index_map.get(name)
+            if column and index not in detected and column not in detected.values():
+                detected[index] = column
+    return dict(sorted(detected.items()))
+
+
+def _cell_to_str(value) -> Optional[str]:
+    """Texto de una celda; los floats sin notación científica (`str(1e20)` sería "1e+20")."""
+    if value is None:
+        return None
+    if isinstance(value, float) and math.isfinite(value):
+        return np.format_float_positional(value, trim="-")
+    return str(value)
+
+
+def _to_text(values: Iterable) -> pa.Array:
+    """Columna como texto de Arrow sin espacios en los extremos; las celdas vacías o en blanco quedan nulas."""
+    try:
+        text = pa.array(values, type=pa.string())
+    except (pa.ArrowTypeError, pa.ArrowInvalid):
+        text = pa.array([_cell_to_str(value) for value in values], type=pa.string())
+    text = pc.utf8_trim_whitespace(text)
+    return pc.if_else(pc.equal(text, ""), pa.scalar(None, pa.string()), text)
+
+
+def _parse_numbers(text: pa.Array) -> pa.Array:
+    """Convierte a float los textos que son un número simple; el resto queda nulo."""
+    is_number = pc.match_substring_regex(text, f"^{NUMBER_PATTERN}$")
+    return pc.cast(pc.if_else(is_number, text, pa.scalar(None, pa.string())), pa.float64())
+
+
+def normalize_dates(text: pa.Array) -> pa.Array:
+    """
+    Convierte la columna a YYYY-MM-DD: los números dentro de `SERIAL_DATE_RANGE` se leen como fechas
+    seriales de Excel y los textos (y las fechas, por su representación) con los formatos de
+    `STRING_DATE_FORMATS`, día primero.
+    Lo que no se reconoce se deja como estaba.
+    """
+    serials = _parse_numbers(text)
+    in_range = pc.and_(pc.greater(serials, SERIAL_DATE_RANGE[0]), pc.less(serials, SERIAL_DATE_RANGE[1]))
+    serials = pc.if_else(in_range, serials, pa.scalar(None, pa.float64()))
+    seconds = pc.add(pc.multiply(serials, 86400), EXCEL_EPOCH_SECONDS)
+    parsed = pc.cast(pc.cast(seconds, pa.int64(), safe=False), pa.timestamp("s"))
+    for date_format in STRING_DATE_FORMATS:
+        if parsed.null_count == text.null_count:
+            break
+        parsed = pc.coalesce(parsed, pc.strptime(text, format=date_format, unit="s", error_is_null=True))
+    return pc.coalesce(pc.strftime(parsed, format="%Y-%m-%d"), text)
+
+
+def _numbers_to_text(numbers: pa.Array) -> pa.Array:
+    """Números como texto; los que Arrow escribiría en notación científica ("1e+20") se reescriben con `_cell_to_str`."""
+    text = pc.cast(numbers, pa.string())
+    scientific = pc.match_substring(text, "e")
+    if not pc.any(scientific).as_py():
+        return text
+    values = numbers.to_pylist()
+    return pa.array(
+        [_cell_to_str(values[index]) if flag else value
+         for index, (flag, value) in enumerate(zip(scientific.to_pylist(), text.to_pylist()))],
+        type=pa.string(),
+    )
+
+
+def normalize_amounts(text: pa.Array) -> pa.Array:
+    """
+    Convierte la columna a números quitando símbolos de moneda y separadores de miles. Si hay coma y punto,
+    el último es el decimal; una coma sola es decimal solo si la siguen uno o dos dígitos.
+    Los montos entre paréntesis son negativos, las celdas vacías quedan en 0 y los textos que no son montos
+    se dejan como estaban.
+    """
+    negative = pc.match_substring_regex(text, r"^\(.*\)$")
+    digits = pc.utf8_trim(pc.replace_substring_regex(text, r"[^\d,.\-]", ""), characters=".,")
+    comma_is_decimal = pc.and_kleene(
+        pc.match_substring_regex(digits, r",[^.]*$"),
+        pc.or_kleene(pc.match_substring(digits, "."), pc.match_substring_regex(digits, r",[^,]{1,2}$")),
+    )
+    decimal_comma = pc.replace_substring(pc.replace_substring(digits, ".", ""), ",", ".")
+    without_commas = pc.replace_substring(digits, ",", "")
+    without_commas = pc.if_else(
+        pc.match_substring_regex(without_commas, r"\..*\."), pc.replace_substring(without_commas, ".", ""), without_commas
+    )
+    numeric = _parse_numbers(pc.if_else(comma_is_decimal, decimal_comma, without_commas))
+    numeric = pc.if_else(negative, pc.negate(pc.abs(numeric)), numeric)
+    return pc.coalesce(_numbers_to_text(numeric), text, pa.scalar("0"))
+
+
+def normalize_block(header: List[str], rows: List[List]) -> List[List[Optional[str]]]:
+    """
+    Normaliza un bloque de filas columna por columna con `pyarrow.compute`: las celdas pasan a texto sin
+    espacios en los extremos (las vacías a `None`), se descartan las filas vacías y se aplican
+    `normalize_dates` / `normalize_amounts` a las columnas detectadas en `header`.
+    Las filas deben tener el mismo largo que la cabecera.
+    """
+    if not rows:
+        return []
+    texts = [_to_text(column) for column in zip(*rows)]
+
+    filled = functools.reduce(pc.or_, [pc.is_valid(text) for text in texts])
+    if pc.sum(filled).as_py() != len(rows):
+        texts = [text.filter(filled) for text in texts]
+        if not len(texts[0]):
+            return []
+
+    for index, column in detect_columns(header).items():
+        if column in DATE_COLUMNS:
+            texts[index] = normalize_dates(texts[index])
+        elif column in AMOUNT_COLUMNS:
+            texts[index] = normalize_amounts(texts[index])
+
+    return [list(row) for row in zip(*(text.to_numpy(zero_copy_only=False).tolist() for text in texts))]
+
+
+def canonical_header(header: List[str]) -> List[str]:
+    """Cabecera con las columnas detectadas renombradas a su nombre canónico."""
+    detected = detect_columns(header)
+    return [detected.get(index, name) for index, name in enumerate(header)]
+
+
+def block_rows() -> int:
+    return int(os.getenv("EXCEL_NORMALIZE_BLOCK_ROWS", "2000"))
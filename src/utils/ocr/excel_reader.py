@@ -0,0 +1,41 @@
+import io
+from typing import Iterator, List
+
+import openpyxl
+import xlrd
+
+XLSX_SIGNATURE = b"PK\x03\x04"
+
+
+def iter_excel_rows(content: bytes) -> Iterator[List]:
+    """
+    Recorre la primera hoja del archivo fila por fila, con las celdas vacías como `None`.
+    Los xlsx se leen con openpyxl en modo `read_only`, que no construye el libro en memoria;
+    los xls (formato binario) se abren con xlrd `on_demand`, que carga solo la hoja leída.
+    """
+    if content[:4] == XLSX_SIGNATURE:
+        yield from _iter_xlsx_rows(content)
+    else:
+        yield from _iter_xls_rows(content)
+
+
+def _iter_xlsx_rows(content: bytes) -> Iterator[List]:
+    workbook = openpyxl.load_workbook(io.BytesIO(content), read_only=True, data_only=True)
+    try:
+        for row in workbook.worksheets[0].iter_rows(values_only=True):
+            yield list(row)
+    finally:
+        workbook.close()
+
+
+def _iter_xls_rows(content: bytes) -> Iterator[List]:
+    book = xlrd.open_workbook(file_contents=content, on_demand=True)
+    try:
+        sheet = book.sheet_by_index(0)
+        for index in range(sheet.nrows):
+            yield [
+                None if cell.ctype in (xlrd.XL_CELL_EMPTY, xlrd.XL_CELL_BLANK) else cell.value
+                for cell in sheet.row(index)
+            ]
+    finally:
+        book.release_resources()
@@ -0,0 +1,138 @@
+import os
+import re
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from src.utils.logger import get_function_logger
+from src.utils.metrics import metrics
+from src.utils.ocr.excel_normalization import AMOUNT_COLUMNS, detect_columns
+
+logger = get_function_logger("function_app")
+
+DEFAULT_CURRENCY = "Soles (S/)"
+DEFAULT_FREQUENCY = "ÚNICO"
+
+
+def _to_float(value: Optional[str]) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _clean_phone(value: Optional[str]) -> Optional[str]:
+    """Celular peruano de 9 dígitos; acepta el prefijo 51 y descarta lo que no tenga ese formato."""
+    digits = re.sub(r"\D", "", value or "")
+    if len(digits) == 11 and digits.startswith("51"):
+        digits = digits[2:]
+    return digits if len(digits) == 9 and digits.startswith("9") else None
+
+
+class SheetTemplate:
+    """
+    Layout conocido de hoja empresarial: las columnas canónicas que debe tener (ver `HEADER_SYNONYMS`) y
+    cómo obtener el monto por cobrar de cada fila.
+    """
+
+    def __init__(self, name: str, required: Tuple[str, ...], amount: Callable[[Dict[str, Optional[str]]], Optional[float]]):
+        self.name = name
+        self.required = required
+        self.amount = amount
+
+    def build_item(self, record: Dict[str, Optional[str]], amount: Optional[float]) -> Optional[dict]:
+        """
+        Arma un acreedor del JSON final con los campos de registro de cobro de `CollectionRegister`.
+        Retorna `None` si a la fila le falta el cliente, un celular válido o el monto.
+        """
+        name = (record.get("CLIENTE") or "").strip()
+        phone = _clean_phone(record.get("CELULAR"))
+        if not name or not phone or amount is None:
+            return None
+        return {
+            "name": name,
+            "clientPhoneNumber": phone,
+            "description": record.get("DESCRIPCION") or "",
+            "currency": DEFAULT_CURRENCY,
+            "amount": round(amount, 2),
+            "collection_date": record.get("FECHA") or "",
+            "total_quotas": 1,
+            "frequency_payment": DEFAULT_FREQUENCY,
+            "is_indefinite": False,
+        }
+
+
+def _pending_from_total(record: Dict[str, Optional[str]]) -> Optional[float]:
+    total = _to_float(record.get("TOTAL"))
+    if total is None:
+        return None
+    return total - (_to_float(record.get("A CUENTA")) or 0)
+
+
+TEMPLATES: List[SheetTemplate] = [
+    SheetTemplate("saldo", ("CLIENTE", "CELULAR", "FECHA", "SALDO"), lambda record: _to_float(record.get("SALDO"))),
+    SheetTemplate("total_a_cuenta", ("CLIENTE", "CELULAR", "FECHA", "TOTAL", "A CUENTA"), _pending_from_total),
+    SheetTemplate("total", ("CLIENTE", "CELULAR", "FECHA", "TOTAL"), _pending_from_total),
+]
+
+
+def _template_columns(header: List[str]) -> Dict[int, str]:
+    """
+    Columnas detectadas para las plantillas. Las de montos solo cuentan si la cabecera usa su nombre
+    canónico: un sinónimo podría ser otro monto (por ejemplo, un precio unitario) y se cobraría mal.
+    """
+    exact = detect_columns(header, exact=True)
+    return {
+        index: column
+        for index, column in detect_columns(header).items()
+        if column not in AMOUNT_COLUMNS or exact.get(index) == column
+    }
+
+
+def match_template(header: List[str]) -> Optional[SheetTemplate]:
+    """
+    Primera plantilla de `TEMPLATES` cuyas columnas están todas en la cabecera.
+    Desactivado por defecto (`ENTERPRISE_TEMPLATES_ENABLED`) hasta validar `build_item` contra el esquema
+    de salida del prompt empresarial.
+    """
+    if os.getenv("ENTERPRISE_TEMPLATES_ENABLED", "false").lower() != "true":
+        return None
+    columns = set(_template_columns(header).values())
+    return next((template for template in TEMPLATES if columns.issuperset(template.required)), None)
+
+
+def build_result_from_template(
+    template: SheetTemplate, header: List[str], rows: Iterable[List], user_id: str
+) -> Optional[dict]:
+    """
+    Construye en código el JSON `{"user_id", "acreetors"}` que de otro modo estructuraría la IA.
+    Las filas sin saldo pendiente se omiten. Retorna `None` si no queda ningún acreedor o si más de
+    `ENTERPRISE_TEMPLATE_MAX_SKIPPED` (fracción) de las filas no se pudo mapear: en esos casos la hoja
+    no se parece lo suficiente a la plantilla.
+    """
+    indexes = {column: index for index, column in _template_columns(header).items()}
+    acreetors = []
+    skipped = settled = 0
+    for row in rows:
+        record = {column: row[index] for column, index in indexes.items()}
+        amount = template.amount(record)
+        if amount is not None and amount <= 0:
+            settled += 1
+            continue
+        item = template.build_item(record, amount)
+        if item is None:
+            skipped += 1
+        else:
+            acreetors.append(item)
+
+    max_skipped = float(os.getenv("ENTERPRISE_TEMPLATE_MAX_SKIPPED", "0.2"))
+    if not acreetors or skipped > max_skipped * (len(acreetors) + skipped):
+        logger.info(f"Plantilla '{template.name}' descartada: {skipped} de {len(acreetors) + skipped} filas no se pudieron mapear.")
+        return None
+
+    metrics.increment(f"enterprise.template.{template.name}.sheets")
+    metrics.increment("enterprise.template.rows", len(acreetors))
+    metrics.increment("enterprise.template.skipped_rows", skipped)
+    logger.info(
+        f"Plantilla '{template.name}': {len(acreetors)} acreedores armados sin IA, "
+        f"{settled} filas sin saldo y {skipped} filas omitidas."
+    )
+    return {"user_id": user_id, "acreetors": acreetors}
@@ -1,16 +1,29 @@
 import io
+import os
 import re
+import csv
 import time
-import json
 import traceback
 import pandas as pd
+from typing import Iterator, List, Optional
 
 from src.ai.llm import get_model
 from src.ai.prompts.base import get_prompt
 from src.utils.logger import get_function_logger
+from src.utils.metrics import metrics
+from src.domain.services.enterprise_jobs import build_job_id
+from src.utils.ocr.excel_reader import iter_excel_rows
+from src.utils.ocr.excel_templates import build_result_from_template, match_template
+from src.utils.ocr.excel_normalization import block_rows, canonical_header, normalize_block
+from src.utils.ocr.json_repair import get_json_recovery_stats, join_continuation, record_outcome, repair_json
 
 logger = get_function_logger("function_app")
 
+CONTINUATION_PROMPT = (
+    "Tu respuesta anterior se cortó. Arriba está su parte final. Continúa el JSON exactamente desde el "
+    "último carácter, sin repetir lo ya escrito y sin explicaciones ni bloques de código."
+)
+
 
 def get_file_mime_type(file_info):
     """Determina el tipo MIME del archivo basándose en su contenido."""
@@ -27,86 +40,198 @@ def clean_response(content):
     return content.strip()
 
 
-def excel_date_to_str(excel_date):
-    """Convierte una fecha numérica de Excel a formato YYYY-MM-DD."""
-    try:
-        if pd.isna(excel_date) or not isinstance(excel_date, (int, float)):
-            return None
-        excel_epoch = pd.Timestamp("1900-01-01")
-        return (excel_epoch + pd.Timedelta(days=excel_date - 2)).strftime("%Y-%m-%d")
-    except Exception as e:
-        logger.warning(f"Error al convertir fecha {excel_date}: {e}")
+def _is_empty_cell(value) -> bool:
+    return value is None or value == ""
+
+
+def iter_excel_records(content: bytes) -> Iterator[List]:
+    """
+    Filas normalizadas de la primera hoja, empezando por la cabecera. Las filas se leen en bloques de
+    `EXCEL_NORMALIZE_BLOCK_ROWS` y cada bloque se normaliza por columnas con `normalize_block`, así la
+    memoria depende del tamaño del bloque y no del archivo.
+    """
+    rows = iter_excel_rows(content)
+    header = next((row for row in rows if not all(_is_empty_cell(value) for value in row)), None)
+    if header is None:
+        return
+    while _is_empty_cell(header[-1]):
+        header.pop()
+    header = ["" if _is_empty_cell(value) else str(value) for value in header]
+    yield canonical_header(header)
+
+    width = len(header)
+    size = block_rows()
+    block = []
+    for row in rows:
+        block.append((row + [None] * width)[:width])
+        if len(block) == size:
+            yield from normalize_block(header, block)
+            block = []
+    if block:
+        yield from normalize_block(header, block)
+
+
+def write_csv_chunks(records: Iterator[List], chunk_rows: int) -> List[str]:
+    """
+    Escribe las filas como CSV separado por ";" en partes de `chunk_rows` filas, cada una con la cabecera.
+    Solo se mantiene en memoria el texto de las partes, no la hoja completa.
+    """
+    header = next(records, None)
+    if header is None:
+        return []
+
+    chunks = []
+    buffer, writer, rows_in_chunk = None, None, 0
+    for record in records:
+        if rows_in_chunk == 0:
+            buffer = io.StringIO()
+            writer = csv.writer(buffer, delimiter=";", lineterminator="\n")
+            writer.writerow(header)
+        writer.writerow(record)
+        rows_in_chunk += 1
+        if rows_in_chunk == chunk_rows:
+            chunks.append(buffer.getvalue())
+            rows_in_chunk = 0
+    if rows_in_chunk:
+        chunks.append(buffer.getvalue())
+    return chunks
+
+
+def clean_user_id(user_id: str) -> str:
+    """
+    Deja solo el '+' y los dígitos del user_id.
+
+    Raises:
+        ValueError: Si el user_id no es un texto con el formato '+' seguido de números.
+    """
+    if not user_id or not isinstance(user_id, str):
+        raise ValueError("El user_id proporcionado no es válido.")
+    user_id = user_id.strip().replace("\r\n", "").replace("\n", "")
+    user_id = re.sub(r"[^+\d]", "", user_id)
+    if not user_id.startswith("+") or not user_id[1:].isdigit():
+        raise ValueError("El user_id debe comenzar con '+' seguido de números.")
+    logger.info(f"user_id después de limpieza: {user_id}")
+    return user_id
+
+
+def validate_acreetors_result(result) -> dict:
+    """
+    Verifica la estructura del JSON final que se publica en la cola de salida.
+
+    Raises:
+        ValueError: Si no es un diccionario con `user_id` y una lista `acreetors`.
+    """
+    if (
+        not isinstance(result, dict)
+        or "user_id" not in result
+        or not isinstance(result.get("acreetors"), list)
+    ):
+        logger.error("El JSON generado no cumple con la estructura esperada.")
+        raise ValueError("El JSON generado no cumple con la estructura esperada.")
+    return result
+
+
+def build_result_from_excel_template(content: bytes, user_id: str) -> Optional[dict]:
+    """
+    Si la cabecera del Excel coincide con una plantilla conocida (`match_template`), arma el JSON final en
+    código y sin llamar a la IA. Retorna `None` cuando la hoja debe ir a la IA: cabecera desconocida o
+    demasiadas filas que no encajan en la plantilla.
+    """
+    records = iter_excel_records(content)
+    header = next(records, None)
+    template = match_template(header) if header else None
+    if template is None:
+        metrics.increment("enterprise.template.fallback")
+        return None
+
+    result = build_result_from_template(template, header, records, clean_user_id(user_id))
+    if result is None:
+        metrics.increment("enterprise.template.fallback")
         return None
+    return validate_acreetors_result(result)
 
 
-def prepare_ai_task_from_excel(content: bytes, user_id: str) -> dict:
+def build_enterprise_prompt(user_id: str) -> str:
+    """
+    Descarga el prompt empresarial y reemplaza los marcadores {user_id} y {current_date}.
+
+    Raises:
+        ValueError: Si el prompt no contiene los marcadores o no se puede formatear.
     """
-    Paso 1 (RÁPIDO): Lee los bytes de un Excel, lo convierte a CSV y prepara el payload para la IA.
+    pre_prompt = get_prompt("AZURE_ENTERPRISE_OCR_PROMPT_ID")
+
+    if "{user_id}" not in pre_prompt or "{current_date}" not in pre_prompt:
+        raise ValueError(
+            "El prompt descargado no contiene los marcadores {user_id} o {current_date}."
+        )
+
+    try:
+        current_date = pd.Timestamp.now().strftime("%Y-%m-%d")
+        logger.info(
+            f"Intentando formatear el prompt con user_id: {user_id} y current_date: {current_date}"
+        )
+
+        prompt = pre_prompt.replace("{user_id}", user_id).replace(
+            "{current_date}", current_date
+        )
+        logger.info(f"Prompt final: {prompt}")
+        return prompt
+    except Exception as format_error:
+        logger.error(f"Error al formatear el prompt: {format_error}")
+        logger.error(f"Contenido de pre_prompt: {pre_prompt}")
+        logger.error(f"Contenido de user_id: {user_id}")
+        raise ValueError(
+            "Error al formatear el prompt con el user_id proporcionado."
+        ) from format_error
+
+
+def prepare_ai_tasks_from_excel(content: bytes, user_id: str) -> List[dict]:
+    """
+    Paso 1 (RÁPIDO): Lee los bytes de un Excel, lo convierte a CSV y prepara los payloads para la IA.
     Esta función NO llama a la IA. Es rápida y se puede ejecutar en el trigger inicial.
 
+    La hoja se divide en partes de `EXCEL_CHUNK_ROWS` filas, cada una con la cabecera repetida, para que
+    el worker las estructure en paralelo y una respuesta fallida solo obligue a repetir su parte.
+    Todas las partes comparten un `job_id` determinista (`build_job_id`) con el que luego se unen los
+    resultados y se reconocen las reentregas y subidas repetidas.
+
     Args:
         content: Bytes del archivo Excel.
         user_id: ID del usuario que envía el archivo, usado para personalizar el prompt.
 
     Returns:
-        Un diccionario listo para ser encolado como una tarea para la IA.
+        Una lista de diccionarios listos para ser encolados como tareas para la IA.
 
     Raises:
         ValueError: Si el archivo Excel no es válido o está vacío.
     """
     try:
-        logger.info("Leyendo archivo Excel con Pandas...")
-        df = pd.read_excel(io.BytesIO(content))
-        df.dropna(how="all", inplace=True)
+        user_id = clean_user_id(user_id)
 
-        if df.empty:
+        logger.info("Leyendo archivo Excel por filas...")
+        chunks = write_csv_chunks(
+            iter_excel_records(content), int(os.getenv("EXCEL_CHUNK_ROWS", "200"))
+        )
+        if not chunks:
             raise ValueError(
                 "La primera hoja del archivo Excel está vacía o no contiene datos."
             )
 
-        df.fillna({"TOTAL": 0, "SALDO": 0, "A CUENTA": 0}, inplace=True)
-        if "FECHA" in df.columns:
-            df["FECHA"] = df["FECHA"].apply(excel_date_to_str)
-
-        excel_as_csv = df.to_csv(index=False, sep=";", na_rep="")
-        logger.info("Archivo Excel convertido a CSV exitosamente.")
-
-        if not user_id or not isinstance(user_id, str):
-            raise ValueError("El user_id proporcionado no es válido.")
-        user_id = user_id.strip().replace("\r\n", "").replace("\n", "")
-        user_id = re.sub(r"[^+\d]", "", user_id)
-        if not user_id.startswith("+") or not user_id[1:].isdigit():
-            raise ValueError("El user_id debe comenzar con '+' seguido de números.")
-        logger.info(f"user_id después de limpieza: {user_id}")
-
-        pre_prompt = get_prompt("AZURE_ENTERPRISE_OCR_PROMPT_ID")
-
-        if "{user_id}" not in pre_prompt or "{current_date}" not in pre_prompt:
-            raise ValueError(
-                "El prompt descargado no contiene los marcadores {user_id} o {current_date}."
-            )
-
-        try:
-            current_date = pd.Timestamp.now().strftime("%Y-%m-%d")
-            logger.info(
-                f"Intentando formatear el prompt con user_id: {user_id} y current_date: {current_date}"
-            )
-
-            prompt = pre_prompt.replace("{user_id}", user_id).replace(
-                "{current_date}", current_date
-            )
-            logger.info(f"Prompt final: {prompt}")
-        except Exception as format_error:
-            logger.error(f"Error al formatear el prompt: {format_error}")
-            logger.error(f"Contenido de pre_prompt: {pre_prompt}")
-            logger.error(f"Contenido de user_id: {user_id}")
-            logger.error(f"Contenido de current_date: {current_date}")
-            raise ValueError(
-                "Error al formatear el prompt con el user_id proporcionado."
-            ) from format_error
-
-        ai_task_payload = {"prompt": prompt, "data": excel_as_csv}
-        return ai_task_payload
+        prompt = build_enterprise_prompt(user_id)
+
+        chunk_count = len(chunks)
+        job_id = build_job_id(user_id, prompt, chunks)
+        ai_task_payloads = []
+        for chunk_index, chunk_as_csv in enumerate(chunks):
+            ai_task_payloads.append({
+                "prompt": prompt,
+                "data": chunk_as_csv,
+                "job_id": job_id,
+                "chunk_index": chunk_index,
+                "chunk_count": chunk_count,
+            })
+        logger.info(f"Archivo Excel convertido a CSV en {chunk_count} partes (job {job_id}).")
+        return ai_task_payloads
 
     except Exception as e:
         logger.error(f"Error al pre-procesar el archivo Excel: {e}")
@@ -131,34 +256,14 @@ def prepare_ai_task_from_picture(content: str, user_id: str) -> dict:
         ValueError: Si el archivo Excel no es válido o está vacío.
     """
     try:
-
-        pre_prompt = get_prompt("AZURE_ENTERPRISE_OCR_PROMPT_ID")
-
-        if "{user_id}" not in pre_prompt or "{current_date}" not in pre_prompt:
-            raise ValueError(
-                "El prompt descargado no contiene los marcadores {user_id} o {current_date}."
-            )
-
-        try:
-            current_date = pd.Timestamp.now().strftime("%Y-%m-%d")
-            logger.info(
-                f"Intentando formatear el prompt con user_id: {user_id} y current_date: {current_date}"
-            )
-
-            prompt = pre_prompt.replace("{user_id}", user_id).replace(
-                "{current_date}", current_date
-            )
-            logger.info(f"Prompt final: {prompt}")
-        except Exception as format_error:
-            logger.error(f"Error al formatear el prompt: {format_error}")
-            logger.error(f"Contenido de pre_prompt: {pre_prompt}")
-            logger.error(f"Contenido de user_id: {user_id}")
-            logger.error(f"Contenido de current_date: {current_date}")
-            raise ValueError(
-                "Error al formatear el prompt con el user_id proporcionado."
-            ) from format_error
-
-        ai_task_payload = {"prompt": prompt, "data": content}
+        prompt = build_enterprise_prompt(user_id)
+        ai_task_payload = {
+            "prompt": prompt,
+            "data": content,
+            "job_id": build_job_id(user_id, prompt, [content]),
+            "chunk_index": 0,
+            "chunk_count": 1,
+        }
         return ai_task_payload
 
     except Exception as e:
@@ -168,6 +273,55 @@ def prepare_ai_task_from_picture(content: str, user_id: str) -> dict:
         ) from e
 
 
+def _continue_model_json(model, messages: list, content: str) -> str:
+    """
+    Pide al modelo que continúe una respuesta cortada. Se envía solo el final de la salida anterior
+    (`JSON_CONTINUATION_TAIL_CHARS`) junto a la tarea original, así el modelo genera únicamente lo que falta.
+    """
+    tail = content[-int(os.getenv("JSON_CONTINUATION_TAIL_CHARS", "2000")):]
+    response = model.invoke(messages + [
+        {"role": "assistant", "content": tail},
+        {"role": "user", "content": CONTINUATION_PROMPT},
+    ])
+    return join_continuation(content, response.content)
+
+
+def _parse_model_json(model, messages: list, content: str) -> dict:
+    """
+    Lee el JSON de la respuesta del modelo. Si no es válido, primero lo repara en código (bloques de
+    código, comas finales, cierres faltantes); si estaba cortado, pide la continuación
+    hasta `JSON_CONTINUATION_ATTEMPTS` veces. Solo si nada de esto funciona se lanza el error para que el
+    worker reintente la tarea completa.
+
+    Raises:
+        ValueError: Si no se pudo obtener un JSON válido con la estructura esperada.
+    """
+    result, repaired, truncated = repair_json(content)
+    outcome = "repaired" if repaired else "valid"
+    attempts = int(os.getenv("JSON_CONTINUATION_ATTEMPTS", "1"))
+    while truncated and attempts > 0:
+        logger.warning("La respuesta del modelo está cortada; se pide la continuación.")
+        attempts -= 1
+        content = _continue_model_json(model, messages, content)
+        result, _, truncated = repair_json(content)
+        outcome = "continued"
+
+    try:
+        if result is None or truncated:
+            raise ValueError("La respuesta del modelo no es un JSON válido.")
+        validate_acreetors_result(result)
+    except ValueError:
+        record_outcome("failed")
+        logger.error(f"No se pudo recuperar el JSON del modelo. Respuesta recibida:\n{content}")
+        logger.info(f"Recuperación de JSON del modelo: {get_json_recovery_stats()}")
+        raise
+
+    record_outcome(outcome)
+    if outcome != "valid":
+        logger.info(f"JSON del modelo recuperado ({outcome}). Recuperación: {get_json_recovery_stats()}")
+    return result
+
+
 def execute_ai_processing_task(ai_task_payload: dict) -> dict:
     """
     Paso 2 (LENTO): Recibe el paquete de trabajo, llama a la IA y devuelve el JSON estructurado.
@@ -180,7 +334,7 @@ def execute_ai_processing_task(ai_task_payload: dict) -> dict:
         El diccionario JSON final estructurado por la IA.
 
     Raises:
-        ValueError: Si la llamada a la IA o el parseo del JSON fallan.
+        ValueError: Si la llamada a la IA falla o su JSON no se pudo recuperar con `_parse_model_json`.
     """
     start_time = time.time()
 
@@ -205,23 +359,7 @@ def execute_ai_processing_task(ai_task_payload: dict) -> dict:
         content_response = response.content
         cleaned_content = clean_response(content_response)
 
-        try:
-            final_response = json.loads(cleaned_content)
-        except json.JSONDecodeError as json_error:
-            logger.error(
-                f"Error: La respuesta del modelo no es un JSON válido. Respuesta recibida:\n{content_response}"
-            )
-            raise ValueError(
-                "La respuesta del modelo no es un JSON válido."
-            ) from json_error
-
-        if (
-            not isinstance(final_response, dict)
-            or "user_id" not in final_response
-            or not isinstance(final_response.get("acreetors"), list)
-        ):
-            logger.error("El JSON generado no cumple con la estructura esperada.")
-            raise ValueError("El JSON generado no cumple con la estructura esperada.")
+        final_response = _parse_model_json(model, messages, cleaned_content)
 
         processing_time = time.time() - start_time
         logger.info(
@@ -229,11 +367,9 @@ def execute_ai_processing_task(ai_task_payload: dict) -> dict:
         )
         return final_response
 
-    except json.JSONDecodeError:
-        error_msg = "Error: La respuesta del modelo no es un JSON válido."
-        logger.error(error_msg)
-        logger.error(f"Respuesta recibida:\n{content_response}")
-        raise ValueError(error_msg) from None
+    except ValueError:
+        # `_parse_model_json` ya registró la respuesta que no se pudo recuperar.
+        raise
     except Exception as e:
         logger.error(f"Error inesperado durante la llamada al modelo: {e}")
         traceback.print_exc()
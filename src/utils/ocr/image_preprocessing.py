@@ -0,0 +1,97 @@
+import io
+import os
+import math
+from typing import Tuple
+
+from PIL import Image, ImageChops, ImageOps, UnidentifiedImageError
+
+from src.utils.logger import get_function_logger
+from src.utils.metrics import metrics
+
+logger = get_function_logger("function_app")
+
+
+def estimate_image_tokens(width: int, height: int) -> int:
+    """
+    Tokens de imagen estimados con el cálculo de detalle alto de los modelos de visión: la imagen se ajusta
+    a 2048x2048, luego su lado corto a 768, y se cobran 170 tokens por bloque de 512 más 85 fijos.
+    """
+    scale = min(1.0, 2048 / max(width, height))
+    width, height = width * scale, height * scale
+    scale = min(1.0, 768 / min(width, height))
+    width, height = width * scale, height * scale
+    return 85 + 170 * math.ceil(width / 512) * math.ceil(height / 512)
+
+
+def _crop_to_document(image: Image.Image) -> Image.Image:
+    """
+    Recorta el fondo uniforme alrededor del documento. El color de fondo se toma de las esquinas;
+    si el recorte dejaría menos de `OCR_IMAGE_CROP_MIN_AREA` de la imagen se conserva la original.
+    """
+    gray = image.convert("L")
+    width, height = gray.size
+    corners = [gray.getpixel((0, 0)), gray.getpixel((width - 1, 0)), gray.getpixel((0, height - 1)), gray.getpixel((width - 1, height - 1))]
+    background = sorted(corners)[len(corners) // 2]
+    diff = ImageChops.difference(gray, Image.new("L", gray.size, background))
+    mask = diff.point(lambda value: 255 if value > int(os.getenv("OCR_IMAGE_CROP_THRESHOLD", "40")) else 0)
+    box = mask.getbbox()
+    if not box:
+        return image
+    area = (box[2] - box[0]) * (box[3] - box[1])
+    if area < float(os.getenv("OCR_IMAGE_CROP_MIN_AREA", "0.3")) * width * height:
+        return image
+    margin = int(0.02 * max(width, height))
+    return image.crop((max(box[0] - margin, 0), max(box[1] - margin, 0), min(box[2] + margin, width), min(box[3] + margin, height)))
+
+
+def preprocess_image(content: bytes, mime_type: str) -> Tuple[bytes, str]:
+    """
+    Prepara la imagen para el modelo de visión: corrige la orientación EXIF, opcionalmente recorta el documento,
+    reduce el lado largo a `OCR_IMAGE_MAX_EDGE` y la vuelve a codificar como JPEG `OCR_IMAGE_JPEG_QUALITY`
+    sin metadatos. Si el resultado no es más liviano que el original, o la imagen no se puede leer,
+    retorna los bytes originales.
+
+    :return: Bytes y tipo MIME a enviar al modelo
+    """
+    if os.getenv("OCR_IMAGE_PREPROCESS_ENABLED", "false").lower() != "true":
+        return content, mime_type
+
+    try:
+        image = Image.open(io.BytesIO(content))
+        original_size = image.size
+        image = ImageOps.exif_transpose(image)
+        if image.mode in ("RGBA", "LA", "P"):
+            image = image.convert("RGBA")
+            background = Image.new("RGB", image.size, (255, 255, 255))
+            background.paste(image, mask=image.getchannel("A"))
+            image = background
+        elif image.mode != "RGB":
+            image = image.convert("RGB")
+
+        if os.getenv("OCR_IMAGE_CROP_ENABLED", "false").lower() == "true":
+            image = _crop_to_document(image)
+
+        max_edge = int(os.getenv("OCR_IMAGE_MAX_EDGE", "2048"))
+        if max(image.size) > max_edge:
+            image.thumbnail((max_edge, max_edge), Image.Resampling.LANCZOS)
+
+        output = io.BytesIO()
+        image.save(output, format="JPEG", quality=int(os.getenv("OCR_IMAGE_JPEG_QUALITY", "85")), optimize=True)
+        processed = output.getvalue()
+    except (UnidentifiedImageError, OSError, ValueError) as e:
+        logger.warning(f"No se pudo preprocesar la imagen, se envía la original: {e}")
+        return content, mime_type
+
+    if len(processed) >= len(content) and image.size == original_size:
+        return content, mime_type
+
+    bytes_saved = len(content) - len(processed)
+    tokens_saved = estimate_image_tokens(*original_size) - estimate_image_tokens(*image.size)
+    metrics.increment("ocr.preprocess.images")
+    metrics.increment("ocr.preprocess.bytes_saved", bytes_saved)
+    metrics.increment("ocr.preprocess.tokens_saved", tokens_saved)
+    logger.info(
+        f"Imagen preprocesada: {original_size[0]}x{original_size[1]} -> {image.size[0]}x{image.size[1]}, "
+        f"{len(content)} -> {len(processed)} bytes, ~{tokens_saved} tokens menos"
+    )
+    return processed, "image/jpeg"
@@ -1,18 +1,63 @@
+import os
 import imghdr
+import threading
+from typing import Optional
+
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from src.ai.prompts.base import get_prompt
 
+_media_session: Optional[requests.Session] = None
+_media_session_lock = threading.Lock()
+
+
+def get_media_session() -> requests.Session:
+    """Sesión HTTP compartida para descargar media, con pool de conexiones y reintentos acotados."""
+    global _media_session
+    if _media_session is None:
+        with _media_session_lock:
+            if _media_session is None:
+                adapter = HTTPAdapter(
+                    pool_maxsize=int(os.getenv("MEDIA_HTTP_POOL_SIZE", "10")),
+                    max_retries=Retry(
+                        total=int(os.getenv("MEDIA_HTTP_MAX_RETRIES", "2")),
+                        backoff_factor=0.3,
+                        status_forcelist=(429, 502, 503, 504),
+                        allowed_methods=frozenset({"GET"}),
+                        raise_on_status=False,
+                    ),
+                )
+                session = requests.Session()
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _media_session = session
+    return _media_session
 
-def download_image_url(url: str) -> bytes:
-    """Descarga una imagen desde una URL y retorna su contenido en bytes."""
-    response = requests.get(url, headers={"Content-Type": "application/json"})
-    if response.status_code == 200:
-        return response.content
-    else:
-        raise ValueError(
-            f"Error al descargar la imagen: {response.status_code} {response.text}"
-        )
+
+def download_image_url(url: str, max_bytes: Optional[int] = None) -> bytes:
+    """
+    Descarga un archivo desde una URL y retorna su contenido en bytes. La descarga se hace por partes
+    sobre la sesión compartida y se corta si supera `max_bytes` (por defecto `MEDIA_MAX_BYTES`).
+    Los mismos bytes se usan luego para el modelo de visión y para Document Intelligence.
+    """
+    max_bytes = max_bytes or int(os.getenv("MEDIA_MAX_BYTES", str(20 * 1024 * 1024)))
+    timeout = (float(os.getenv("MEDIA_HTTP_CONNECT_TIMEOUT", "3.05")), float(os.getenv("MEDIA_HTTP_READ_TIMEOUT", "30")))
+    with get_media_session().get(url, headers={"Content-Type": "application/json"}, stream=True, timeout=timeout) as response:
+        if response.status_code != 200:
+            raise ValueError(
+                f"Error al descargar la imagen: {response.status_code} {response.text}"
+            )
+        content_length = int(response.headers.get("Content-Length") or 0)
+        if content_length > max_bytes:
+            raise ValueError(f"El archivo supera el tamaño máximo permitido: {content_length} bytes")
+        content = bytearray()
+        for chunk in response.iter_content(chunk_size=65536):
+            content.extend(chunk)
+            if len(content) > max_bytes:
+                raise ValueError(f"El archivo supera el tamaño máximo permitido de {max_bytes} bytes")
+    return bytes(content)
 
 
 def get_image_mime_type(content) -> str:
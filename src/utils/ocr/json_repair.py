@@ -0,0 +1,108 @@
+import re
+import json
+from typing import Any, List, Optional, Tuple
+
+from src.utils.metrics import metrics
+
+CLOSERS = {"{": "}", "[": "]"}
+OUTCOMES = ("valid", "repaired", "continued", "failed")
+FENCE_PATTERN = re.compile(r"^```[\w]*\n|```\s*$", flags=re.MULTILINE)
+
+
+def strip_code_fences(text: str) -> str:
+    """Quita los bloques ``` y el texto antes del primer `{` o `[` (por ejemplo, una frase de introducción)."""
+    text = FENCE_PATTERN.sub("", text).strip()
+    start = min((index for index in (text.find("{"), text.find("[")) if index >= 0), default=0)
+    return text[start:]
+
+
+def remove_trailing_commas(text: str) -> str:
+    """Elimina las comas antes de `}` o `]` que estén fuera de los strings."""
+    output, in_string, escaped = [], False, False
+    for char in text:
+        if in_string:
+            if char == '"' and not escaped:
+                in_string = False
+            escaped = char == "\\" and not escaped
+        elif char == '"':
+            in_string = True
+        elif char in "}]":
+            while output and output[-1].isspace():
+                output.pop()
+            if output and output[-1] == ",":
+                output.pop()
+        output.append(char)
+    return "".join(output)
+
+
+def close_truncated(text: str) -> Tuple[str, bool]:
+    """
+    Cierra un JSON cortado: retrocede hasta el último objeto o lista completo dentro de la estructura y
+    agrega los cierres que faltan. Retorna el texto cerrado y si la respuesta estaba cortada. Cualquier
+    estructura sin cerrar cuenta como cortada, aunque termine justo después de un elemento completo: el
+    modelo pudo haber dejado elementos sin escribir y no hay forma de saberlo desde el texto.
+    """
+    stack: List[str] = []
+    in_string, escaped = False, False
+    cut, cut_stack = 0, []
+    for index, char in enumerate(text):
+        if in_string:
+            if char == '"' and not escaped:
+                in_string = False
+            escaped = char == "\\" and not escaped
+        elif char == '"':
+            in_string = True
+        elif char in CLOSERS:
+            stack.append(CLOSERS[char])
+        elif char in "}]" and stack:
+            stack.pop()
+            cut, cut_stack = index + 1, list(stack)
+    if not stack and not in_string:
+        return text, False
+    return text[:cut] + "".join(reversed(cut_stack)), True
+
+
+def repair_json(text: str) -> Tuple[Optional[Any], bool, bool]:
+    """
+    Intenta leer la respuesta del modelo quitando bloques de código, comas finales y cerrando estructuras
+    cortadas. Retorna el JSON (o `None` si no se pudo leer), si hizo falta reparar y si la respuesta estaba
+    cortada, caso en el que el JSON retornado puede estar incompleto.
+    """
+    try:
+        return json.loads(text), False, False
+    except json.JSONDecodeError:
+        pass
+
+    candidate = remove_trailing_commas(strip_code_fences(text))
+    closed, truncated = close_truncated(candidate)
+    for attempt in (candidate, closed):
+        try:
+            return json.loads(attempt), True, attempt is closed and truncated
+        except json.JSONDecodeError:
+            continue
+    return None, True, truncated
+
+
+def join_continuation(previous: str, continuation: str, min_overlap: int = 20, max_overlap: int = 500) -> str:
+    """
+    Une la continuación al texto previo sin duplicar el fragmento final si el modelo lo repitió. Solo se
+    considera repetición un solape de al menos `min_overlap` caracteres; uno menor puede ser casual.
+    """
+    continuation = FENCE_PATTERN.sub("", continuation)
+    for size in range(min(max_overlap, len(previous), len(continuation)), min_overlap - 1, -1):
+        if previous.endswith(continuation[:size]):
+            return previous + continuation[size:]
+    return previous + continuation
+
+
+def record_outcome(outcome: str):
+    metrics.increment(f"worker.ai.json.{outcome}")
+
+
+def get_json_recovery_stats() -> dict:
+    """Respuestas del modelo por resultado (válidas, reparadas, continuadas, fallidas) y tasa de recuperación."""
+    counters = metrics.snapshot("worker.ai.json.")["counters"]
+    stats = {outcome: counters.get(f"worker.ai.json.{outcome}", 0) for outcome in OUTCOMES}
+    invalid = stats["repaired"] + stats["continued"] + stats["failed"]
+    stats["recovery_rate"] = (stats["repaired"] + stats["continued"]) / invalid if invalid else 0.0
+    return stats
@@ -6,12 +6,26 @@ import time
 import base64
 import logging
 import traceback
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
+
+from redis.exceptions import RedisError
 
 from src.ai.llm import get_model_for_image
 from src.utils.logger import get_function_logger
+from src.utils.metrics import metrics
 from src.utils.ocr.doc_int import analyze_invoice, analyze_receipt
-from src.domain.services.service_bus import send_message_to_queue
-from src.utils.ocr.files_utils import get_file_mime_type, prepare_ai_task_from_excel, prepare_ai_task_from_picture
+from src.utils.ocr.ocr_cache import OcrCache, get_ocr_cache_stats
+from src.utils.ocr.image_preprocessing import preprocess_image
+from src.domain.services.service_bus import send_message_to_queue, send_messages_to_queue
+from src.domain.services.claim_check import check_in
+from src.domain.services.enterprise_jobs import FAILED_STATE, EnterpriseJobService, build_job_id
+from src.utils.ocr.files_utils import (
+    build_result_from_excel_template,
+    get_file_mime_type,
+    prepare_ai_tasks_from_excel,
+    prepare_ai_task_from_picture,
+)
 from src.utils.ocr.image_utils import (
     download_image_url,
     get_image_mime_type,
@@ -20,7 +34,48 @@ from src.utils.ocr.image_utils import (
 
 logger = get_function_logger("function_app")
 
-def get_text_from_image(content, prompt=str, media_url='', session_id='', invoke_id=''):
+_speculative_executor = ThreadPoolExecutor(max_workers=int(os.getenv("OCR_SPECULATIVE_WORKERS", "4")))
+
+
+def _timed_receipt_analysis(content, session_id='', invoke_id=''):
+    start_time = time.perf_counter()
+    result = analyze_receipt(content, session_id, invoke_id)
+    return result, time.perf_counter() - start_time
+
+
+def _start_speculative_receipt(content, session_id='', invoke_id='') -> Optional[Future]:
+    """
+    Con `OCR_SPECULATIVE_RECEIPT_ENABLED`, lanza el análisis de recibo en paralelo a la llamada de visión
+    para no pagar ambas latencias en serie cuando la imagen resulta ser un recibo.
+    """
+    if os.getenv("OCR_SPECULATIVE_RECEIPT_ENABLED", "false").lower() != "true":
+        return None
+    metrics.increment("ocr.speculative_receipt.started")
+    return _speculative_executor.submit(_timed_receipt_analysis, content, session_id, invoke_id)
+
+
+def _discard_speculative_receipt(future: Optional[Future]):
+    """Descarta el análisis especulativo; si ya estaba en curso cuenta como una llamada desperdiciada."""
+    if future is None:
+        return
+    if future.cancel():
+        metrics.increment("ocr.speculative_receipt.cancelled")
+    else:
+        metrics.increment("ocr.speculative_receipt.wasted")
+
+
+def _resolve_receipt(future: Optional[Future], vision_seconds: float, content, session_id='', invoke_id='') -> dict:
+    """Usa el análisis especulativo si existe; si no, analiza el recibo en serie."""
+    if future is None:
+        return analyze_receipt(content, session_id, invoke_id)
+    result, receipt_seconds = future.result()
+    metrics.increment("ocr.speculative_receipt.used")
+    # Lo ahorrado es la parte del análisis que corrió mientras se esperaba al modelo de visión.
+    metrics.observe("ocr.speculative_receipt.saved_seconds", min(vision_seconds, receipt_seconds))
+    return result
+
+
+def get_text_from_image(content, prompt=str, session_id='', invoke_id=''):
     """
     Extrae texto de una imagen usando el modelo de OCR y el prompt definido.
 
@@ -39,8 +94,16 @@ def get_text_from_image(content, prompt=str, media_url='', session_id='', invoke
         logging.error(f"Session ID: {session_id} - Invoke ID: {invoke_id} - Formato de imagen no soportado")
         return False, "Formato de imagen no soportado. Por favor, envía una imagen JPG o PNG."
 
+    ocr_cache = OcrCache()
+    cache_key = ocr_cache.build_key("image", content, prompt)
+    cached_response = ocr_cache.get(cache_key)
+    if cached_response is not None:
+        logging.info(f"Session ID: {session_id} - Invoke ID: {invoke_id} - Resultado de OCR obtenido de caché. Estadísticas: {get_ocr_cache_stats()}")
+        return True, cached_response
+
+    image_content, mime_type = preprocess_image(content, mime_type)
     try:
-        base64_image = base64.b64encode(content).decode("utf-8")
+        base64_image = base64.b64encode(image_content).decode("utf-8")
     except Exception as e:
         logging.error(f"Session ID: {session_id} - Invoke ID: {invoke_id} - Error al codificar imagen: {str(e)}")
         return False, "Error al procesar la imagen. Por favor, verifica el contenido."
@@ -59,8 +122,12 @@ def get_text_from_image(content, prompt=str, media_url='', session_id='', invoke
     ]
 
     model = get_model_for_image()
+    speculative_receipt = _start_speculative_receipt(content, session_id, invoke_id)
+    speculative_used = False
     try:
+        vision_start = time.perf_counter()
         response = model.invoke(messages)
+        vision_seconds = time.perf_counter() - vision_start
         content_response = response.content
         cleaned_content = clean_response(content_response)
         logging.info(f"Session ID: {session_id} - Invoke ID: {invoke_id} - Output OCR: {cleaned_content}")
@@ -72,9 +139,15 @@ def get_text_from_image(content, prompt=str, media_url='', session_id='', invoke
             logging.error(f"Session ID: {session_id} - Invoke ID: {invoke_id} - Error parsing response: {str(ve)}")
             return False, "Error al interpretar la respuesta del modelo. Por favor, verifica el contenido."
         
+        calls = {"vision": 1}
         if final_response.get('isReceipt', False) and final_response.get('success', False):
             logging.info(f"Session ID: {session_id} - Invoke ID: {invoke_id} - Processing with Doc Intelligence")
-            final_response = analyze_receipt(media_url, session_id, invoke_id)
+            speculative_used = True
+            final_response = _resolve_receipt(speculative_receipt, vision_seconds, content, session_id, invoke_id)
+            calls["doc_int"] = 1
+
+        if final_response.get('success', False):
+            ocr_cache.set(cache_key, final_response, calls)
 
         logging.info(f"Session ID: {session_id} - Invoke ID: {invoke_id} - Procesamiento completado en {time.time() - start_time:.2f} segundos")
         return True, final_response
@@ -89,12 +162,97 @@ def get_text_from_image(content, prompt=str, media_url='', session_id='', invoke
         logging.error(f"Error inesperado al procesar imagen: {str(e)}")
         traceback.print_exc()
         return False, "Hubo un error al procesar la imagen, por favor intenta de nuevo."
+    finally:
+        if not speculative_used:
+            _discard_speculative_receipt(speculative_receipt)
 
 def clean_response(content):
     """Limpia la respuesta eliminando backticks y bloques de código."""
     content = re.sub(r'^```[\w]*\n|```$', '', content, flags=re.MULTILINE)
     return content.strip()
 
+def _publish_stored_result(jobs: EnterpriseJobService, job_id: str) -> bool:
+    """
+    Si el job ya se completó (subida repetida del mismo contenido), publica su resultado guardado en la
+    cola final sin encolar tareas para la IA. Un error de Redis no bloquea el procesamiento normal.
+    """
+    try:
+        stored_result = jobs.get_job_result(job_id)
+    except RedisError as e:
+        logger.warning(f"No se pudo consultar el resultado del job {job_id}: {e}")
+        return False
+    if stored_result is None:
+        return False
+
+    metrics.increment("enterprise.jobs.reused")
+    logger.info(f"Job {job_id} ya procesado; se publica el resultado guardado.")
+    send_message_to_queue(stored_result, os.getenv("AZURE_SERVICE_BUS_MA_FINAL_STEP_QUEUE"))
+    return True
+
+
+def _enqueue_enterprise_job(ai_task_payloads: list, user_id, source: str, start_time: float) -> str:
+    """
+    Encola las tareas de IA de un archivo empresarial (o publica el resultado guardado si ya se procesó)
+    y crea su registro de estado con el tiempo transcurrido desde la descarga. Si el mismo contenido ya
+    está en curso no encola nada. Retorna el `job_id`.
+    """
+    job_id = ai_task_payloads[0]["job_id"]
+    jobs = EnterpriseJobService()
+    try:
+        in_progress = jobs.is_in_progress(job_id)
+    except RedisError as e:
+        logger.warning(f"No se pudo consultar el estado del job {job_id}: {e}")
+        in_progress = False
+    if in_progress:
+        metrics.increment("enterprise.jobs.in_progress")
+        logger.info(f"Job {job_id} ya está en curso; no se vuelven a encolar sus partes.")
+        return job_id
+    if _publish_stored_result(jobs, job_id):
+        jobs.start_job(job_id, user_id, len(ai_task_payloads), source, time.perf_counter() - start_time)
+        jobs.mark_published(job_id)
+        return job_id
+
+    # El registro se crea antes de encolar: el worker puede empezar a actualizarlo apenas llega el mensaje.
+    jobs.start_job(job_id, user_id, len(ai_task_payloads), source, time.perf_counter() - start_time)
+    enqueue_start = time.perf_counter()
+    try:
+        send_messages_to_queue(
+            [check_in(ai_task_payload) for ai_task_payload in ai_task_payloads],
+            os.getenv("AZURE_SERVICE_BUS_MA_FIRST_STEP_QUEUE"),
+        )
+    except Exception as e:
+        jobs.update_status(job_id, FAILED_STATE, "enqueue", time.perf_counter() - enqueue_start, error=f"No se pudo encolar: {e}")
+        raise
+    jobs.update_status(job_id, stage="enqueue", seconds=time.perf_counter() - enqueue_start)
+    return job_id
+
+
+def _publish_template_result(result: dict, job_id: str, user_id, start_time: float) -> str:
+    """
+    Publica el resultado armado con una plantilla pasando por los mismos pasos que un job de la IA: registro
+    de estado, resultado guardado y marca de publicación. Una subida repetida del mismo archivo ya publicado
+    no vuelve a publicarse. Retorna el `job_id`.
+    """
+    jobs = EnterpriseJobService()
+    owner = jobs.acquire_publish_lease(job_id)
+    if owner is None:
+        metrics.increment("enterprise.template.duplicated")
+        logger.info(f"Job {job_id} de plantilla ya publicado o en publicación; no se vuelve a publicar.")
+        return job_id
+
+    jobs.start_job(job_id, user_id, 1, "excel_template", time.perf_counter() - start_time)
+    merged = jobs.save_chunk_result(job_id, 0, 1, result)
+    publish_start = time.perf_counter()
+    try:
+        send_message_to_queue(merged, os.getenv("AZURE_SERVICE_BUS_MA_FINAL_STEP_QUEUE"))
+    except Exception as e:
+        jobs.release_publish_lease(job_id, owner)
+        jobs.update_status(job_id, FAILED_STATE, "publish", time.perf_counter() - publish_start, error=f"No se pudo publicar: {e}")
+        raise
+    jobs.mark_published(job_id, time.perf_counter() - publish_start)
+    return job_id
+
+
 def process_image_ocr(media_url, caption=None, session_id='', invoke_id=''):
     """
     Descarga la imagen desde la URL y realiza el procesamiento OCR.
@@ -111,7 +269,7 @@ def process_image_ocr(media_url, caption=None, session_id='', invoke_id=''):
             session_id=session_id,
             invoke_id=invoke_id,
         )
-        _, body = get_text_from_image(image_content, prompt, media_url, session_id, invoke_id)
+        _, body = get_text_from_image(image_content, prompt, session_id, invoke_id)
         if body.get("success", False) and caption:
                 body["message"] = f"{caption} {body['message']}"
         return body
@@ -127,6 +285,7 @@ def process_enterprise_image_ocr(media_url, user_id=None, session_id="", invoke_
     Esta función es específica para usuarios de tipo enterprise.
     """
     try:
+        start_time = time.perf_counter()
         image_content = download_image_url(media_url)
         mime_type = get_image_mime_type(image_content)
         if not mime_type:
@@ -137,7 +296,15 @@ def process_enterprise_image_ocr(media_url, user_id=None, session_id="", invoke_
                 "image": {},
             }
 
-        invoice_summary = analyze_invoice(media_url, session_id, invoke_id)
+        ocr_cache = OcrCache()
+        cache_key = ocr_cache.build_key("invoice", image_content, "prebuilt-invoice")
+        invoice_summary = ocr_cache.get(cache_key)
+        if invoice_summary is None:
+            invoice_summary = analyze_invoice(image_content, session_id, invoke_id)
+            if invoice_summary.get("success"):
+                ocr_cache.set(cache_key, invoice_summary, {"doc_int": 1})
+        else:
+            logger.info(f"Session ID: {session_id} - Invoke ID: {invoke_id} - Factura obtenida de caché. Estadísticas: {get_ocr_cache_stats()}")
 
         if not invoice_summary.get("success"):
             return {
@@ -150,14 +317,13 @@ def process_enterprise_image_ocr(media_url, user_id=None, session_id="", invoke_
 
         ai_task_payload = prepare_ai_task_from_picture(ocr_context, user_id)
 
-        send_message_to_queue(
-            ai_task_payload, os.getenv("AZURE_SERVICE_BUS_MA_FIRST_STEP_QUEUE")
-        )
+        job_id = _enqueue_enterprise_job([ai_task_payload], user_id, "image", start_time)
 
         return {
             "success": True,
             "message": "El archivo ha sido recibido correctamente y el procesamiento de los datos ya está en curso.\nEstoy aqui para ayudarte. ¿Tienes alguna consulta? ¡Escribeme!",
             "file": {},
+            "job_id": job_id,
         }
 
     except Exception as e:
@@ -176,6 +342,7 @@ def process_enterprise_file_ocr(media_url, original_mime_type=None, user_id=None
     Devuelve un diccionario con el resultado y el texto extraído.
     """
     try:
+        start_time = time.perf_counter()
         file_content = download_image_url(media_url)
         mime_type = get_file_mime_type(original_mime_type)
         if not mime_type:
@@ -186,16 +353,19 @@ def process_enterprise_file_ocr(media_url, original_mime_type=None, user_id=None
                 "file": {},
             }
 
-        ai_task_payload = prepare_ai_task_from_excel(file_content, user_id)
-
-        send_message_to_queue(
-            ai_task_payload, os.getenv("AZURE_SERVICE_BUS_MA_FIRST_STEP_QUEUE")
-        )
+        template_result = build_result_from_excel_template(file_content, user_id)
+        if template_result is not None:
+            template_job_id = build_job_id(user_id, "excel_template", [file_content])
+            job_id = _publish_template_result(template_result, template_job_id, user_id, start_time)
+        else:
+            ai_task_payloads = prepare_ai_tasks_from_excel(file_content, user_id)
+            job_id = _enqueue_enterprise_job(ai_task_payloads, user_id, "excel", start_time)
 
         return {
             "success": True,
             "message": "El archivo ha sido recibido correctamente y el procesamiento de los datos ya está en curso.\nEstoy aqui para ayudarte. ¿Tienes alguna consulta? ¡Escribeme!",
             "file": {},
+            "job_id": job_id,
         }
 
     except Exception as e:
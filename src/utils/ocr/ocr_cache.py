@@ -0,0 +1,78 @@
+import os
+import json
+from typing import Optional
+
+import redis
+import xxhash
+
+from src.utils.logger import get_function_logger
+from src.utils.metrics import metrics
+
+logger = get_function_logger("function_app")
+
+
+class OcrCache:
+    """
+    Caché en Redis de resultados de OCR por contenido: la llave combina el xxhash de los bytes de la imagen
+    con el hash del prompt (o del modelo de Document Intelligence), de modo que un cambio de prompt invalida
+    lo guardado. Solo se guardan resultados exitosos. Los errores de Redis no interrumpen el OCR.
+    """
+
+    def __init__(self):
+        self.enabled = os.getenv("OCR_CACHE_ENABLED", "true").lower() == "true"
+        self.ttl = int(os.getenv("OCR_CACHE_TTL", "604800"))
+        self.version = os.getenv("OCR_CACHE_VERSION", "1")
+        self.redis_prefix = "ocr_cache"
+        self.redis_client = redis.from_url(os.getenv("REDIS_INDIBOT"), decode_responses=True) if self.enabled else None
+
+    def build_key(self, kind: str, content: bytes, prompt: str = "") -> str:
+        prompt_hash = xxhash.xxh3_64_hexdigest(f"{self.version}:{prompt}".encode("utf-8"))
+        return f"{self.redis_prefix}:{kind}:{prompt_hash}:{xxhash.xxh3_128_hexdigest(content)}"
+
+    def get(self, key: str) -> Optional[dict]:
+        """Retorna el resultado guardado y registra las llamadas a modelos que se evitaron."""
+        if not self.enabled:
+            return None
+        kind = key.split(":")[1]
+        try:
+            raw = self.redis_client.get(key)
+        except redis.RedisError as e:
+            logger.warning(f"No se pudo leer la caché de OCR: {e}")
+            return None
+        if not raw:
+            metrics.increment(f"ocr.cache.{kind}.misses")
+            return None
+        entry = json.loads(raw)
+        metrics.increment(f"ocr.cache.{kind}.hits")
+        for engine, calls in entry.get("calls", {}).items():
+            metrics.increment(f"ocr.cache.saved_calls.{engine}", calls)
+        return entry["result"]
+
+    def set(self, key: str, result: dict, calls: dict):
+        """
+        :param calls: Llamadas a modelos que costó obtener el resultado, p. ej. `{"vision": 1, "doc_int": 1}`
+        """
+        if not self.enabled:
+            return
+        try:
+            self.redis_client.set(key, json.dumps({"result": result, "calls": calls}), ex=self.ttl)
+        except (redis.RedisError, TypeError) as e:
+            logger.warning(f"No se pudo guardar el resultado en la caché de OCR: {e}")
+
+
+def get_ocr_cache_stats() -> dict:
+    """Hit rate por tipo de OCR y llamadas a modelos evitadas desde que inició el proceso."""
+    counters = metrics.snapshot("ocr.cache.")["counters"]
+    stats = {"saved_calls": {}}
+    for name, value in counters.items():
+        parts = name.split(".")
+        if parts[2] == "saved_calls":
+            stats["saved_calls"][parts[3]] = value
+            continue
+        kind_stats = stats.setdefault(parts[2], {"hits": 0, "misses": 0})
+        kind_stats[parts[3]] = value
+    for kind, kind_stats in stats.items():
+        if kind != "saved_calls":
+            total = kind_stats["hits"] + kind_stats["misses"]
+            kind_stats["hit_rate"] = kind_stats["hits"] / total if total else 0.0
+    return stats
@@ -0,0 +1,89 @@
+import json
+import codecs
+from typing import Any, Iterable, Iterator, List
+
+_WHITESPACE = " \t\n\r"
+_SCALAR_END = _WHITESPACE + ",]"
+
+
+class _JsonArrayDecoder:
+    """Decodificador incremental de los elementos de un arreglo JSON de primer nivel."""
+
+    def __init__(self):
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.started = False
+        self.finished = False
+
+    def feed(self, text: str, final: bool = False) -> List[Any]:
+        self.buffer += text
+        items = []
+        pos = 0
+        while not self.finished:
+            while pos < len(self.buffer) and self.buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos >= len(self.buffer):
+                break
+            if not self.started:
+                if self.buffer.startswith("null", pos):
+                    self.finished = True
+                    break
+                if not final and "null".startswith(self.buffer[pos:]):
+                    # Podría ser un `null` partido entre fragmentos.
+                    break
+                if self.buffer[pos] != "[":
+                    raise ValueError("Expected a JSON array")
+                self.started = True
+                pos += 1
+            elif self.buffer[pos] == ",":
+                pos += 1
+            elif self.buffer[pos] == "]":
+                self.finished = True
+                pos += 1
+            else:
+                try:
+                    item, end = self.decoder.raw_decode(self.buffer, pos)
+                except json.JSONDecodeError:
+                    if final:
+                        raise ValueError("Truncated or invalid JSON array")
+                    # Elemento incompleto: se espera al siguiente fragmento.
+                    break
+                if not final and not isinstance(item, (dict, list, str)) and (
+                    end == len(self.buffer) or self.buffer[end] not in _SCALAR_END
+                ):
+                    # Un número o literal solo está completo si lo sigue un separador: "2" de "22" o "1" de
+                    # "1.5" pueden continuar en el siguiente fragmento.
+                    break
+                items.append(item)
+                pos = end
+        self.buffer = self.buffer[pos:]
+        if final and self.started and not self.finished:
+            raise ValueError("Truncated JSON array")
+        return items
+
+
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator[Any]:
+    """
+    Decodifica de forma incremental un arreglo JSON de primer nivel y entrega sus elementos uno a uno,
+    sin cargar el cuerpo completo en memoria. Un cuerpo vacío o `null` se trata como un arreglo vacío.
+
+    :param chunks: Fragmentos en bytes del cuerpo, por ejemplo `response.iter_content(chunk_size)`
+    :raises ValueError: Si el cuerpo no es un arreglo JSON o está truncado
+    """
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    array_decoder = _JsonArrayDecoder()
+    for chunk in chunks:
+        yield from array_decoder.feed(utf8.decode(chunk))
+    yield from array_decoder.feed(utf8.decode(b"", final=True), final=True)
+
+
+def iter_batches(items: Iterable[Any], batch_size: int) -> Iterator[List[Any]]:
+    """Agrupa un iterable en listas de hasta `batch_size` elementos."""
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
@@ -24,6 +24,9 @@ class StorageAzure:
         else:
             blob_client.upload_blob(img_byte_arr, overwrite=True)
 
+    def download(self, filename):
+        return self.container_client.download_blob(filename).readall()
+
     def get_and_apply_files(self, map_function, max_files=None, filter_name=None):
         blob_list = self.container_client.list_blobs()
         n = 0
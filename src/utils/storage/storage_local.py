@@ -0,0 +1,19 @@
+import os
+
+
+class StorageLocal:
+    """Almacenamiento en una carpeta local con la misma interfaz de `upload`/`download` que `StorageAzure`."""
+
+    def __init__(self, base_dir):
+        self.base_dir = base_dir
+        os.makedirs(base_dir, exist_ok=True)
+
+    def upload(self, filename, img_byte_arr, type="image"):
+        path = os.path.join(self.base_dir, filename)
+        with open(path + ".tmp", "wb") as file:
+            file.write(img_byte_arr)
+        os.replace(path + ".tmp", path)
+
+    def download(self, filename):
+        with open(os.path.join(self.base_dir, filename), "rb") as file:
+            return file.read()
@@ -0,0 +1,52 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from src.domain.services.claim_check import check_in, check_out
+
+
+class ClaimCheckTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        patcher = mock.patch.dict(os.environ, {
+            "CLAIM_CHECK_BACKEND": "local",
+            "CLAIM_CHECK_LOCAL_DIR": self.directory,
+            "CLAIM_CHECK_THRESHOLD_BYTES": "100",
+        })
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_small_payload_is_sent_as_is(self):
+        payload = {"job_id": "job-1", "data": "corto"}
+        self.assertIs(check_in(payload), payload)
+        self.assertIs(check_out(payload), payload)
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_large_payload_round_trip(self):
+        payload = {"job_id": "job-1", "chunk_index": 0, "data": "fila;" * 100}
+        message = check_in(payload)
+
+        self.assertEqual(set(message), {"claim_check", "job_id"})
+        self.assertEqual(message["job_id"], "job-1")
+        self.assertEqual(os.listdir(self.directory), [message["claim_check"]["blob"]])
+        self.assertEqual(check_out(message), payload)
+
+    def test_same_payload_reuses_the_blob(self):
+        payload = {"data": "fila;" * 100}
+        self.assertEqual(check_in(payload), check_in(payload))
+        self.assertNotIn("job_id", check_in(payload))
+        self.assertEqual(len(os.listdir(self.directory)), 1)
+
+    def test_tampered_payload_is_rejected(self):
+        message = check_in({"data": "fila;" * 100})
+        with open(os.path.join(self.directory, message["claim_check"]["blob"]), "wb") as file:
+            file.write(b'{"data": "otro"}')
+        with self.assertRaises(ValueError):
+            check_out(message)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import unittest
+from unittest import mock
+
+import fakeredis
+
+from src.domain.services.enterprise_jobs import EnterpriseJobService, build_job_id
+
+
+class BuildJobIdTest(unittest.TestCase):
+    def test_deterministic_and_sensitive_to_every_part(self):
+        job_id = build_job_id("51999", "excel", ["a", b"b"])
+        self.assertEqual(job_id, build_job_id("51999", "excel", ["a", b"b"]))
+        self.assertNotEqual(job_id, build_job_id("51999", "excel", ["ab"]))
+        self.assertNotEqual(job_id, build_job_id("51999", "ocr", ["a", b"b"]))
+
+
+class EnterpriseJobServiceTest(unittest.TestCase):
+    def setUp(self):
+        server = fakeredis.FakeServer()
+        patcher = mock.patch("redis.from_url", lambda *args, **kwargs: fakeredis.FakeRedis(server=server, decode_responses=True))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.jobs = EnterpriseJobService()
+        self.jobs.start_job("job-1", "51999", 2, "excel", 0.1)
+
+    @staticmethod
+    def part(*names):
+        return {"user_id": "51999", "acreetors": [{"name": name} for name in names]}
+
+    def test_merge_keeps_part_order(self):
+        merged = EnterpriseJobService.merge_results([self.part("Ana"), {"user_id": "otro"}, self.part("Luis", "Eva")])
+        self.assertEqual(merged["user_id"], "51999")
+        self.assertEqual([item["name"] for item in merged["acreetors"]], ["Ana", "Luis", "Eva"])
+
+    def test_merged_only_when_all_parts_are_in(self):
+        self.assertIsNone(self.jobs.save_chunk_result("job-1", 1, 2, self.part("Luis")))
+        # Una reentrega de la misma parte no cuenta como otra parte.
+        self.assertIsNone(self.jobs.save_chunk_result("job-1", 1, 2, self.part("Luis")))
+        merged = self.jobs.save_chunk_result("job-1", 0, 2, self.part("Ana"))
+
+        self.assertEqual([item["name"] for item in merged["acreetors"]], ["Ana", "Luis"])
+        self.assertEqual(self.jobs.get_job_result("job-1"), merged)
+        self.assertEqual(self.jobs.get_chunk_result("job-1", 1), self.part("Luis"))
+        self.assertEqual(self.jobs.get_status("job-1")["state"], "structuring")
+
+    def test_published_job_is_not_merged_or_published_again(self):
+        self.jobs.save_chunk_result("job-1", 0, 2, self.part("Ana"))
+        self.jobs.save_chunk_result("job-1", 1, 2, self.part("Luis"))
+        self.jobs.mark_published("job-1")
+
+        self.assertIsNone(self.jobs.save_chunk_result("job-1", 1, 2, self.part("Luis")))
+        self.assertIsNone(self.jobs.acquire_publish_lease("job-1"))
+
+    def test_lease_is_exclusive_and_released_only_by_its_owner(self):
+        owner = self.jobs.acquire_publish_lease("job-1")
+        self.assertIsNotNone(owner)
+        self.assertIsNone(self.jobs.acquire_publish_lease("job-1"))
+
+        self.jobs.release_publish_lease("job-1", "otro-dueño")
+        self.assertIsNone(self.jobs.acquire_publish_lease("job-1"))
+
+        self.jobs.release_publish_lease("job-1", owner)
+        self.assertIsNotNone(self.jobs.acquire_publish_lease("job-1"))
+
+    def test_lease_expires(self):
+        self.assertIsNotNone(self.jobs.acquire_publish_lease("job-1"))
+        self.jobs.redis_client.expire("enterprise_job:job-1:lease", 0)
+        self.assertIsNotNone(self.jobs.acquire_publish_lease("job-1"))
+
+    def test_states_only_move_forward(self):
+        self.jobs.update_status("job-1", "processing")
+        self.assertTrue(self.jobs.is_in_progress("job-1"))
+        self.jobs.mark_published("job-1")
+        self.jobs.update_status("job-1", "processing")
+        self.jobs.update_status("job-1", "failed", error="tarde")
+
+        status = self.jobs.get_status("job-1")
+        self.assertEqual(status["state"], "published")
+        self.assertIsNone(status["error"])
+        self.assertFalse(self.jobs.is_in_progress("job-1"))
+
+    def test_failed_job_stays_failed(self):
+        self.jobs.update_status("job-1", "failed", error="Parte 0: sin respuesta")
+        self.jobs.update_status("job-1", "processing")
+
+        status = self.jobs.get_status("job-1")
+        self.assertEqual((status["state"], status["error"]), ("failed", "Parte 0: sin respuesta"))
+        self.assertFalse(self.jobs.is_in_progress("job-1"))
+
+    def test_stage_seconds_accumulate(self):
+        self.jobs.update_status("job-1", stage="ai", seconds=1.5)
+        self.jobs.update_status("job-1", stage="ai", seconds=2.0)
+        self.assertEqual(self.jobs.get_status("job-1")["stages"]["ai"], 3.5)
+
+    def test_user_history_lists_latest_first(self):
+        self.jobs.start_job("job-2", "51999", 1, "excel", 0.1)
+        self.jobs.start_job("job-1", "51999", 2, "excel", 0.1)
+        self.assertEqual([status["job_id"] for status in self.jobs.list_user_jobs("51999")], ["job-1", "job-2"])
+
+
+if __name__ == "__main__":
+    unittest.main()
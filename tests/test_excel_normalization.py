@@ -0,0 +1,71 @@
+import datetime
+import unittest
+
+import pyarrow as pa
+
+from src.utils.ocr.excel_normalization import canonical_header, detect_columns, normalize_amounts, normalize_block, normalize_dates
+
+
+class DetectColumnsTest(unittest.TestCase):
+    def test_synonyms_ignore_case_accents_and_signs(self):
+        header = ["Nombre del Cliente", "Teléfono", "Fecha de Emisión", "Importe", "A-Cuenta", "Deuda"]
+        self.assertEqual(
+            detect_columns(header),
+            {0: "CLIENTE", 1: "CELULAR", 2: "FECHA", 3: "TOTAL", 4: "A CUENTA", 5: "SALDO"},
+        )
+
+    def test_canonical_name_wins_over_synonym(self):
+        self.assertEqual(detect_columns(["Monto", "Total"]), {1: "TOTAL"})
+
+    def test_first_column_wins_and_unknown_are_ignored(self):
+        self.assertEqual(detect_columns(["Cliente", "Clientes", "Observaciones"]), {0: "CLIENTE"})
+
+    def test_exact_only_uses_canonical_names(self):
+        self.assertEqual(detect_columns(["Monto", "saldo"], exact=True), {1: "SALDO"})
+
+    def test_canonical_header(self):
+        self.assertEqual(canonical_header(["Importe", "Notas"]), ["TOTAL", "Notas"])
+
+
+class NormalizeAmountsTest(unittest.TestCase):
+    def test_formats(self):
+        values = ["S/ 1,200.50", "1.200,50", "1,5", "1,200", "(25)", "abc", None]
+        self.assertEqual(
+            normalize_amounts(pa.array(values)).to_pylist(),
+            ["1200.5", "1200.5", "1.5", "1200", "-25", "abc", "0"],
+        )
+
+    def test_large_and_small_values_are_positional(self):
+        values = ["100000000000000000000", "0.00001", "1000000000000000"]
+        self.assertEqual(normalize_amounts(pa.array(values)).to_pylist(), values)
+
+
+class NormalizeDatesTest(unittest.TestCase):
+    def test_serials_and_strings(self):
+        values = ["45292", "05/01/24", "2024-01-05 00:00:00", "5.1.2024", "100", "pronto", None]
+        self.assertEqual(
+            normalize_dates(pa.array(values)).to_pylist(),
+            ["2024-01-01", "2024-01-05", "2024-01-05", "2024-01-05", "100", "pronto", None],
+        )
+
+
+class NormalizeBlockTest(unittest.TestCase):
+    def test_block(self):
+        header = ["Cliente", "Fecha", "Monto", "Celular"]
+        rows = [
+            [" Ana ", datetime.datetime(2024, 1, 5), 1e20, 987654321],
+            [None, None, "", "  "],
+            ["Luis", 45292, "S/ 50", None],
+        ]
+        self.assertEqual(normalize_block(header, rows), [
+            ["Ana", "2024-01-05", "100000000000000000000", "987654321"],
+            ["Luis", "2024-01-01", "50", None],
+        ])
+
+    def test_empty(self):
+        self.assertEqual(normalize_block(["Cliente"], []), [])
+        self.assertEqual(normalize_block(["Cliente"], [[None], [" "]]), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import os
+import unittest
+from unittest import mock
+
+from src.utils.ocr.excel_templates import TEMPLATES, build_result_from_template, match_template
+
+SALDO, TOTAL_A_CUENTA, TOTAL = TEMPLATES
+
+
+@mock.patch.dict(os.environ, {"ENTERPRISE_TEMPLATES_ENABLED": "true"})
+class MatchTemplateTest(unittest.TestCase):
+    def test_disabled_by_default(self):
+        with mock.patch.dict(os.environ, {"ENTERPRISE_TEMPLATES_ENABLED": "false"}):
+            self.assertIsNone(match_template(["Cliente", "Celular", "Fecha", "Saldo"]))
+
+    def test_first_matching_template(self):
+        self.assertIs(match_template(["Cliente", "Celular", "Fecha", "Saldo"]), SALDO)
+        self.assertIs(match_template(["Cliente", "Celular", "Fecha", "Total", "A cuenta"]), TOTAL_A_CUENTA)
+        self.assertIs(match_template(["Cliente", "Celular", "Fecha", "Total"]), TOTAL)
+
+    def test_synonyms_for_non_amount_columns(self):
+        self.assertIs(match_template(["Nombre del cliente", "Teléfono", "Fecha de emisión", "Saldo"]), SALDO)
+
+    def test_amount_synonyms_do_not_match(self):
+        # "Monto" podría ser un precio unitario: la hoja pasa por la IA.
+        self.assertIsNone(match_template(["Cliente", "Celular", "Fecha", "Monto"]))
+        self.assertIs(match_template(["Cliente", "Celular", "Fecha", "Total", "Abono"]), TOTAL)
+
+    def test_missing_column(self):
+        self.assertIsNone(match_template(["Cliente", "Fecha", "Saldo"]))
+
+
+class BuildResultFromTemplateTest(unittest.TestCase):
+    HEADER = ["Cliente", "Celular", "Fecha", "Total", "A cuenta", "Concepto"]
+
+    def test_maps_rows_to_acreetors(self):
+        rows = [["  Ana  ", "+51 987 654 321", "2024-05-01", "150.5", "50", "Polos"]]
+        self.assertEqual(
+            build_result_from_template(TOTAL_A_CUENTA, self.HEADER, rows, "51999"),
+            {
+                "user_id": "51999",
+                "acreetors": [{
+                    "name": "Ana",
+                    "clientPhoneNumber": "987654321",
+                    "description": "Polos",
+                    "currency": "Soles (S/)",
+                    "amount": 100.5,
+                    "collection_date": "2024-05-01",
+                    "total_quotas": 1,
+                    "frequency_payment": "ÚNICO",
+                    "is_indefinite": False,
+                }],
+            },
+        )
+
+    def test_settled_rows_are_left_out(self):
+        rows = [
+            ["Ana", "987654321", "2024-05-01", "100", "100", None],
+            ["Luis", "912345678", "2024-05-02", "80", None, None],
+        ]
+        result = build_result_from_template(TOTAL_A_CUENTA, self.HEADER, rows, "51999")
+        self.assertEqual([(item["name"], item["amount"]) for item in result["acreetors"]], [("Luis", 80.0)])
+
+    def test_few_unmapped_rows_are_skipped(self):
+        rows = [["Cliente %d" % index, "98765432%d" % index, "2024-05-01", "10", None, None] for index in range(4)]
+        rows.append(["Sin celular", "123", "2024-05-01", "10", None, None])
+        result = build_result_from_template(TOTAL_A_CUENTA, self.HEADER, rows, "51999")
+        self.assertEqual(len(result["acreetors"]), 4)
+
+    def test_too_many_unmapped_rows_fall_back_to_ai(self):
+        rows = [
+            ["Ana", "987654321", "2024-05-01", "10", None, None],
+            ["Luis", "123", "2024-05-01", "10", None, None],
+            ["", "912345678", "2024-05-01", "10", None, None],
+        ]
+        self.assertIsNone(build_result_from_template(TOTAL_A_CUENTA, self.HEADER, rows, "51999"))
+
+    def test_no_pending_rows_falls_back_to_ai(self):
+        rows = [["Ana", "987654321", "2024-05-01", "10", "10", None]]
+        self.assertIsNone(build_result_from_template(TOTAL_A_CUENTA, self.HEADER, rows, "51999"))
+
+
+if __name__ == "__main__":
+    unittest.main()
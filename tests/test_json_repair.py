@@ -0,0 +1,66 @@
+import json
+import unittest
+
+from src.utils.ocr.json_repair import close_truncated, join_continuation, repair_json
+
+
+class RepairJsonTest(unittest.TestCase):
+    def test_valid_json(self):
+        self.assertEqual(repair_json('{"a": [1, 2]}'), ({"a": [1, 2]}, False, False))
+
+    def test_code_fences_and_trailing_commas(self):
+        text = 'Aquí está el resultado:\n```json\n{"a": [1, 2,], "b": "x,]",}\n```'
+        self.assertEqual(repair_json(text), ({"a": [1, 2], "b": "x,]"}, True, False))
+
+    def test_cut_after_complete_element_is_truncated(self):
+        for text in ('{"user_id":"+1","acreetors":[{"a":1},{"a":2}', '{"user_id":"+1","acreetors":[{"a":1},{"a":2},'):
+            with self.subTest(text=text):
+                result, repaired, truncated = repair_json(text)
+                self.assertEqual(result, {"user_id": "+1", "acreetors": [{"a": 1}, {"a": 2}]})
+                self.assertTrue(repaired)
+                self.assertTrue(truncated)
+
+    def test_cut_inside_element_is_truncated(self):
+        result, _, truncated = repair_json('{"acreetors":[{"a":1},{"a":"med')
+        self.assertEqual(result, {"acreetors": [{"a": 1}]})
+        self.assertTrue(truncated)
+
+    def test_unreadable(self):
+        self.assertEqual(repair_json("no hay json"), (None, True, False))
+
+
+class CloseTruncatedTest(unittest.TestCase):
+    def test_complete_text_is_unchanged(self):
+        self.assertEqual(close_truncated('{"a": [1]}'), ('{"a": [1]}', False))
+
+    def test_only_closers_missing(self):
+        closed, truncated = close_truncated('{"a": [{"b": 1}]')
+        self.assertEqual(json.loads(closed), {"a": [{"b": 1}]})
+        self.assertTrue(truncated)
+
+    def test_cut_inside_string(self):
+        closed, truncated = close_truncated('{"a": [{"b": 1}, {"c": "abc')
+        self.assertEqual(json.loads(closed), {"a": [{"b": 1}]})
+        self.assertTrue(truncated)
+
+    def test_brackets_inside_strings_are_ignored(self):
+        closed, truncated = close_truncated('{"a": [{"b": "}]\\""}, {"c"')
+        self.assertEqual(json.loads(closed), {"a": [{"b": '}]"'}]})
+        self.assertTrue(truncated)
+
+
+class JoinContinuationTest(unittest.TestCase):
+    def test_repeated_tail_is_not_duplicated(self):
+        previous = '{"acreetors": [{"nombre": "Ana Torres"}, {"nombre": "Luis'
+        continuation = '```json\n{"nombre": "Ana Torres"}, {"nombre": "Luis Pérez"}]}\n```'
+        self.assertEqual(
+            join_continuation(previous, continuation),
+            '{"acreetors": [{"nombre": "Ana Torres"}, {"nombre": "Luis Pérez"}]}\n',
+        )
+
+    def test_short_overlap_is_kept(self):
+        self.assertEqual(join_continuation('[1, 2, 3', ', 3]'), '[1, 2, 3, 3]')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import json
+import unittest
+
+from src.utils.requests.json_stream import iter_batches, iter_json_array
+
+
+def split(data: bytes, size: int):
+    return [data[start:start + size] for start in range(0, len(data), size)]
+
+
+class IterJsonArrayTest(unittest.TestCase):
+    CASES = [
+        b'[1.5, 22, {"a": 1}]',
+        b'[-0.25e-3,true,false,null,"x, ]",[1,[2]],{"b":[3,{"c":"\\u00f1"}]}]',
+        b' [ 100 , 2.0E+5 ,  "S/ 1,200" ]\n',
+        '["cañón", {"nombre": "José"}, 7]'.encode("utf-8"),
+        b"[]",
+    ]
+
+    def test_every_chunk_size(self):
+        for data in self.CASES:
+            expected = json.loads(data)
+            for size in range(1, len(data) + 1):
+                with self.subTest(data=data, size=size):
+                    self.assertEqual(list(iter_json_array(split(data, size))), expected)
+
+    def test_empty_or_null_body(self):
+        self.assertEqual(list(iter_json_array([])), [])
+        self.assertEqual(list(iter_json_array([b"nu", b"ll"])), [])
+
+    def test_truncated_or_invalid_body(self):
+        for data in (b'[1, 2', b'[{"a": 1}', b'[1.', b'{"a": 1}', b'[1x]'):
+            for size in (1, 3, len(data)):
+                with self.subTest(data=data, size=size), self.assertRaises(ValueError):
+                    list(iter_json_array(split(data, size)))
+
+
+class IterBatchesTest(unittest.TestCase):
+    def test_batches(self):
+        self.assertEqual(list(iter_batches(range(5), 2)), [[0, 1], [2, 3], [4]])
+        self.assertEqual(list(iter_batches([], 2)), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
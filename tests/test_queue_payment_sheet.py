@@ -0,0 +1,56 @@
+import sys
+import types
+import unittest
+from unittest import mock
+
+import fakeredis
+
+from src.domain.services.enterprise_jobs import EnterpriseJobService
+
+# El worker importa la llamada a la IA; en estas pruebas se reemplaza para no depender del modelo.
+_files_utils = types.ModuleType("src.utils.ocr.files_utils")
+_files_utils.execute_ai_processing_task = None
+with mock.patch.dict(sys.modules, {"src.utils.ocr.files_utils": _files_utils}):
+    from src.api.controllers.queue import queue_payment_sheet
+
+
+class FakeMessage:
+    def __init__(self, body: bytes):
+        self.body = body
+
+    def get_body(self) -> bytes:
+        return self.body
+
+
+class PublishRedeliveryTest(unittest.TestCase):
+    RESULT = {"user_id": "51999", "acreetors": [{"nombre": "Ana"}]}
+
+    def setUp(self):
+        server = fakeredis.FakeServer()
+        patcher = mock.patch("redis.from_url", lambda *args, **kwargs: fakeredis.FakeRedis(server=server, decode_responses=True))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(queue_payment_sheet, "execute_ai_processing_task", return_value=self.RESULT)
+        self.ai_task = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.jobs = EnterpriseJobService()
+        self.jobs.start_job("job-1", "51999", 1, "excel", 0.1)
+        self.message = FakeMessage(b'{"job_id": "job-1", "chunk_index": 0, "chunk_count": 1, "prompt": "p", "data": "d"}')
+
+    def test_failed_send_is_published_on_redelivery(self):
+        worker = queue_payment_sheet.service_bus_trigger_ai_worker
+        with mock.patch.object(queue_payment_sheet, "send_message_to_queue", side_effect=[RuntimeError("Service Bus caído"), None, None]) as send:
+            with self.assertRaises(RuntimeError):
+                worker(self.message)
+            # Reentrega inmediata: publica sin esperar a que venza la marca; la siguiente ya no publica.
+            worker(self.message)
+            worker(self.message)
+
+        self.assertEqual(send.call_count, 2)
+        self.assertEqual(send.call_args.args[0], self.RESULT)
+        self.assertEqual(self.ai_task.call_count, 1)
+        self.assertEqual(self.jobs.get_status("job-1")["state"], "published")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import time
+import unittest
+from unittest import mock
+
+from src.integrations.indi.resilience import CircuitBreaker, CircuitOpenError, run_hedged
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch("src.integrations.indi.resilience.time.monotonic", lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.breaker = CircuitBreaker("test", failure_threshold=2, recovery_time=10)
+
+    def open_circuit(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+
+    def test_opens_after_consecutive_failures(self):
+        self.breaker.record_failure()
+        self.breaker.record_success()
+        self.breaker.record_failure()
+        self.breaker.before_call()
+        self.breaker.record_failure()
+        with self.assertRaises(CircuitOpenError) as raised:
+            self.breaker.before_call()
+        self.assertEqual(raised.exception.retry_after, 10)
+
+    def test_half_open_lets_a_single_probe_through(self):
+        self.open_circuit()
+        self.now += 10
+        self.breaker.before_call()
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_call()
+
+    def test_successful_probe_closes(self):
+        self.open_circuit()
+        self.now += 10
+        self.breaker.before_call()
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        self.breaker.before_call()
+        self.breaker.before_call()
+
+    def test_failed_probe_reopens(self):
+        self.open_circuit()
+        self.now += 10
+        self.breaker.before_call()
+        self.now += 3
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.now += 9
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_call()
+        self.now += 1
+        self.breaker.before_call()
+
+    def test_stale_probe_allows_another(self):
+        # La prueba anterior no registró resultado (por ejemplo, se canceló): el circuito no queda trabado.
+        self.open_circuit()
+        self.now += 10
+        self.breaker.before_call()
+        self.now += 10
+        self.breaker.before_call()
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+
+    def test_record_status(self):
+        self.breaker.record_status(503)
+        self.breaker.record_status(404)
+        self.assertEqual(self.breaker.failures, 0)
+        self.breaker.record_status(429)
+        self.breaker.record_status(500)
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+
+
+class RunHedgedTest(unittest.TestCase):
+    def test_fast_call_is_not_hedged(self):
+        call = mock.Mock(return_value="ok")
+        self.assertEqual(run_hedged("test", call, delay=1), "ok")
+        self.assertEqual(call.call_count, 1)
+
+    def test_slow_call_is_hedged_and_first_success_wins(self):
+        calls = []
+
+        def call():
+            calls.append(None)
+            if len(calls) == 1:
+                time.sleep(0.5)
+                return "lento"
+            return "rápido"
+
+        self.assertEqual(run_hedged("test", call, delay=0.05), "rápido")
+        self.assertEqual(len(calls), 2)
+
+    def test_error_is_raised_when_both_copies_fail(self):
+        call = mock.Mock(side_effect=[ValueError("uno"), ValueError("dos")])
+
+        def slow_failure():
+            time.sleep(0.1)
+            return call()
+
+        with self.assertRaises(ValueError):
+            run_hedged("test", slow_failure, delay=0.01)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import os
+import unittest
+from unittest import mock
+
+import fakeredis
+import requests
+
+for name in ("AUTH_API_URL", "AUTH_API_CODE", "COLLECTIONS_API_URL", "COLLECTIONS_API_CODE"):
+    os.environ.setdefault(name, "https://indi.test" if name.endswith("URL") else "test")
+os.environ.setdefault("REDIS_INDIBOT", "redis://localhost:6379/0")
+os.environ.setdefault("SESSION_BUFFER_WAIT_TIME", "600")
+
+from src.domain.models.acreetor import Acreetor
+from src.domain.models.user import UserType
+from src.domain.services.users import UserService
+from src.integrations.indi.provider import IndiProvider
+
+
+def _response(status_code: int) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response.url = "https://indi.test/user"
+    return response
+
+
+class AccountCacheTest(unittest.TestCase):
+    USER_ID = "51987654321"
+
+    def setUp(self):
+        server = fakeredis.FakeServer()
+        patcher = mock.patch("redis.from_url", lambda *args, **kwargs: fakeredis.FakeRedis(server=server, decode_responses=True))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.service = UserService()
+        self.service.indi_provider = mock.Mock()
+        self.redis = self.service.redis_client
+
+    def test_found_account_is_cached(self):
+        self.service.indi_provider.find_account_by_user_id.return_value = Acreetor(identifier="1", name="Ana")
+        user = self.service.get_or_create_user(self.USER_ID, force_anonymous=False)
+        self.assertEqual((user.type_user, user.name), (UserType.ACREETOR, "Ana"))
+
+        self.redis.delete(f"user:{self.USER_ID}")
+        self.assertEqual(self.service.get_or_create_user(self.USER_ID, force_anonymous=False).name, "Ana")
+        self.assertEqual(self.service.indi_provider.find_account_by_user_id.call_count, 1)
+
+    def test_unknown_number_is_cached_with_short_ttl(self):
+        self.service.indi_provider.find_account_by_user_id.return_value = None
+        self.assertIsNone(self.service.refresh_account(self.USER_ID))
+        self.assertIsNone(self.service._load_account(self.USER_ID))
+
+        self.assertEqual(self.service.indi_provider.find_account_by_user_id.call_count, 1)
+        self.assertTrue(0 < self.redis.ttl(f"account:{self.USER_ID}") <= self.service.account_negative_cache_time)
+
+    def test_outage_is_not_cached(self):
+        self.service.indi_provider.find_account_by_user_id.side_effect = requests.ConnectionError("Indi caído")
+        with self.assertRaises(requests.ConnectionError):
+            self.service.refresh_account(self.USER_ID)
+        self.assertIsNone(self.redis.get(f"account:{self.USER_ID}"))
+
+    def test_outage_answers_as_anonymous_without_storing_the_session(self):
+        self.service.indi_provider.find_account_by_user_id.side_effect = [
+            requests.ConnectionError("Indi caído"),
+            Acreetor(identifier="1", name="Ana"),
+        ]
+        user = self.service.get_or_create_user(self.USER_ID, force_anonymous=False)
+        self.assertEqual(user.type_user, UserType.ANONYMOUS)
+        self.assertIsNone(self.redis.get(f"user:{self.USER_ID}"))
+
+        # El mensaje siguiente vuelve a consultar Indi en lugar de quedar como anónimo.
+        self.assertEqual(self.service.get_or_create_user(self.USER_ID, force_anonymous=False).type_user, UserType.ACREETOR)
+
+
+class FindAccountTest(unittest.TestCase):
+    def setUp(self):
+        self.session = mock.Mock()
+        self.provider = IndiProvider(session=self.session)
+
+    def test_not_found_returns_none(self):
+        self.session.request.return_value = _response(404)
+        self.assertIsNone(self.provider.find_account_by_user_id("+51987654321"))
+
+    def test_server_error_is_raised(self):
+        self.session.request.return_value = _response(503)
+        with self.assertRaises(requests.HTTPError):
+            self.provider.find_account_by_user_id("+51987654321")
+
+
+if __name__ == "__main__":
+    unittest.main()